@@ -0,0 +1,174 @@
+"""LLM istekleri için uyarlanabilir timeout, retry ve eşzamanlılık kontrolü
+
+LatencyTracker keeps a rolling window of observed latencies. AdaptiveTimeout
+derives the request timeout from its p95, RetryPolicy retries transient
+failures with exponential backoff, and AIMDLimiter adjusts the number of
+in-flight requests (additive increase, multiplicative decrease) from errors
+and latency spikes.
+"""
+import math
+import time
+import random
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import requests
+
+
+class LatencyTracker:
+    """Son N gecikme ölçümünün kayan penceresi (saniye)"""
+
+    def __init__(self, window: int = 200):
+        self._values = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, latency: float):
+        with self._lock:
+            self._values.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._values:
+                return None
+            values = sorted(self._values)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def stats(self) -> Dict:
+        return {
+            'samples': len(self),
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99)
+        }
+
+
+class AdaptiveTimeout:
+    """Timeout = p95 gecikme x multiplier, [min_timeout, max_timeout] aralığında
+
+    Until min_samples latencies are observed the initial timeout is used.
+    Latencies are tracked per page, so batch requests get a proportionally
+    longer timeout.
+    """
+
+    def __init__(self, tracker: LatencyTracker, initial: float = 15, min_timeout: float = 5,
+                 max_timeout: float = 120, multiplier: float = 3.0, min_samples: int = 20):
+        self.tracker = tracker
+        self.initial = initial
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+
+    def timeout(self, pages: int = 1) -> float:
+        p95 = self.tracker.percentile(0.95)
+        if p95 is None or len(self.tracker) < self.min_samples:
+            per_page = self.initial
+        else:
+            per_page = min(max(p95 * self.multiplier, self.min_timeout), self.max_timeout)
+        return per_page * max(1, pages)
+
+
+class RetryPolicy:
+    """Geçici hatalarda (timeout, bağlantı, 5xx, 429) exponential backoff + jitter ile tekrar dene"""
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 8.0, jitter: bool = True):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (requests.Timeout, requests.ConnectionError, TimeoutError)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in self.RETRYABLE_STATUS
+        return False
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def call(self, func: Callable, on_retry: Optional[Callable[[int, Exception], None]] = None):
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    raise
+                if on_retry:
+                    on_retry(attempt + 1, e)
+                time.sleep(self.delay(attempt))
+                attempt += 1
+
+
+class AIMDLimiter:
+    """AIMD ile ayarlanan eşzamanlı istek limiti (BoundedSemaphore yerine)
+
+    Every successful request adds 1/limit (about +1 per round of requests).
+    An error, a timeout, or a latency above latency_tolerance x the tracker's
+    p50 multiplies the limit by backoff. At most one decrease happens per
+    cooldown period, so one burst of slow responses is not counted many times.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, initial: Optional[int] = None,
+                 backoff: float = 0.5, latency_tolerance: float = 2.0, tracker: Optional[LatencyTracker] = None,
+                 min_samples: int = 20):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self._limit = float(initial or self.max_limit)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.tracker = tracker
+        self.min_samples = min_samples
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self.decreases = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(math.floor(self._limit))))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: Optional[float] = None, error: bool = False):
+        with self._cond:
+            self._in_flight -= 1
+            congested = error
+            if not congested and latency is not None and self.tracker is not None and len(self.tracker) >= self.min_samples:
+                p50 = self.tracker.percentile(0.5)
+                congested = p50 is not None and latency > p50 * self.latency_tolerance
+            now = time.monotonic()
+            if congested:
+                cooldown = (self.tracker.percentile(0.5) if self.tracker is not None else None) or 1.0
+                if now - self._last_decrease >= cooldown:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self._limit = min(float(self.max_limit), self._limit + 1.0 / max(self._limit, 1.0))
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        return {
+            'limit': self.limit,
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'in_flight': self._in_flight,
+            'decreases': self.decreases
+        }
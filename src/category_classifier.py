@@ -0,0 +1,181 @@
+import re
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from llm_classifier import CATEGORIES
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingCategoryClassifier:
+    """Kategori açıklamalarının embedding'lerine en yakın kategoriyi seçen hızlı sınıflandırıcı
+
+    Each category ("name: description") is embedded once. A page goes to the
+    nearest category by cosine similarity; when the margin between the best and
+    second best category is below margin_threshold (or a summary is required)
+    the page is sent to the LLM classifier instead.
+    """
+
+    def __init__(self, backend, categories: Optional[Sequence[Tuple[str, str]]] = None,
+                 margin_threshold: float = 0.05, llm_classifier=None, require_summary: bool = False):
+        self.backend = backend
+        self.categories = list(categories or CATEGORIES)
+        self.margin_threshold = margin_threshold
+        self.llm_classifier = llm_classifier
+        self.require_summary = require_summary
+        self._category_matrix = None
+        self.embedding_decisions = 0
+        self.llm_fallbacks = 0
+
+    @property
+    def category_names(self) -> List[str]:
+        return [name for name, _ in self.categories]
+
+    def category_matrix(self) -> np.ndarray:
+        if self._category_matrix is None:
+            texts = [f"{name}: {description}" for name, description in self.categories]
+            self._category_matrix = _normalize_rows(self.backend.encode_batch(texts))
+        return self._category_matrix
+
+    def embed_pages(self, items: Sequence[Tuple[str, str]]) -> np.ndarray:
+        texts = [re.sub(r'\s+', ' ', f"{title} {content}").strip() for title, content in items]
+        return _normalize_rows(self.backend.encode_batch(texts))
+
+    def scores(self, embedding) -> np.ndarray:
+        """Cosine similarity of one page embedding to every category"""
+        return self.category_matrix() @ _normalize_rows(embedding)[0]
+
+    def rank(self, embedding, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        scores = self.scores(embedding)
+        order = np.argsort(-scores)[:top_k]
+        return [(self.categories[i][0], float(scores[i])) for i in order]
+
+    def shortlist(self, title: str, content: str, top_k: int) -> List[str]:
+        """Top-k categories for a page; usable as LLMClassifier(shortlister=...)"""
+        return [name for name, _ in self.rank(self.embed_pages([(title, content)])[0], top_k)]
+
+    def predict(self, embedding) -> Dict:
+        """Nearest category with its score and the margin over the runner-up"""
+        ranked = self.rank(embedding, top_k=2)
+        best, score = ranked[0]
+        margin = score - ranked[1][1] if len(ranked) > 1 else score
+        return {
+            'category': best,
+            'score': score,
+            'margin': margin,
+            'confident': margin >= self.margin_threshold
+        }
+
+    def classify(self, title: str, content: str, embedding=None) -> Dict:
+        return self.classify_many([(title, content)], [embedding])[0]
+
+    def classify_many(self, items: Iterable[Tuple[str, str]], embeddings: Optional[Sequence] = None) -> List[Dict]:
+        """Sınıflandır; emin olunamayan sayfalar tek classify_many çağrısıyla LLM'e gider
+
+        embeddings may hold precomputed page embeddings (e.g. from the dedupe
+        index); missing ones are computed here in one batch.
+        """
+        items = list(items)
+        embeddings = list(embeddings) if embeddings is not None else [None] * len(items)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            for i, embedding in zip(missing, self.embed_pages([items[i] for i in missing])):
+                embeddings[i] = embedding
+
+        outputs = []
+        fallback = []
+        candidates = []
+        shortlist_size = getattr(self.llm_classifier, 'shortlist_size', None)
+        for index, embedding in enumerate(embeddings):
+            prediction = self.predict(embedding)
+            outputs.append({
+                'category': prediction['category'],
+                'summary': '',
+                'classified_by': 'embedding',
+                'category_score': prediction['score'],
+                'category_margin': prediction['margin']
+            })
+            if self.llm_classifier is not None and (self.require_summary or not prediction['confident']):
+                fallback.append(index)
+                # LLM prompt'u bu sayfanın en yakın k kategorisiyle sınırlanır
+                if shortlist_size:
+                    candidates.append([name for name, _ in self.rank(embedding, shortlist_size)])
+                else:
+                    candidates.append(None)
+
+        self.embedding_decisions += len(items) - len(fallback)
+        if fallback:
+            self.llm_fallbacks += len(fallback)
+            llm_outputs = self.llm_classifier.classify_many([items[i] for i in fallback],
+                                                            candidates if shortlist_size else None)
+            for index, llm_output in zip(fallback, llm_outputs):
+                outputs[index].update(llm_output)
+                outputs[index]['classified_by'] = 'llm'
+        return outputs
+
+    def get_stats(self) -> Dict:
+        decided = self.embedding_decisions + self.llm_fallbacks
+        return {
+            'categories': len(self.categories),
+            'margin_threshold': self.margin_threshold,
+            'embedding_decisions': self.embedding_decisions,
+            'llm_fallbacks': self.llm_fallbacks,
+            'llm_fallback_rate': self.llm_fallbacks / decided if decided else 0
+        }
+
+    def agreement_report(self, samples: Sequence[Tuple[str, str, str]],
+                         thresholds: Sequence[float] = (0.0, 0.02, 0.05, 0.1)) -> Dict:
+        """LLM (veya elle) etiketlenmiş örneklerle uyum raporu
+
+        samples are (title, content, label). For every margin threshold the
+        report gives the share of pages the embedding classifier would decide
+        on its own (coverage) and its accuracy on those pages.
+        """
+        samples = [s for s in samples if s[2]]
+        if not samples:
+            return {'samples': 0}
+        lookup = {name.lower(): name for name in self.category_names}
+        embeddings = self.embed_pages([(title, content) for title, content, _ in samples])
+        predictions = [self.predict(embedding) for embedding in embeddings]
+        labels = [lookup.get(label.strip().lower(), label.strip()) for _, _, label in samples]
+
+        by_threshold = []
+        for threshold in thresholds:
+            decided = [(p, label) for p, label in zip(predictions, labels) if p['margin'] >= threshold]
+            correct = sum(1 for p, label in decided if p['category'] == label)
+            by_threshold.append({
+                'margin_threshold': threshold,
+                'coverage': len(decided) / len(samples),
+                'accuracy': correct / len(decided) if decided else 0
+            })
+
+        confusions = Counter((label, p['category']) for p, label in zip(predictions, labels) if p['category'] != label)
+        per_category = defaultdict(lambda: [0, 0])
+        for p, label in zip(predictions, labels):
+            per_category[label][1] += 1
+            per_category[label][0] += p['category'] == label
+        unknown_labels = sorted(set(label for label in labels if label not in self.category_names))
+        if unknown_labels:
+            logging.warning(f"Labels not in category list: {unknown_labels}")
+
+        return {
+            'samples': len(samples),
+            'accuracy': sum(1 for p, label in zip(predictions, labels) if p['category'] == label) / len(samples),
+            'by_threshold': by_threshold,
+            'per_category_accuracy': {label: correct / total for label, (correct, total) in sorted(per_category.items())},
+            'top_confusions': [
+                {'label': label, 'predicted': predicted, 'count': count}
+                for (label, predicted), count in confusions.most_common(10)
+            ],
+            'unknown_labels': unknown_labels
+        }
@@ -0,0 +1,265 @@
+"""Paylaşımlı duplicate index servisi
+
+Several URLExtractor processes (on one box or across machines) can share one
+SimilarityChecker through this server, so duplicates are detected across
+shards. Concurrent /check requests are coalesced into batches and run through
+SimilarityChecker.check_many, keeping the same MinHash, SimHash and embedding
+semantics as the in-process checker.
+
+Server (from src/):
+    python dedupe_service.py --host 0.0.0.0 --port 8765 --window-size 500000
+
+Client:
+    checker = RemoteSimilarityChecker("http://dedupe-host:8765")
+    extractor = URLExtractor(similarity_checker=checker)
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from similarity_checker import SimilarityChecker
+
+logger = logging.getLogger(__name__)
+
+
+class DedupeIndexServer:
+    """HTTP server that exposes one SimilarityChecker to many extractor processes"""
+
+    def __init__(self, checker: SimilarityChecker, host: str = '127.0.0.1', port: int = 8765,
+                 batch_window: float = 0.01, max_batch: int = 64):
+        self.checker = checker
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._pending = queue.Queue()
+        self._stopped = threading.Event()
+        self._batcher = threading.Thread(target=self._run_batches, name='dedupe-batcher', daemon=True)
+
+        server = self
+
+        class Handler(DedupeRequestHandler):
+            service = server
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def submit(self, items: List[Tuple[str, str, str]]) -> Future:
+        """Queue items for the next batch; the future resolves to their check results"""
+        future = Future()
+        self._pending.put((items, future))
+        return future
+
+    def _run_batches(self):
+        while not self._stopped.is_set():
+            try:
+                first = self._pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # Kısa bir pencere içinde gelen istekleri tek check_many çağrısında birleştir
+            requests_in_batch = [first]
+            item_count = len(first[0])
+            while item_count < self.max_batch:
+                try:
+                    pending = self._pending.get(timeout=self.batch_window)
+                except queue.Empty:
+                    break
+                requests_in_batch.append(pending)
+                item_count += len(pending[0])
+
+            items = [item for pending_items, _ in requests_in_batch for item in pending_items]
+            try:
+                results = self.checker.check_many(items)
+            except Exception as e:
+                logger.error(f"Dedupe batch failed: {e}")
+                for _, future in requests_in_batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for pending_items, future in requests_in_batch:
+                future.set_result(results[offset:offset + len(pending_items)])
+                offset += len(pending_items)
+
+    def serve_forever(self):
+        self._batcher.start()
+        logger.info(f"Dedupe index server listening on {self.address[0]}:{self.address[1]}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self._stopped.set()
+
+    def start(self) -> threading.Thread:
+        """Serve in a background thread"""
+        thread = threading.Thread(target=self.serve_forever, name='dedupe-server', daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._stopped.set()
+
+
+class DedupeRequestHandler(BaseHTTPRequestHandler):
+    service: DedupeIndexServer = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload, ensure_ascii=False, default=float).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        checker = self.service.checker
+        try:
+            if parsed.path == '/health':
+                self._send_json({'status': 'ok'})
+            elif parsed.path == '/stats':
+                self._send_json(checker.get_comprehensive_stats())
+            elif parsed.path == '/analysis':
+                self._send_json(checker.analyze_similarity_distribution())
+            elif parsed.path == '/llm_cache':
+                url = parse_qs(parsed.query).get('url', [''])[0]
+                self._send_json({'data': checker.get_cached_llm_output(url)})
+            elif parsed.path == '/similarity_logs':
+                limit = int(parse_qs(parsed.query).get('limit', ['0'])[0]) or None
+                self._send_json({'logs': checker.get_similarity_logs(limit)})
+            else:
+                self._send_json({'error': 'Not found'}, status=404)
+        except Exception as e:
+            self._send_json({'error': str(e)}, status=500)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        try:
+            payload = self._read_json()
+            if path == '/check':
+                items = [(i['url'], i.get('title', ''), i.get('content', '')) for i in payload.get('items', [])]
+                results = self.service.submit(items).result()
+                self._send_json({'results': [
+                    {'is_duplicate': is_dup, 'duplicate_info': info, 'similarity_scores': scores}
+                    for is_dup, info, scores in results
+                ]})
+            elif path == '/llm_cache':
+                self.service.checker.cache_llm_output(payload['url'], payload['data'])
+                self._send_json({'status': 'ok'})
+            else:
+                self._send_json({'error': 'Not found'}, status=404)
+        except Exception as e:
+            self._send_json({'error': str(e)}, status=500)
+
+
+class RemoteSimilarityChecker:
+    """SimilarityChecker yerine kullanılabilen, DedupeIndexServer'a bağlanan istemci"""
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:8765', timeout: float = 60):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def __getstate__(self):
+        # Worker süreçlerine gönderilebilir; bağlantı havuzu süreçler arasında paylaşılmaz
+        return {'base_url': self.base_url, 'timeout': self.timeout}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _get(self, path, **params):
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, path, payload):
+        response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def check_many(self, items: Iterable[Tuple[str, str, str]], max_workers: Optional[int] = None,
+                   timers=None) -> List[Tuple[bool, Dict, Dict]]:
+        items = list(items)
+        if not items:
+            return []
+        payload = {'items': [{'url': url, 'title': title, 'content': content} for url, title, content in items]}
+        start = time.perf_counter()
+        results = self._post('/check', payload)['results']
+        # Sunucu tarafı aşamalar ayrı görünmez; istek süresi sayfalara paylaştırılır
+        share = (time.perf_counter() - start) / len(items)
+        for timer in timers or ():
+            timer.add('dedupe_remote', share)
+        return [(r['is_duplicate'], r['duplicate_info'], r['similarity_scores']) for r in results]
+
+    def is_duplicate_comprehensive(self, url, title, content, timer=None) -> Tuple[bool, Dict, Dict]:
+        return self.check_many([(url, title, content)], timers=[timer] if timer is not None else None)[0]
+
+    def cache_llm_output(self, url, llm_data):
+        self._post('/llm_cache', {'url': url, 'data': llm_data})
+
+    def get_cached_llm_output(self, url):
+        return self._get('/llm_cache', url=url).get('data')
+
+    def get_comprehensive_stats(self):
+        return self._get('/stats')
+
+    def analyze_similarity_distribution(self):
+        return self._get('/analysis')
+
+    def get_similarity_logs(self, limit: Optional[int] = None) -> List[Dict]:
+        return self._get('/similarity_logs', limit=limit or 0)['logs']
+
+    def export_similarity_logs(self, filename: str):
+        """Export the logs held in the server's memory buffer as JSONL"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            for record in self.get_similarity_logs():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared dedupe index server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=4, help="Threads for signature computation")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--window-size', type=int, default=None)
+    parser.add_argument('--window-hours', type=float, default=None)
+    parser.add_argument('--embedding-storage-mode', default='float32', choices=['float32', 'float16', 'int8'])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    checker = SimilarityChecker(
+        max_workers=args.workers,
+        window_size=args.window_size,
+        window_hours=args.window_hours,
+        embedding_storage_mode=args.embedding_storage_mode
+    )
+    server = DedupeIndexServer(checker, args.host, args.port, max_batch=args.max_batch)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
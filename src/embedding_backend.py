@@ -0,0 +1,215 @@
+import os
+import zlib
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def truncate_to_token_budget(text: str, max_tokens: int) -> str:
+    """Metni tokenizer'a vermeden önce kelime bazında kırp
+
+    Every whitespace-separated word produces at least one wordpiece token, so
+    the first max_tokens words always cover the model's max_seq_length. The
+    tokenizer then truncates exactly, without tokenizing the rest of the page.
+    """
+    if not text or max_tokens <= 0:
+        return text
+    words = text.split(None, max_tokens)
+    if len(words) <= max_tokens:
+        return text
+    return ' '.join(words[:max_tokens])
+
+
+class EmbeddingBackend(ABC):
+    """Base class for embedding backends used by SimilarityChecker"""
+
+    name = 'base'
+
+    def __init__(self, model_name: str, max_seq_length: int = 256):
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+
+    @abstractmethod
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into a (len(texts), dimension) array"""
+
+    def encode(self, text: str) -> np.ndarray:
+        return self.encode_batch([text])[0]
+
+    def prepare(self, text: str) -> str:
+        return truncate_to_token_budget(text, self.max_seq_length)
+
+    def get_dimension(self) -> Optional[int]:
+        return None
+
+    def info(self) -> Dict:
+        return {
+            "enabled": True,
+            "backend": self.name,
+            "model_name": self.model_name,
+            "max_seq_length": self.max_seq_length,
+            "embedding_dimension": self.get_dimension() or 'Unknown'
+        }
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """Stock SentenceTransformer (PyTorch) backend"""
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', num_threads: Optional[int] = None, batch_size: int = 32):
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+
+        self.model = SentenceTransformer(model_name)
+        self.batch_size = batch_size
+        super().__init__(model_name, max_seq_length=getattr(self.model, 'max_seq_length', 256) or 256)
+
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        prepared = [self.prepare(text) for text in texts]
+        return self.model.encode(prepared, batch_size=self.batch_size, convert_to_numpy=True)
+
+    def get_dimension(self) -> Optional[int]:
+        return self.model.get_sentence_embedding_dimension()
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """ONNX Runtime backend (optionally int8 quantized) with explicit thread control
+
+    model_dir must contain model.onnx (or model_quantized.onnx) and tokenizer.json.
+    If it does not exist yet, the model is exported with optimum and, when
+    quantize=True, dynamically quantized to int8 weights.
+    """
+
+    name = 'onnx'
+
+    def __init__(self, model_name: str = 'sentence-transformers/all-MiniLM-L6-v2', model_dir: Optional[str] = None,
+                 num_threads: Optional[int] = None, quantize: bool = True, max_seq_length: int = 256,
+                 batch_size: int = 32):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        if '/' not in model_name:
+            model_name = f"sentence-transformers/{model_name}"
+        super().__init__(model_name, max_seq_length=max_seq_length)
+        self.batch_size = batch_size
+
+        if model_dir is None:
+            cache_root = os.path.join(os.path.expanduser('~'), '.cache', 'url_extractor', 'onnx')
+            model_dir = os.path.join(cache_root, model_name.replace('/', '__'))
+        self.model_dir = model_dir
+        model_path = self._ensure_model(quantize)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+        self._dimension = None
+
+    def _ensure_model(self, quantize):
+        quantized_path = os.path.join(self.model_dir, 'model_quantized.onnx')
+        model_path = os.path.join(self.model_dir, 'model.onnx')
+        if quantize and os.path.exists(quantized_path):
+            return quantized_path
+        if not os.path.exists(model_path):
+            logging.info(f"Exporting {self.model_name} to ONNX in {self.model_dir}")
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+
+            ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True).save_pretrained(self.model_dir)
+            AutoTokenizer.from_pretrained(self.model_name).save_pretrained(self.model_dir)
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+            return quantized_path
+        return model_path
+
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        outputs = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = [self.prepare(text) for text in texts[start:start + self.batch_size]]
+            encodings = self.tokenizer.encode_batch(batch)
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feed = {'input_ids': input_ids, 'attention_mask': attention_mask}
+            if 'token_type_ids' in self.input_names:
+                feed['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+            token_embeddings = self.session.run(None, feed)[0]
+            # Mean pooling + L2 normalize (sentence-transformers pipeline ile aynı)
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            outputs.append(pooled.astype(np.float32))
+        if not outputs:
+            return np.zeros((0, self.get_dimension() or 0), dtype=np.float32)
+        embeddings = np.vstack(outputs)
+        self._dimension = embeddings.shape[1]
+        return embeddings
+
+    def get_dimension(self) -> Optional[int]:
+        return self._dimension
+
+    def info(self) -> Dict:
+        info = super().info()
+        info['num_threads'] = self.num_threads or 'default'
+        return info
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """Model gerektirmeyen feature-hashing embedding'i (benchmark ve testler için)
+
+    Word unigrams and bigrams are hashed (crc32, stable across runs) into a
+    fixed number of signed dimensions and L2-normalized. Near-duplicate texts
+    get a high cosine similarity; it does not capture meaning.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, model_name: str = 'hashing', dimension: int = 384, max_seq_length: int = 256):
+        super().__init__(model_name, max_seq_length=max_seq_length)
+        self.dimension = dimension
+
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = self.prepare(text).lower().split()
+            features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode('utf-8'))
+                embeddings[row, h % self.dimension] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.clip(norms, 1e-12, None)
+
+    def get_dimension(self) -> Optional[int]:
+        return self.dimension
+
+
+EMBEDDING_BACKENDS = {
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    OnnxEmbeddingBackend.name: OnnxEmbeddingBackend,
+    HashingEmbeddingBackend.name: HashingEmbeddingBackend,
+}
+
+
+def create_embedding_backend(name: str = 'sentence-transformers', model_name: str = 'all-MiniLM-L6-v2',
+                             **options) -> EmbeddingBackend:
+    """Create an embedding backend by name (see EMBEDDING_BACKENDS)"""
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {name} (available: {', '.join(EMBEDDING_BACKENDS)})")
+    return EMBEDDING_BACKENDS[name](model_name=model_name, **options)
@@ -0,0 +1,182 @@
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+
+class EmbeddingIndex:
+    """Embedding'leri tek bir (quantize edilebilir) matriste tutan index
+
+    Vektörler eklenirken birim uzunluğa normalize edilir, böylece cosine
+    similarity tek bir matris-vektör çarpımına indirgenir.
+
+    Storage modes:
+        float32: 4 bytes per dimension (reference)
+        float16: 2 bytes per dimension
+        int8:    1 byte per dimension + one float32 scale per row
+
+    Search scores the stored representation directly: float16 rows are
+    multiplied with a float16 query and accumulated in float32, and int8 rows
+    with an int8-quantized query and accumulated in int32 before the row and
+    query scales are applied. No float32 copy of the matrix is made per query.
+    float32 still uses BLAS and is the fastest mode per query; the quantized
+    modes trade some of that speed for 2x / 4x less memory.
+    """
+
+    MODES = ('float32', 'float16', 'int8')
+
+    def __init__(self, mode: str = 'float32', initial_capacity: int = 1024, search_chunk_rows: int = 16384):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown embedding storage mode: {mode} (expected one of {self.MODES})")
+        self.mode = mode
+        self.initial_capacity = initial_capacity
+        self.search_chunk_rows = search_chunk_rows
+        self.dimension = None
+        self._matrix = None
+        self._scales = None
+        self._urls: List[str] = []
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __contains__(self, url):
+        return url in self._rows
+
+    def __getitem__(self, url):
+        return self._dequantize(self._rows[url])
+
+    def keys(self) -> List[str]:
+        return list(self._urls)
+
+    def items(self) -> Iterator[Tuple[str, np.ndarray]]:
+        for row, url in enumerate(self._urls):
+            yield url, self._dequantize(row)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the stored vectors (allocated rows only)"""
+        if self._matrix is None:
+            return 0
+        used = len(self._urls) * self._matrix.itemsize * self.dimension
+        if self._scales is not None:
+            used += len(self._urls) * self._scales.itemsize
+        return used
+
+    def _allocate(self, dimension):
+        self.dimension = dimension
+        dtype = np.int8 if self.mode == 'int8' else np.dtype(self.mode)
+        self._matrix = np.zeros((self.initial_capacity, dimension), dtype=dtype)
+        if self.mode == 'int8':
+            self._scales = np.zeros(self.initial_capacity, dtype=np.float32)
+
+    def _grow(self):
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.zeros((capacity, self.dimension), dtype=self._matrix.dtype)
+        matrix[:self._matrix.shape[0]] = self._matrix
+        self._matrix = matrix
+        if self._scales is not None:
+            scales = np.zeros(capacity, dtype=np.float32)
+            scales[:self._scales.shape[0]] = self._scales
+            self._scales = scales
+
+    @staticmethod
+    def _normalize(embedding) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    @staticmethod
+    def _quantize_int8(vector) -> Tuple[np.ndarray, float]:
+        max_abs = float(np.max(np.abs(vector)))
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        return np.clip(np.rint(vector / scale), -127, 127).astype(np.int8), scale
+
+    def _store(self, row, vector):
+        if self.mode == 'int8':
+            self._matrix[row], self._scales[row] = self._quantize_int8(vector)
+        else:
+            self._matrix[row] = vector
+
+    def _dequantize(self, row) -> np.ndarray:
+        vector = self._matrix[row].astype(np.float32)
+        if self._scales is not None:
+            vector *= self._scales[row]
+        return vector
+
+    def add(self, url: str, embedding):
+        """Add (or replace) the embedding stored for url"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        if self._matrix is None:
+            self._allocate(vector.shape[0])
+        elif vector.shape[0] != self.dimension:
+            raise ValueError(f"Embedding dimension {vector.shape[0]} does not match index dimension {self.dimension}")
+
+        row = self._rows.get(url)
+        if row is None:
+            row = len(self._urls)
+            if row >= self._matrix.shape[0]:
+                self._grow()
+            self._urls.append(url)
+            self._rows[url] = row
+        self._store(row, vector)
+
+    def remove(self, url: str) -> bool:
+        """Remove url from the index; the last row is moved into its slot"""
+        row = self._rows.pop(url, None)
+        if row is None:
+            return False
+        last = len(self._urls) - 1
+        if row != last:
+            last_url = self._urls[last]
+            self._matrix[row] = self._matrix[last]
+            if self._scales is not None:
+                self._scales[row] = self._scales[last]
+            self._urls[row] = last_url
+            self._rows[last_url] = row
+        self._urls.pop()
+        return True
+
+    def similarities(self, embedding) -> np.ndarray:
+        """Cosine similarity of embedding against every stored row"""
+        count = len(self._urls)
+        query = self._normalize(embedding)
+        if count == 0 or query is None:
+            return np.zeros(count, dtype=np.float32)
+
+        if self.mode == 'int8':
+            query, query_scale = self._quantize_int8(query)
+        elif self.mode == 'float16':
+            query = query.astype(np.float16)
+
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, self.search_chunk_rows):
+            end = min(start + self.search_chunk_rows, count)
+            chunk = self._matrix[start:end]
+            if self.mode == 'float32':
+                scores[start:end] = chunk @ query
+            elif self.mode == 'float16':
+                # float16 çarpım, float32 toplama (einsum matrisi kopyalamaz)
+                scores[start:end] = np.einsum('ij,j->i', chunk, query, dtype=np.float32)
+            else:
+                dots = np.einsum('ij,j->i', chunk, query, dtype=np.int32)
+                scores[start:end] = dots * (self._scales[start:end] * query_scale)
+        return scores
+
+    def search(self, embedding) -> Tuple[Optional[str], float]:
+        """Return (url, similarity) of the most similar stored embedding"""
+        scores = self.similarities(embedding)
+        if scores.size == 0:
+            return None, 0.0
+        row = int(np.argmax(scores))
+        # Quantization hatası skoru 1'in biraz üstüne taşıyabilir
+        return self._urls[row], min(float(scores[row]), 1.0)
+
+    def clear(self):
+        self.dimension = None
+        self._matrix = None
+        self._scales = None
+        self._urls = []
+        self._rows = {}
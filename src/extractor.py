@@ -2,39 +2,128 @@ from goose3 import Goose
 from goose3.configuration import Configuration
 import time
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
 from urllib.parse import urlparse
 import logging
 from llm_classifier import LLMClassifier
+from category_classifier import EmbeddingCategoryClassifier
+from embedding_backend import create_embedding_backend
 from similarity_checker import SimilarityChecker  # Kategori olmayan versiyon
+from run_summary import SummaryAggregator
+from run_metrics import RunMetrics
+from timing import NULL_TIMER, StageTimer
 
 logger = logging.getLogger(__name__)
 
 class URLExtractor:
-    def __init__(self, timeout=10, delay=0.1):
+    def __init__(self, timeout=10, delay=0.1, similarity_config=None, max_workers=1, similarity_checker=None,
+                 llm_config=None, classification_mode='llm', classification_config=None, timing_enabled=True):
         self.timeout = timeout
         self.delay = delay
+        # Sonuç başına aşama süreleri (result['timings']); False ise hiç ölçüm yapılmaz
+        self.timing_enabled = timing_enabled
+        # max_workers > 1: fetch + parse paralel, duplicate kontrolü URL sırasıyla yapılır
+        self.max_workers = max_workers
 
+        # Goose thread-safe değil, her worker thread kendi instance'ını kullanır
+        self._local = threading.local()
+        self._gooses = []
+        self.goose = self._get_goose()
+
+        # LLM classifier (model, max_in_flight, keep_alive vb. llm_config ile verilir)
+        classification_config = dict(classification_config or {})
+        llm_config = dict(llm_config or {})
+        if classification_config.get('categories'):
+            llm_config.setdefault('categories', classification_config['categories'])
+        self.llm_classifier = LLMClassifier(**llm_config)
+
+        # Similarity checker (eşikler, window_size / window_hours vb. similarity_config ile verilir).
+        # Paylaşımlı index için dedupe_service.RemoteSimilarityChecker verilebilir.
+        if similarity_checker is None:
+            similarity_config = dict(similarity_config or {})
+            similarity_config.setdefault('max_workers', max_workers)
+            similarity_checker = SimilarityChecker(**similarity_config)
+        self.similarity_checker = similarity_checker
+        # Sonuçlar tamamlandıkça güncellenen özet (rapor için sonuç listesi gerekmez)
+        self.run_summary = SummaryAggregator()
+        # İsteğe bağlı result_source.ResultJournal: sonuçlar tamamlandıkça diske eklenir
+        self.result_journal = None
+        # İsteğe bağlı output_sinks.ResultSink: başarılı sonuçlar tamamlandıkça çıktı dosyasına yazılır
+        self.result_sink = None
+        # Yalnızca extract_multiple_urls (liste döndüren eski arayüz) sırasında dolu
+        self._collected_results = None
+        # Canlı metrikler (aşama gecikmeleri, hız, ETA); GUI periyodik olarak okur
+        self.metrics = RunMetrics()
+        # İsteğe bağlı profiling.RunProfiler: örneklenmiş URL'ler için cProfile + bellek snapshot'ı
+        self.profiler = None
+        if hasattr(similarity_checker, 'register_stats_provider'):
+            similarity_checker.register_stats_provider('llm', self.llm_classifier.get_stats)
+        if self.llm_classifier.cache is not None:
+            self.metrics.register_cache('llm_result', self.llm_classifier.cache.stats)
+
+        # classification_mode='embedding': kategori embedding'lerine en yakın kategori, belirsizse LLM
+        self.classification_mode = classification_mode
+        self.category_classifier = None
+        # llm_config shortlist_size=k ile prompt'a sadece k aday kategori girer;
+        # shortlister='embedding' adayları sayfa embedding'inden seçer (varsayılan: kelime eşleşmesi)
+        shortlister = classification_config.pop('shortlister', 'keyword')
+        use_embedding_shortlist = shortlister == 'embedding' and self.llm_classifier.shortlist_size
+        if classification_mode == 'embedding' or use_embedding_shortlist:
+            category_classifier = self._create_category_classifier(classification_config)
+            if use_embedding_shortlist and category_classifier is not None:
+                self.llm_classifier.shortlister = category_classifier
+            if classification_mode == 'embedding':
+                self.category_classifier = category_classifier
+
+    def close(self):
+        """Çalıştırma bittiğinde similarity log dosyasını kapat"""
+        close = getattr(self.similarity_checker, 'close', None)
+        if close is not None:
+            close()
+
+    def __del__(self):
+        for goose in getattr(self, '_gooses', []):
+            try:
+                goose.close()
+            except:
+                pass
+
+    def _create_goose(self):
         config = Configuration()
-        config.request_timeout = timeout
+        config.request_timeout = self.timeout
         config.browser_user_agent = (
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
             '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         )
         config.enable_image_fetching = False
+        return Goose(config)
 
-        self.goose = Goose(config)
-        
-        # LLM classifier
-        self.llm_classifier = LLMClassifier()
+    def _get_goose(self):
+        goose = getattr(self._local, 'goose', None)
+        if goose is None:
+            goose = self._create_goose()
+            self._local.goose = goose
+            self._gooses.append(goose)
+        return goose
 
-        # Similarity checker
-        self.similarity_checker = SimilarityChecker()
-
-    def __del__(self):
+    def _create_category_classifier(self, config):
+        backend = getattr(self.similarity_checker, 'embedding_model', None)
         try:
-            self.goose.close()
-        except:
-            pass
+            if backend is None:
+                backend = create_embedding_backend(config.pop('backend', 'sentence-transformers'),
+                                                   config.pop('model_name', 'all-MiniLM-L6-v2'),
+                                                   **config.pop('backend_options', {}))
+            else:
+                for key in ('backend', 'model_name', 'backend_options'):
+                    config.pop(key, None)
+            return EmbeddingCategoryClassifier(backend, llm_classifier=self.llm_classifier, **config)
+        except Exception as e:
+            logger.warning(f"Embedding classifier unavailable, using LLM classification: {e}")
+            self.classification_mode = 'llm'
+            return None
 
     def is_valid_url(self, url):
         try:
@@ -49,9 +138,8 @@ class URLExtractor:
         text = re.sub(r'\s+', ' ', text)
         return text.strip()
 
-
-    def extract_content(self, url):
-        result = {
+    def _new_result(self, url):
+        return {
             'url': url,
             'title': '',
             'content': '',
@@ -60,6 +148,10 @@ class URLExtractor:
             'child_category': '',
             'parent_category': '',
             'summary': '',
+            'classified_by': '',
+            'llm_error': '',
+            'elapsed': 0.0,
+            'timings': {},
             'is_duplicate': False,
             'duplicate_info': {},
             'similarity_scores': {
@@ -70,124 +162,327 @@ class URLExtractor:
             }
         }
 
+    def _describe_error(self, e):
+        error_msg = str(e).lower()
+        if 'timeout' in error_msg:
+            return 'Timeout error'
+        elif 'connection' in error_msg:
+            return 'Connection error'
+        elif any(code in error_msg for code in ['404', '403', '500', '502', '503']):
+            return f'HTTP error: {error_msg}'
+        return f'Unexpected error: {str(e)}'
+
+    def fetch_content(self, url):
+        """URL'yi indir ve başlık/içeriği çıkar (duplicate kontrolü ve LLM olmadan)"""
+        result = self._new_result(url)
+        start = time.perf_counter()
         try:
             if not self.is_valid_url(url):
                 result['error'] = 'Invalid URL format'
                 return result
 
-            article = self.goose.extract(url=url)
-            result['title'] = self.clean_text(article.title or '')
-            result['content'] = self.clean_text(article.cleaned_text or '')
+            timer = self._timer(result)
+            goose = self._get_goose()
+            fetcher = getattr(goose, 'fetcher', None)
+            html = None
+            if fetcher is not None:
+                # İndirme ve HTML ayrıştırma ayrı aşamalar olarak ölçülür
+                with self.metrics.stage('fetch'), timer.stage('fetch'):
+                    html = fetcher.fetch(url)
+            parse_stage = 'parse' if html is not None else 'fetch'
+            with self.metrics.stage(parse_stage):
+                with timer.stage(parse_stage):
+                    article = goose.extract(url=url, raw_html=html) if html is not None else goose.extract(url=url)
+                with timer.stage('clean'):
+                    result['title'] = self.clean_text(article.title or '')
+                    result['content'] = self.clean_text(article.cleaned_text or '')
 
             if not result['content'] and not result['title']:
                 result['error'] = 'No content extracted'
-                return result        
-            
+                return result
+
             result['status'] = 'success'
+        except Exception as e:
+            result['error'] = self._describe_error(e)
+        finally:
+            result['elapsed'] = time.perf_counter() - start
+        return result
 
-            # Duplicate kontrolü LLM'den önce yapılır
-            is_duplicate, duplicate_info, similarity_scores = self.similarity_checker.is_duplicate_comprehensive(
-                url, result['title'], result['content']
-            )
+    def _timer(self, result):
+        """result['timings'] sözlüğüne yazan zamanlayıcı (kapalıysa NULL_TIMER)"""
+        if not self.timing_enabled:
+            return NULL_TIMER
+        return StageTimer(result.setdefault('timings', {}))
 
-            result['is_duplicate'] = is_duplicate
-            result['similarity_scores'] = similarity_scores
-            
-            # Backward compatibility için ayrı alanlar
-            result['minhash_similarity'] = similarity_scores['minhash_max_similarity']
-            result['simhash_distance'] = similarity_scores['simhash_min_distance']
-            result['embedding_similarity'] = similarity_scores['embedding_max_similarity']
-
-            # Eğer duplicate ise, varsa cache'ten summary ve category çek
-            if is_duplicate and duplicate_info:
-                result['duplicate_info'] = duplicate_info
-                cached = self.similarity_checker.get_cached_llm_output(duplicate_info['original_url'])
-                if cached:
-                    result['summary'] = cached.get("summary", "")
-                    result['child_category'] = cached.get("category", "")
-                else:
-                    result['summary'] = "(no summary cached)"
-                    result['child_category'] = "(unknown)"
+    def apply_similarity(self, result, is_duplicate, duplicate_info, similarity_scores):
+        """Duplicate kontrol sonucunu result'a yaz"""
+        result['is_duplicate'] = is_duplicate
+        result['similarity_scores'] = similarity_scores
+
+        # Backward compatibility için ayrı alanlar
+        result['minhash_similarity'] = similarity_scores['minhash_max_similarity']
+        result['simhash_distance'] = similarity_scores['simhash_min_distance']
+        result['embedding_similarity'] = similarity_scores['embedding_max_similarity']
+
+        if is_duplicate and duplicate_info:
+            result['duplicate_info'] = duplicate_info
+
+    def classify_result(self, result):
+        """Duplicate ise cache'ten, değilse LLM'den kategori ve özet al"""
+        # Eğer duplicate ise, varsa cache'ten summary ve category çek
+        if result['is_duplicate'] and result['duplicate_info']:
+            cached = self.similarity_checker.get_cached_llm_output(result['duplicate_info']['original_url'])
+            self.metrics.count_cache('duplicate_reuse', bool(cached))
+            if cached:
+                result['summary'] = cached.get("summary", "")
+                result['child_category'] = cached.get("category", "")
             else:
-                # LLM çağrısı (özeti ve kategoriyi çıkar)
-                llm_output = self.llm_classifier.classify_text(result['title'], result['content'])
-                result['child_category'] = llm_output.get("category", "Unknown")
-                result['summary'] = llm_output.get("summary", "")
+                result['summary'] = "(no summary cached)"
+                result['child_category'] = "(unknown)"
+        else:
+            # LLM çağrısı (özeti ve kategoriyi çıkar)
+            llm_output = self.classify_pages([result])[0]
+            self.apply_llm_output(result, llm_output)
 
-                # LLM sonucu cache'e ekle
-                self.similarity_checker.cache_llm_output(url, {
-                    "summary": result['summary'],
-                    "category": result['child_category']
-                })
+    def classify_pages(self, results):
+        """Unique sayfaları sınıflandır (embedding modunda dedupe index'teki embedding yeniden kullanılır)"""
+        items = [(r['title'], r['content']) for r in results]
+        start = time.perf_counter()
+        try:
+            with self.metrics.stage('llm', len(items)):
+                if self.category_classifier is None:
+                    return self.llm_classifier.classify_many(items)
+                get_embedding = getattr(self.similarity_checker, 'get_embedding', None)
+                embeddings = [get_embedding(r['url']) if get_embedding else None for r in results]
+                return self.category_classifier.classify_many(items, embeddings)
+        finally:
+            if self.timing_enabled and results:
+                # Eşzamanlı / batch LLM çağrısının süresi sayfalara eşit paylaştırılır
+                share = (time.perf_counter() - start) / len(results)
+                for result in results:
+                    self._timer(result).add('llm', share)
 
+    def apply_llm_output(self, result, llm_output):
+        result['child_category'] = llm_output.get("category", "Unknown")
+        result['summary'] = llm_output.get("summary", "")
+        result['classified_by'] = llm_output.get("classified_by", "llm")
+        # LLM hatası sessizce "Unknown" olarak kalmasın
+        result['llm_error'] = llm_output.get("error", "")
+
+        # LLM sonucu cache'e ekle
+        self.similarity_checker.cache_llm_output(result['url'], {
+            "summary": result['summary'],
+            "category": result['child_category']
+        })
+
+    def extract_content(self, url):
+        start = time.perf_counter()
+        result = self.fetch_content(url)
+        if result['status'] != 'success':
+            return result
+
+        try:
+            # Duplicate kontrolü LLM'den önce yapılır
+            with self.metrics.stage('similarity'):
+                is_duplicate, duplicate_info, similarity_scores = self.similarity_checker.is_duplicate_comprehensive(
+                    url, result['title'], result['content'], timer=self._timer(result)
+                )
+            self.apply_similarity(result, is_duplicate, duplicate_info, similarity_scores)
+            self.classify_result(result)
         except Exception as e:
-            error_msg = str(e).lower()
-            if 'timeout' in error_msg:
-                result['error'] = 'Timeout error'
-            elif 'connection' in error_msg:
-                result['error'] = 'Connection error'
-            elif any(code in error_msg for code in ['404', '403', '500', '502', '503']):
-                result['error'] = f'HTTP error: {error_msg}'
-            else:
-                result['error'] = f'Unexpected error: {str(e)}'
+            result['error'] = self._describe_error(e)
 
+        result['elapsed'] = time.perf_counter() - start
         return result
 
-    def extract_multiple_urls(self, urls, progress_callback=None, stop_flag=None):
-        results = []
-        total_urls = len(urls)
-        start_time = time.time()
+    def _fetch_with_delay(self, url):
+        result = self.fetch_content(url)
+        time.sleep(getattr(self, 'delay', 0))
+        return result
 
+    def _extract_batch(self, urls, executor):
+        """Bir grup URL'yi paralel indir, sonra sırayla duplicate kontrolü ve sınıflandırma yap"""
+        results = list(executor.map(self._fetch_with_delay, urls))
+        successful = [r for r in results if r['status'] == 'success']
+        processing_start = time.perf_counter()
+        try:
+            with self.metrics.stage('similarity', len(successful)):
+                checks = self.similarity_checker.check_many(
+                    [(r['url'], r['title'], r['content']) for r in successful], max_workers=self.max_workers,
+                    timers=[self._timer(r) for r in successful] if self.timing_enabled else None
+                )
+        except Exception as e:
+            for result in successful:
+                result['error'] = self._describe_error(e)
+            return results
+
+        for result, check in zip(successful, checks):
+            self.apply_similarity(result, *check)
+
+        # Önce unique sayfalar eşzamanlı olarak LLM'e gider, duplicate'ler sonra cache'ten doldurulur
+        unique = [r for r in successful if not (r['is_duplicate'] and r['duplicate_info'])]
+        try:
+            outputs = self.classify_pages(unique)
+            for result, llm_output in zip(unique, outputs):
+                self.apply_llm_output(result, llm_output)
+        except Exception as e:
+            for result in unique:
+                result['error'] = self._describe_error(e)
+
+        for result in successful:
+            if result['is_duplicate'] and result['duplicate_info']:
+                try:
+                    self.classify_result(result)
+                except Exception as e:
+                    result['error'] = self._describe_error(e)
+
+        # Duplicate kontrolü + sınıflandırma süresi sayfalara eşit paylaştırılır
+        if successful:
+            share = (time.perf_counter() - processing_start) / len(successful)
+            for result in successful:
+                result['elapsed'] += share
+        return results
+
+    def _format_status(self, result):
+        status_msg = ""
+        if result['status'] == 'success':
+            similarity_info = (
+                f"MinHash: {result.get('minhash_similarity', 0):.3f} | "
+                f"SimHash: {result.get('simhash_distance', 64)}"
+            )
+            # Embedding varsa ekle
+            if result.get('similarity_scores', {}).get('embedding_enabled', False):
+                emb_sim = result['similarity_scores'].get('embedding_max_similarity', 0)
+                similarity_info += f" | Embedding: {emb_sim:.3f}"
+
+            if result.get('is_duplicate', False):
+                method = result.get("duplicate_info", {}).get("method", "Unknown")
+                original_url = result.get("duplicate_info", {}).get("original_url", "N/A")
+                status_msg = f"🔄 DUPLICATE ({method}) → {original_url} | {similarity_info}"
+            else:
+                status_msg = f"✅ Success | Category: {result.get('child_category', 'Unknown')} | {similarity_info}"
+                if result.get('llm_error'):
+                    status_msg += f" | ⚠️ LLM error ({result['llm_error'].split(':', 1)[0]})"
+        elif result['status'] == 'failed':
+            error = result.get('error', 'Unknown error')
+            status_msg = f"❌ Failed ({error})"
+        else:
+            status_msg = f"Status: {result['status']}"
+        return status_msg
+
+    def extract_multiple_urls(self, urls, progress_callback=None, stop_flag=None, total=None):
+        """URL'leri işle ve tüm sonuçları liste olarak döndür
+
+        Every result is kept in memory; for large inputs use
+        stream_multiple_urls, which returns only run_summary. The journal and
+        sink, if set, receive the results here as well.
+        """
+        self._collected_results = []
+        try:
+            self.stream_multiple_urls(urls, progress_callback, stop_flag, total)
+            return self._collected_results
+        finally:
+            self._collected_results = None
+
+    def stream_multiple_urls(self, urls, progress_callback=None, stop_flag=None, total=None):
+        """URL listesini veya herhangi bir iterable'ı (ör. FileHandler.iter_urls) sonuç tutmadan işle
+
+        Results are not collected in memory. Each one goes through
+        _record_result as it completes: run_summary, metrics, result_journal
+        (all results) and result_sink (successful results), so memory does not
+        grow with the input. Returns run_summary (the run's counters).
+
+        total is only used for progress; it defaults to len(urls) when urls
+        has a length and may be an estimate.
+        """
+        if total is None and hasattr(urls, '__len__'):
+            total = len(urls)
+        self.run_summary.reset()
+        self.metrics.start(total)
+        if self.profiler is not None:
+            self.profiler.start_run(self)
+        try:
+            if self.max_workers > 1:
+                self._extract_multiple_parallel(urls, progress_callback, stop_flag, total)
+            else:
+                self._extract_multiple_sequential(urls, progress_callback, stop_flag, total)
+            return self.run_summary
+        finally:
+            if self.profiler is not None:
+                self.profiler.finish_run()
+
+    def _profile_unit(self):
+        return self.profiler.unit() if self.profiler is not None else nullcontext()
+
+    def _extract_multiple_sequential(self, urls, progress_callback=None, stop_flag=None, total=None):
         for i, url in enumerate(urls):
             if stop_flag and stop_flag():
                 break
 
+            # URL'ler arası bekleme (ilk URL'den önce değil)
+            if i > 0:
+                time.sleep(getattr(self, 'delay', 0))
+
             if progress_callback:
-                progress = (i + 1) / total_urls * 100
-                progress_callback(progress, f"Processing URL {i+1}/{total_urls}: {url.strip()}")
+                progress = self._progress(i + 1, total)
+                progress_callback(progress, f"Processing URL {i+1}/{total or '?'}: {url.strip()}")
 
-            result = self.extract_content(url.strip())
-            results.append(result)
+            with self._profile_unit():
+                result = self.extract_content(url.strip())
+            self._record_result(result)
 
             if progress_callback:
-                status_msg = ""
-                if result['status'] == 'success':
-                    if result.get('is_duplicate', False):
-                        method = result.get("duplicate_info", {}).get("method", "Unknown")
-                        original_url = result.get("duplicate_info", {}).get("original_url", "N/A")
-                        similarity_info = (
-                            f"MinHash: {result.get('minhash_similarity', 0):.3f} | "
-                            f"SimHash: {result.get('simhash_distance', 64)}"
-                        )
-                        # Embedding varsa ekle
-                        if result.get('similarity_scores', {}).get('embedding_enabled', False):
-                            emb_sim = result['similarity_scores'].get('embedding_max_similarity', 0)
-                            similarity_info += f" | Embedding: {emb_sim:.3f}"
-                        status_msg = f"🔄 DUPLICATE ({method}) → {original_url} | {similarity_info}"
-                    else:
-                        similarity_info = (
-                            f"MinHash: {result.get('minhash_similarity', 0):.3f} | "
-                            f"SimHash: {result.get('simhash_distance', 64)}"
-                        )
-                        if result.get('similarity_scores', {}).get('embedding_enabled', False):
-                            emb_sim = result['similarity_scores'].get('embedding_max_similarity', 0)
-                            similarity_info += f" | Embedding: {emb_sim:.3f}"
-
-                        status_msg = f"✅ Success | Category: {result.get('child_category', 'Unknown')} | {similarity_info}"
-                elif result['status'] == 'failed':
-                    error = result.get('error', 'Unknown error')
-                    status_msg = f"❌ Failed ({error})"
-                else:
-                    status_msg = f"Status: {result['status']}"
-
-                progress_callback(progress, status_msg)
-
-            if i < total_urls - 1:
-                time.sleep(getattr(self, 'delay', 0))
+                progress_callback(progress, self._format_status(result))
+
+    def _record_result(self, result):
+        """Tamamlanan sonucu özet, metrikler, journal ve çıktı sink'ine aktar (liste tutulmaz)"""
+        self.run_summary.add(result)
+        self.metrics.url_done()
+        if self.result_journal is not None:
+            self.result_journal.append(result)
+        if self.result_sink is not None and result['status'] == 'success':
+            self.result_sink.write(result)
+        if self._collected_results is not None:
+            self._collected_results.append(result)
+
+    def _progress(self, done, total):
+        # Tahmini toplamda sayım aşılabilir
+        return min(done / total * 100, 100) if total else 0
+
+    def _extract_multiple_parallel(self, urls, progress_callback=None, stop_flag=None, total=None):
+        batch_size = self.max_workers * 4
+        url_iter = iter(urls)
+        start = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                if stop_flag and stop_flag():
+                    break
+
+                batch = [url.strip() for url in islice(url_iter, batch_size)]
+                if not batch:
+                    break
+                if progress_callback:
+                    progress_callback(self._progress(start, total),
+                                      f"Processing URLs {start + 1}-{start + len(batch)}/{total or '?'}")
+
+                with self._profile_unit():
+                    batch_results = self._extract_batch(batch, executor)
+                for offset, result in enumerate(batch_results):
+                    self._record_result(result)
+                    if progress_callback:
+                        progress = self._progress(start + offset + 1, total)
+                        progress_callback(progress, f"{result['url']}: {self._format_status(result)}")
+                start += len(batch)
 
-        return results
 
 
+    def get_llm_stats(self):
+        """Prompt uzunluğu / gecikme ve (varsa) embedding sınıflandırıcı istatistikleri"""
+        stats = self.llm_classifier.get_stats()
+        if self.category_classifier is not None:
+            stats['embedding_classifier'] = self.category_classifier.get_stats()
+        return stats
 
     def get_similarity_analysis(self):
         return self.similarity_checker.analyze_similarity_distribution()
@@ -1,15 +1,120 @@
 import csv
 import os
-from typing import List, Dict
+import io
+import gzip
+from typing import List, Dict, Iterable, Iterator, Tuple
 import logging
 
+from output_sinks import CSVSink, create_sink
+from run_summary import SummaryAggregator
+
+try:
+    import zstandard
+except ImportError:  # .zst girişleri için opsiyonel
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
 class FileHandler:
     """Dosya okuma ve yazma işlemleri için sınıf"""
+
+    URL_FILE_EXTENSIONS = ('.txt', '.txt.gz', '.gz', '.txt.zst', '.zst')
+    # Bu boyuttan küçük sıkıştırılmamış dosyalarda satırlar tam sayılır, büyüklerde tahmin edilir
+    COUNT_SCAN_LIMIT = 256 * 1024 * 1024
+    COUNT_SAMPLE_BYTES = 1024 * 1024
     
     def __init__(self):
         pass
+
+    def _open_raw(self, file_path: str):
+        """Dosyayı (gerekirse gzip / zstd açarak) binary stream olarak aç"""
+        lower = file_path.lower()
+        if lower.endswith('.gz'):
+            return gzip.open(file_path, 'rb')
+        if lower.endswith('.zst'):
+            if zstandard is None:
+                raise Exception("zstandard package is required to read .zst files (pip install zstandard)")
+            return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+        return open(file_path, 'rb')
+
+    def open_text(self, file_path: str):
+        """Düz, .gz veya .zst dosyayı UTF-8 metin olarak aç"""
+        return io.TextIOWrapper(self._open_raw(file_path), encoding='utf-8-sig')
+
+    def iter_urls(self, file_path: str) -> Iterator[str]:
+        """
+        URL dosyasını satır satır oku (generator); dosya belleğe alınmaz
+
+        Args:
+            file_path (str): .txt, .txt.gz veya .txt.zst dosya yolu
+
+        Yields:
+            str: Boş ve yorum (#) satırları hariç URL'ler
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        with self.open_text(file_path) as file:
+            for line in file:
+                line = line.strip()
+
+                # Boş satırları ve yorum satırlarını atla
+                if not line or line.startswith('#'):
+                    continue
+
+                yield line
+
+    def count_urls(self, file_path: str) -> Dict[str, any]:
+        """
+        URL sayısını ayrıştırmadan ucuza bul
+
+        Uncompressed files up to COUNT_SCAN_LIMIT are counted exactly by
+        scanning for newlines (blank and comment lines included, so the count
+        is an upper bound). Larger and compressed files are estimated from the
+        average line length of the first COUNT_SAMPLE_BYTES.
+
+        Returns:
+            Dict: {'count': int, 'estimated': bool}
+        """
+        file_size = os.path.getsize(file_path)
+        compressed = file_path.lower().endswith(('.gz', '.zst'))
+
+        if not compressed and file_size <= self.COUNT_SCAN_LIMIT:
+            count = 0
+            last = b'\n'
+            with open(file_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(self.COUNT_SAMPLE_BYTES), b''):
+                    count += chunk.count(b'\n')
+                    last = chunk[-1:]
+            if last != b'\n':
+                count += 1
+            return {'count': count, 'estimated': False}
+
+        # Örnek: ilk ~1MB (açılmış) içindeki satır uzunluğu ve sıkıştırma oranı
+        with open(file_path, 'rb') as raw:
+            if file_path.lower().endswith('.gz'):
+                stream = gzip.GzipFile(fileobj=raw)
+            elif compressed:
+                if zstandard is None:
+                    raise Exception("zstandard package is required to read .zst files (pip install zstandard)")
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+            else:
+                stream = raw
+            sample = stream.read(self.COUNT_SAMPLE_BYTES)
+            consumed = raw.tell() or 1
+        lines = sample.count(b'\n')
+        if not sample or consumed >= file_size:
+            return {'count': lines + (1 if sample and not sample.endswith(b'\n') else 0), 'estimated': False}
+        bytes_per_line = len(sample) / max(lines, 1)
+        expanded_size = file_size * len(sample) / consumed
+        if file_path.lower().endswith('.gz'):
+            # gzip trailer'ı açılmış boyutu (mod 2^32) içerir; okuma tamponundan daha doğru
+            with open(file_path, 'rb') as raw:
+                raw.seek(-4, os.SEEK_END)
+                trailer_size = int.from_bytes(raw.read(4), 'little')
+            if trailer_size >= len(sample):
+                expanded_size = trailer_size
+        return {'count': int(expanded_size / bytes_per_line), 'estimated': True}
     
     def read_urls_from_txt(self, file_path: str) -> List[str]:
         """
@@ -26,24 +131,7 @@ class FileHandler:
             Exception: Diğer okuma hataları
         """
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"File not found: {file_path}")
-            
-            urls = []
-            with open(file_path, 'r', encoding='utf-8-sig') as file:
-                for line_num, line in enumerate(file, 1):
-                    line = line.strip()
-                    
-                    # Boş satırları atla
-                    if not line:
-                        continue
-                    
-                    # Yorum satırlarını atla (# ile başlayanlar)
-                    if line.startswith('#'):
-                        continue
-                    
-                    urls.append(line)
-                    logger.debug(f"Read URL from line {line_num}: {line}")
+            urls = list(self.iter_urls(file_path))
             
             logger.info(f"Successfully read {len(urls)} URLs from {file_path}")
             return urls
@@ -58,6 +146,46 @@ class FileHandler:
             logger.error(f"Error reading file {file_path}: {e}")
             raise Exception(f"File reading error: {e}")
     
+    def read_categories_from_csv(self, file_path: str) -> List[Tuple[str, str]]:
+        """
+        Kategori CSV'sini oku (name/category ve description sütunları)
+
+        Args:
+            file_path (str): CSV dosya yolu; başlık yoksa ilk sütun ad, ikinci sütun açıklama
+
+        Returns:
+            List[Tuple[str, str]]: (kategori adı, açıklama) listesi
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+                rows = [row for row in csv.reader(file) if row and row[0].strip()]
+
+            if not rows:
+                raise ValueError("No categories found in file")
+
+            header = [cell.strip().lower() for cell in rows[0]]
+            name_col, description_col = 0, 1
+            if any(key in header for key in ('name', 'category', 'description')):
+                name_col = next((header.index(k) for k in ('name', 'category') if k in header), 0)
+                description_col = header.index('description') if 'description' in header else None
+                rows = rows[1:]
+
+            categories = []
+            for row in rows:
+                name = row[name_col].strip()
+                description = ''
+                if description_col is not None and description_col < len(row):
+                    description = row[description_col].strip()
+                if name and not name.startswith('#'):
+                    categories.append((name, description or name))
+
+            logger.info(f"Successfully read {len(categories)} categories from {file_path}")
+            return categories
+
+        except Exception as e:
+            logger.error(f"Error reading categories file {file_path}: {e}")
+            raise Exception(f"Category file reading error: {e}")
+
     def validate_txt_file(self, file_path: str) -> Dict[str, any]:
         """
         TXT dosyasını doğrula
@@ -71,6 +199,7 @@ class FileHandler:
         result = {
             'valid': False,
             'url_count': 0,
+            'estimated': False,
             'errors': []
         }
         
@@ -79,24 +208,21 @@ class FileHandler:
                 result['errors'].append("File does not exist")
                 return result
             
-            if not file_path.lower().endswith('.txt'):
-                result['errors'].append("File is not a .txt file")
+            if not file_path.lower().endswith(self.URL_FILE_EXTENSIONS):
+                result['errors'].append("File is not a .txt (or .txt.gz / .txt.zst) file")
                 return result
             
-            # Dosya boyutu kontrolü (çok büyük dosyalar için)
-            file_size = os.path.getsize(file_path)
-            if file_size > 10 * 1024 * 1024:  # 10MB limit
-                result['errors'].append("File is too large (>10MB)")
-                return result
-            
-            # URL'leri oku ve say
-            urls = self.read_urls_from_txt(file_path)
-            result['url_count'] = len(urls)
-            
-            if result['url_count'] == 0:
+            # Dosya iki kez ayrıştırılmaz: satırlar sayılır (büyük dosyalarda tahmin edilir)
+            urls = self.iter_urls(file_path)
+            first_url = next(urls, None)
+            urls.close()
+            if first_url is None:
                 result['errors'].append("No URLs found in file")
                 return result
-            
+
+            count = self.count_urls(file_path)
+            result['url_count'] = count['count']
+            result['estimated'] = count['estimated']
             result['valid'] = True
             
         except Exception as e:
@@ -104,135 +230,79 @@ class FileHandler:
         
         return result
     
-    def write_results_to_csv(self, results: List[Dict], output_path: str, append: bool = False):
-        mode = 'a' if append else 'w'
-        file_exists = os.path.exists(output_path)
-        
+    def write_results_to_csv(self, results: Iterable[Dict], output_path: str, append: bool = False,
+                             content_mode: str = 'full', compression: str = 'auto'):
+        """
+        Sonuçları CSV'ye yaz (output_sinks.CSVSink ile; .gz / .zst uzantısı sıkıştırır)
+
+        Args:
+            results (Iterable[Dict]): Extractor sonuçları (liste veya generator)
+            output_path (str): CSV dosya yolu
+            append (bool): Var olan dosyaya ekle
+            content_mode (str): 'full', 'truncate' veya 'none'
+            compression (str): 'auto' (uzantıdan), 'gzip', 'zstd' veya None
+        """
         try:
-            fieldnames = [
-                'url', 'title', 'content', 'category', 'summary',
-                'minhash_score', 'simhash_score', 'embedding_score',
-                'is_duplicate', 'duplicate_of'
-            ]
-            
-            with open(output_path, mode, newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(
-                    csvfile,
-                    fieldnames=fieldnames,
-                    quoting=csv.QUOTE_ALL,       # Tüm hücreleri tırnak içine al
-                    quotechar='"',               # Tırnak karakteri
-                    escapechar='\\',             # İçteki tırnakları kaçır
-                    delimiter=','
-                )
-                
-                if not append or not file_exists:
-                    writer.writeheader()
-                
-                for result in results:
-                    # minhash_similarity için güvenli alma ve dönüştürme
-                    minhash_sim = result.get('minhash_similarity')
-                    if minhash_sim is None:
-                        minhash_sim = ''
-                    
-                    # embedding_score için güvenli alma ve dönüştürme
-                    embedding_score = result.get('embedding_similarity')
-                    if embedding_score is None:
-                        embedding_score = ''
-                    
-                    # simhash_distance'ı simhash_score'a dönüştürme
-                    simhash_dist = result.get('simhash_distance')
-                    if isinstance(simhash_dist, (int, float)):
-                        simhash_score = 1 - (simhash_dist / 64)
-                    else:
-                        simhash_score = ''
-                    
-                    # Category'yi child_category'den al
-                    category = result.get('child_category', '')
-                    
-                    row = {
-                        'url': result.get('url', ''),
-                        'title': result.get('title', ''),
-                        'content': result.get('content', ''),
-                        'category': category,
-                        'summary': result.get('summary', ''),
-                        'minhash_score': minhash_sim,
-                        'simhash_score': simhash_score,
-                        'embedding_score': embedding_score,
-                        'is_duplicate': result.get('is_duplicate', False),
-                        'duplicate_of': result.get('duplicate_info', {}).get('original_url', '')
-                    }
-                    
-                    # İçeride özel karakter varsa temizle
-                    for key in row:
-                        if isinstance(row[key], str):
-                            row[key] = row[key].replace('\n', ' ').replace('\r', ' ').replace('\t', ' ').strip()
-                    
-                    writer.writerow(row)
-            
-            print(f"Successfully wrote {len(results)} results to {output_path}")
+            with CSVSink(output_path, compression=compression, content_mode=content_mode, append=append) as sink:
+                sink.write_many(results)
+
+            # Satırlar yazılırken sayılır; generator'ın len()'i yok
+            logger.info(f"Successfully wrote {sink.rows} results to {output_path}")
             return True
-            
+
         except Exception as e:
-            print(f"Error writing CSV file {output_path}: {e}")
+            logger.error(f"Error writing CSV file {output_path}: {e}")
             raise
 
-    def write_summary_report(self, results: List[Dict], similarity_stats: Dict, output_path: str) -> bool:
+    def write_results(self, results: Iterable[Dict], output_path: str, **options) -> Dict:
+        """
+        Sonuçları dosya uzantısına göre CSV / JSONL / Parquet olarak yaz
+
+        Returns:
+            Dict: Yazma istatistikleri (satır, bayt, saniye, satır/sn)
+        """
+        with create_sink(output_path, **options) as sink:
+            sink.write_many(results)
+        stats = sink.stats()
+        logger.info(f"Wrote {stats['rows']} results to {output_path} "
+                    f"({stats['bytes'] / 1024 / 1024:.1f} MB, {stats['rows_per_sec']:.0f} rows/sec)")
+        return stats
+
+    @staticmethod
+    def _output_base(output_path: str) -> str:
+        base = output_path
+        for suffix in ('.gz', '.zst'):
+            if base.lower().endswith(suffix):
+                base = base[:-len(suffix)]
+        return os.path.splitext(base)[0]
+
+    def summary_report_path(self, output_path: str) -> str:
+        """results.csv(.gz) / results.jsonl / results.parquet -> results_summary_report.txt"""
+        return self._output_base(output_path) + '_summary_report.txt'
+
+    def similarity_log_path(self, output_path: str) -> str:
+        """results.csv -> results_similarity_logs.jsonl"""
+        return self._output_base(output_path) + '_similarity_logs.jsonl'
+
+    def write_summary_report(self, results, similarity_stats: Dict, output_path: str) -> bool:
         """
         Detaylı özet raporu oluştur
+
+        Args:
+            results: run_summary.SummaryAggregator (tercih edilen) veya sonuç listesi
+            similarity_stats (Dict): SimilarityChecker.get_comprehensive_stats() çıktısı
+            output_path (str): Sonuç dosyasının yolu; rapor yanına yazılır
         """
         try:
-            report_path = output_path.replace('.csv', '_summary_report.txt')
-            
+            report_path = self.summary_report_path(output_path)
+
+            aggregator = results
+            if not isinstance(results, SummaryAggregator):
+                aggregator = SummaryAggregator()
+                aggregator.add_many(results)
+
             with open(report_path, 'w', encoding='utf-8') as f:
-                f.write("URL EXTRACTION SUMMARY REPORT\n")
-                f.write("=" * 50 + "\n\n")
-                
-                # Genel istatistikler
-                total_urls = len(results)
-                successful_urls = len([r for r in results if r['status'] == 'success'])
-                failed_urls = total_urls - successful_urls
-                
-                f.write(f"GENERAL STATISTICS:\n")
-                f.write(f"Total URLs processed: {total_urls}\n")
-                f.write(f"Successful extractions: {successful_urls}\n")
-                f.write(f"Failed extractions: {failed_urls}\n")
-                f.write(f"Success rate: {(successful_urls/total_urls)*100:.1f}%\n\n")
-                
-                # Similarity statistics
-                f.write(f"SIMILARITY ANALYSIS:\n")
-                f.write(f"Unique content: {similarity_stats.get('unique_count', 0)}\n")
-                f.write(f"Duplicate content: {similarity_stats.get('duplicate_count', 0)}\n")
-                f.write(f"Total processed: {similarity_stats.get('total_processed', 0)}\n\n")
-                
-                # Parent kategori istatistikleri
-                f.write(f"CONTENT BY PARENT CATEGORY:\n")
-                category_stats = similarity_stats.get('category_stats', {})
-                for category, count in sorted(category_stats.items()):
-                    f.write(f"  {category}: {count} unique URLs\n")
-                f.write("\n")
-                
-                # Hata analizi
-                error_counts = {}
-                for result in results:
-                    if result['status'] == 'failed' and result['error']:
-                        error_type = result['error']
-                        error_counts[error_type] = error_counts.get(error_type, 0) + 1
-                
-                if error_counts:
-                    f.write(f"ERROR ANALYSIS:\n")
-                    for error_type, count in sorted(error_counts.items()):
-                        f.write(f"  {error_type}: {count} occurrences\n")
-                    f.write("\n")
-                
-                # Duplicate'ler
-                duplicates = [r for r in results if r.get('is_duplicate')]
-                if duplicates:
-                    f.write(f"DUPLICATE CONTENT FOUND:\n")
-                    for dup in duplicates:
-                        f.write(f"  URL: {dup['url']}\n")
-                        f.write(f"  Original: {dup['duplicate_of']}\n")
-                        f.write(f"  Category: {dup['parent_category']}\n")
-                        f.write(f"  Hash: {dup['content_hash'][:16]}...\n\n")
+                f.write(aggregator.render(similarity_stats or {}))
             
             print(f"Summary report saved to: {report_path}")
             return True
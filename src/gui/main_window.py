@@ -1,5 +1,6 @@
 import time
 import os
+import queue
 import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox
@@ -10,14 +11,22 @@ from ttkbootstrap.constants import *
 
 from extractor import URLExtractor
 from file_handler import FileHandler
-from llm_classifier import LLMClassifier
+from profiling import RunProfiler
+from result_source import ResultJournal
 
 
 class URLExtractorGUI:
-    def __init__(self, root):
+    # Worker mesajları kuyruktan saniyede UI_FPS kez toplu olarak işlenir
+    UI_FPS = 20
+    MAX_LOG_LINES = 2000
+    MAX_MESSAGES_PER_FRAME = 500
+    # Metrik paneli daha seyrek yenilenir
+    METRICS_INTERVAL_MS = 1000
+
+    def __init__(self, root, profiler=None, profile_enabled=False, timing_columns=False):
         self.root = root
         self.root.title("URL Content Extractor")
-        self.root.geometry("600x500")
+        self.root.geometry("700x650")
         self.root.resizable(True, True)
         self.stop_requested = False
 
@@ -25,13 +34,31 @@ class URLExtractorGUI:
         self.input_file_path = tk.StringVar()
         self.output_file_path = tk.StringVar()
         self.progress_var = tk.DoubleVar()
+        # Profil modu (main.py --profile ile veya checkbox'tan açılır)
+        self.profile_var = tk.BooleanVar(value=profile_enabled)
+        self.profiler = profiler or RunProfiler()
+        # timing_<stage>_ms sütunları isteğe bağlı: varsayılan çıktı şeması değişmez
+        self.timing_columns_var = tk.BooleanVar(value=timing_columns)
         # Extractor ve FileHandler
         self.extractor = URLExtractor(timeout=10, delay=0.1)
         self.file_handler = FileHandler()
-        self.llm_classifier = LLMClassifier()
+        # Extractor ile aynı classifier: bağlantı havuzu, health cache ve warm-up paylaşılır
+        self.llm_classifier = self.extractor.llm_classifier
         self.processing = False
-        
+        # Son çalıştırmanın sonuçları (diskte JSONL); önizleme ve kaydetme buradan okur
+        self.result_journal = None
+
+        # Thread-safe UI kuyruğu: ('log', mesaj) veya ('call', fonksiyon)
+        self._ui_queue = queue.Queue()
+        self._pending_progress = None
+
         self.setup_ui()
+        self.root.after(self._ui_interval_ms, self._drain_ui_queue)
+        self.root.after(self.METRICS_INTERVAL_MS, self._refresh_metrics)
+
+    @property
+    def _ui_interval_ms(self):
+        return max(1, int(1000 / self.UI_FPS))
     
     def setup_ui(self):
         """Ana UI bileşenlerini oluştur"""
@@ -48,10 +75,11 @@ class URLExtractorGUI:
         self._create_file_selection(main_frame)
         self._create_buttons(main_frame)
         self._create_progress_bar(main_frame)
+        self._create_metrics_panel(main_frame)
         self._create_status_area(main_frame)
         
         # Grid weights for resizing
-        main_frame.rowconfigure(6, weight=1)
+        main_frame.rowconfigure(7, weight=1)
 
         # İlk mesaj
         self.log_message("Ready to start. Please select input and output files.")
@@ -104,9 +132,15 @@ class URLExtractorGUI:
         self.stop_btn = ttk.Button(button_frame, text="Stop Extraction", 
                                   style="Danger.TButton", command=self.stop_extraction)
 
+        self.profile_check = ttk.Checkbutton(button_frame, text="Profile run", variable=self.profile_var)
+        self.timing_columns_check = ttk.Checkbutton(button_frame, text="Timing columns",
+                                                    variable=self.timing_columns_var)
+
         # Butonları yan yana, ortalanmış ve aralarında 10px boşlukla pack et
         self.process_btn.pack(side="left", padx=(0, 10))
         self.stop_btn.pack(side="left")
+        self.profile_check.pack(side="left", padx=(20, 0))
+        self.timing_columns_check.pack(side="left", padx=(10, 0))
 
         # Başlangıçta Stop butonunu pasif yap
         self.stop_btn.config(state="disabled")
@@ -117,10 +151,27 @@ class URLExtractorGUI:
                                             maximum=100, length=400)
         self.progress_bar.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
 
+    def _create_metrics_panel(self, parent):
+        """Canlı metrik paneli (hız, ETA, aşama gecikmeleri, cache hit oranları)"""
+        metrics_frame = ttk.LabelFrame(parent, text="Live Metrics", padding="10")
+        metrics_frame.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 5))
+        self.metrics_var = tk.StringVar(value="Waiting for extraction to start...")
+        ttk.Label(metrics_frame, textvariable=self.metrics_var, font=("Consolas", 9),
+                  justify=tk.LEFT).grid(row=0, column=0, sticky=tk.W)
+
+    def _refresh_metrics(self):
+        """Çalışma sırasında metrik panelini güncelle"""
+        if self.processing:
+            try:
+                self.metrics_var.set("\n".join(self.extractor.metrics.format_lines()))
+            except Exception as e:
+                self.metrics_var.set(f"Metrics unavailable: {e}")
+        self.root.after(self.METRICS_INTERVAL_MS, self._refresh_metrics)
+
     def _create_status_area(self, parent):
         """Status area oluştur"""
         status_frame = ttk.LabelFrame(parent, text="Status", padding="10")
-        status_frame.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        status_frame.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
         status_frame.columnconfigure(0, weight=1)
         status_frame.rowconfigure(0, weight=1)
 
@@ -140,7 +191,7 @@ class URLExtractorGUI:
         """Input dosyası seçimi için dialog"""
         file_path = filedialog.askopenfilename(
             title="Select Input File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Text files", "*.txt *.txt.gz *.txt.zst"), ("All files", "*.*")]
         )
         if file_path:
             self.input_file_path.set(file_path)
@@ -151,19 +202,60 @@ class URLExtractorGUI:
         file_path = filedialog.asksaveasfilename(
             title="Save Output File",
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv *.csv.gz"), ("JSON Lines", "*.jsonl *.jsonl.gz"),
+                       ("Parquet", "*.parquet"), ("All files", "*.*")]
         )
         if file_path:
             self.output_file_path.set(file_path)
             self.log_message(f"Output file set: {os.path.basename(file_path)}")
 
     def log_message(self, message):
-        """Status area'ya mesaj ekle"""
+        """Status area'ya mesaj ekle (her thread'den çağrılabilir, sonraki frame'de yazılır)"""
+        self._ui_queue.put(('log', message))
+
+    def call_in_ui(self, func):
+        """func'ı Tk ana thread'inde çalıştır (worker thread'lerden root.after yerine)"""
+        self._ui_queue.put(('call', func))
+
+    def _drain_ui_queue(self):
+        """Kuyruktaki mesajları tek seferde yaz, son progress değerini uygula, log'u sınırla"""
+        lines = []
+        calls = []
+        try:
+            for _ in range(self.MAX_MESSAGES_PER_FRAME):
+                kind, payload = self._ui_queue.get_nowait()
+                if kind == 'log':
+                    lines.append(f"{payload}\n")
+                else:
+                    calls.append(payload)
+        except queue.Empty:
+            pass
+
+        # Araya giren progress değerlerinden yalnızca sonuncusu çizilir (mesajlar kuyrukta kalır)
+        progress, self._pending_progress = self._pending_progress, None
+        if progress is not None:
+            self.progress_var.set(progress)
+
+        if lines:
+            self._append_log(lines)
+
+        for func in calls:
+            try:
+                func()
+            except Exception as e:
+                self._append_log([f"ERROR: {e}\n"])
+
+        self.root.after(self._ui_interval_ms, self._drain_ui_queue)
+
+    def _append_log(self, lines):
         self.status_text.config(state=tk.NORMAL)
-        self.status_text.insert(tk.END, f"{message}\n")
+        self.status_text.insert(tk.END, "".join(lines))
+        # Widget sınırsız büyümesin: en eski satırları sil
+        line_count = int(self.status_text.index('end-1c').split('.')[0]) - 1
+        if line_count > self.MAX_LOG_LINES:
+            self.status_text.delete('1.0', f"{line_count - self.MAX_LOG_LINES + 1}.0")
         self.status_text.see(tk.END)  # En son mesaja kaydır
         self.status_text.config(state=tk.DISABLED)
-        self.root.update()  # GUI'yi güncelle
 
     def stop_extraction(self):
         """Kullanıcı işlemi iptal ettiğinde çağrılır"""
@@ -171,6 +263,7 @@ class URLExtractorGUI:
             return
         self.stop_requested = True
         self.log_message("❌ Extraction stopped by user.")
+        self._pending_progress = None
         self.progress_var.set(0)
         self.process_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
@@ -196,7 +289,9 @@ class URLExtractorGUI:
             messagebox.showerror("Validation Error", error_msg)
             return
 
-        self.log_message(f"Found {validation['url_count']} URLs to process")
+        approx = "~" if validation.get('estimated') else ""
+        self.log_message(f"Found {approx}{validation['url_count']} URLs to process")
+        self.url_count = validation['url_count']
 
         # Buton durumları ayarlanır
         self.process_btn.config(state="disabled")
@@ -206,6 +301,10 @@ class URLExtractorGUI:
         self.processing = True
         self.progress_var.set(0)
 
+        self.extractor.profiler = self.profiler if self.profile_var.get() else None
+        if self.extractor.profiler is not None:
+            self.log_message(f"Profiling enabled: snapshots in {os.path.abspath(self.profiler.output_dir)}")
+
         # Threading ile işlemi başlat
         thread = threading.Thread(target=self.run_extraction)
         thread.daemon = True
@@ -222,23 +321,29 @@ class URLExtractorGUI:
 
             if llm_ok:
                 self.log_message("✅ Connection successful. LLM classification is enabled.")
+                self.log_message("Loading the LLM model...")
+                self.llm_classifier.warm_up()
             else:
                 self.log_message("❌ Failed to connect to the LLM model. Classification will be skipped.")
 
-            # URL'leri oku
+            # URL'ler dosyadan akış halinde okunur (liste belleğe alınmaz)
             self.log_message("Reading URLs from file...")
-            urls = self.file_handler.read_urls_from_txt(self.input_file_path.get())
+            urls = self.file_handler.iter_urls(self.input_file_path.get())
             start_extraction = time.time()
 
             def progress_callback(progress, message):
-                self.root.after(0, lambda: self.update_progress(progress, message))
+                self.update_progress(progress, message)
 
             def stop_flag():
                 return self.stop_requested
 
+            # Sonuçlar bellekte toplanmaz: tamamlandıkça journal'a (diske) eklenir
+            journal = self._new_result_journal()
+
             # URL'lerden içerik çıkar
             self.log_message("Starting content extraction...")
-            results = self.extractor.extract_multiple_urls(urls, progress_callback, stop_flag=stop_flag)
+            self.extractor.stream_multiple_urls(urls, progress_callback, stop_flag=stop_flag,
+                                                total=getattr(self, 'url_count', None))
 
             extraction_duration = time.time() - start_extraction
 
@@ -248,34 +353,55 @@ class URLExtractorGUI:
             }
 
             def save_csv():
-                successful_results = [r for r in results if r['status'] == 'success']
-                self.log_message(f"Writing {len(successful_results)} successful results to CSV...")
-                self.file_handler.write_results_to_csv(successful_results, self.output_file_path.get())
-                total_count = len(results)
-                success_count = len(successful_results)
+                success_count = journal.count(status='success')
+                self.log_message(f"Writing {success_count} successful results...")
+                # Format dosya uzantısından seçilir (.csv, .csv.gz, .jsonl, .parquet ...)
+                write_stats = self.file_handler.write_results(journal.iter_results(status='success'),
+                                                             self.output_file_path.get(),
+                                                             timings=self.timing_columns_var.get())
+                self.log_message(f"Output: {write_stats['format']}, {write_stats['bytes'] / 1024 / 1024:.1f} MB, "
+                                 f"{write_stats['rows_per_sec']:.0f} rows/sec")
+                # Özet rapor, çalıştırma sırasında güncellenen sayaçlardan üretilir
+                self.file_handler.write_summary_report(self.extractor.run_summary,
+                                                       self.extractor.get_similarity_stats() or {},
+                                                       self.output_file_path.get())
+                total_count = len(journal)
                 final_message = f"Saved {success_count} successful results out of {total_count} total URLs."
                 self.progress_var.set(0)
                 self.stop_btn.config(state="disabled")
                 self.log_message(final_message)
                 messagebox.showinfo("Success", final_message)
 
-            self.root.after(0, lambda: self.show_preview(results, on_confirm=save_csv, timing_info=timing_info))
+            self.call_in_ui(lambda: self.show_preview(journal, on_confirm=save_csv, timing_info=timing_info))
 
         except Exception as e:
             error_msg = f"Error during extraction: {str(e)}"
-            self.root.after(0, lambda: self.log_message(f"ERROR: {error_msg}"))
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
+            self.log_message(f"ERROR: {error_msg}")
+            self.call_in_ui(lambda: messagebox.showerror("Error", error_msg))
 
         finally:
-            self.root.after(0, self.finish_extraction)
+            # Journal önizleme/kaydetme için açık kalır; extractor'a artık yazılmaz
+            self.extractor.result_journal = None
+            self.call_in_ui(self.finish_extraction)
+
+    def _new_result_journal(self):
+        """Önceki çalıştırmanın journal'ını kapat, yenisini extractor'a bağla"""
+        if self.result_journal is not None:
+            self.result_journal.close()
+        self.result_journal = ResultJournal()
+        self.extractor.result_journal = self.result_journal
+        return self.result_journal
 
     def update_progress(self, progress, message):
-        """Progress bar ve mesajı güncelle"""
-        self.progress_var.set(progress)
-        self.log_message(message)
+        """Progress bar ve mesajı güncelle (yalnızca progress değeri birleştirilir, mesajlar kaybolmaz)"""
+        self._pending_progress = progress
+        if message:
+            self._ui_queue.put(('log', message))
 
     def finish_extraction(self):
         """Extraction tamamlandığında GUI'yi normale döndür"""
+        # Son değerler panelde kalsın
+        self.metrics_var.set("\n".join(self.extractor.metrics.format_lines()))
         self.processing = False
         self.process_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
@@ -2,133 +2,106 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import ttkbootstrap as ttk
 
+from result_source import ListResultSource, ResultSource
+
 
 class PreviewWindow:
     def __init__(self, parent, extractor):
         self.parent = parent
         self.extractor = extractor
 
+    PAGE_SIZE = 200
+    STATUS_FILTERS = {"All": None, "Successful": 'success', "Failed": 'failed'}
+    DUPLICATE_FILTERS = {"All": None, "Unique": False, "Duplicate": True}
+    COLUMNS = (
+        ("index", "#", 60),
+        ("url", "URL", 260),
+        ("title", "Title", 200),
+        ("category", "Category", 140),
+        ("status", "Status", 70),
+        ("detail", "Duplicate / Error", 220)
+    )
+
     def show(self, results, on_confirm, timing_info=None):
-        """Çıkarılan verilerin önizlemesini gösterir ve kullanıcıya 'Kaydet' / 'İptal' seçeneği sunar"""
+        """Çıkarılan verilerin önizlemesini gösterir ve kullanıcıya 'Kaydet' / 'İptal' seçeneği sunar
+
+        results bir liste veya result_source.ResultSource (ör. ResultJournal) olabilir; tabloya
+        yalnızca görüntülenen sayfa yüklenir.
+        """
         try:
+            self.source = results if isinstance(results, ResultSource) else ListResultSource(results)
+            self.current_page = 0
+
             preview_window = tk.Toplevel(self.parent)
             preview_window.title("Extraction Preview")
-            preview_window.geometry("900x600")
+            preview_window.geometry("1000x650")
             preview_window.minsize(700, 400)
             preview_window.transient(self.parent)  # Ana pencereye bağla
             preview_window.grab_set()  # Modal yap
-            
+            self.window = preview_window
+
             # Grid configuration
-            preview_window.rowconfigure(0, weight=1)
+            preview_window.rowconfigure(2, weight=1)
             preview_window.columnconfigure(0, weight=1)
 
-            # Text widget ve scrollbar
-            preview_text = tk.Text(preview_window, wrap=tk.WORD, font=("Segoe UI", 10))
-            preview_text.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-
-            scrollbar = ttk.Scrollbar(preview_window, orient="vertical", command=preview_text.yview)
-            scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, 10), pady=10)
-            preview_text.config(yscrollcommand=scrollbar.set)
+            # Özet (önceden hesaplanmış sayaçlardan)
+            summary_text = tk.Text(preview_window, height=9, wrap=tk.WORD, font=("Segoe UI", 10))
+            summary_text.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(10, 5))
+            summary_text.insert(tk.END, "\n".join(self._generate_summary(timing_info)))
+            summary_text.config(state=tk.DISABLED)
 
-            # Preview içeriğini oluştur
-            preview_content = self._generate_preview_content(results, timing_info)
-
-            # Text widget'a içeriği ekle
-            preview_text.insert(tk.END, "\n".join(preview_content))
-            preview_text.config(state=tk.DISABLED)
+            self._create_filters(preview_window)
+            self._create_table(preview_window)
 
             # Button frame
             button_frame = ttk.Frame(preview_window, padding=(10, 5))
-            button_frame.grid(row=1, column=0, columnspan=2, sticky="ew")
+            button_frame.grid(row=4, column=0, columnspan=2, sticky="ew")
 
             self._create_buttons(button_frame, preview_window, on_confirm)
-            
+
+            self._load_page()
+
             # Pencereyi merkeze getir
             self._center_window(preview_window)
-            
+
         except Exception as e:
             self._handle_preview_error(e, on_confirm)
 
-    def _generate_preview_content(self, results, timing_info):
-        """Preview içeriğini oluştur"""
-        # Results listelerini güvenli şekilde oluştur
-        successful_results = []
-        failed_results = []
-        duplicate_results = []
-        
-        for result in results:
-            if not isinstance(result, dict):
-                continue
-                
-            status = result.get('status', 'unknown')
-            if status == 'success':
-                successful_results.append(result)
-                if result.get('is_duplicate', False):
-                    duplicate_results.append(result)
-            elif status == 'failed':
-                failed_results.append(result)
-
-        preview_content = []
-        
-        # Header
-        preview_content.extend(self._generate_header())
-        
-        # Timing info
-        if timing_info:
-            preview_content.extend(self._generate_timing_info(timing_info, len(results)))
-        
-        # Statistics
-        preview_content.extend(self._generate_statistics(results, successful_results, failed_results, duplicate_results))
-        
-        # Similarity stats
-        preview_content.extend(self._generate_similarity_stats())
-        
-        # Successful results preview
-        if successful_results:
-            preview_content.extend(self._generate_successful_results_preview(successful_results))
-        
-        # Failed results
-        if failed_results:
-            preview_content.extend(self._generate_failed_results_preview(failed_results))
-        
-        # Duplicate analysis
-        if duplicate_results:
-            preview_content.extend(self._generate_duplicate_analysis(duplicate_results))
-        
-        return preview_content
+    def _generate_summary(self, timing_info):
+        """Özet bölümü; sonuçlar taranmaz, extractor.run_summary kullanılır"""
+        run_summary = getattr(self.extractor, 'run_summary', None)
+        if run_summary is not None and run_summary.total == len(self.source):
+            summary = run_summary.snapshot()
+            successful, failed, duplicates = summary['successful'], summary['failed'], summary['duplicate_count']
+        else:
+            successful = self.source.count(status='success')
+            failed = len(self.source) - successful
+            duplicates = self.source.count(duplicate=True)
 
-    def _generate_header(self):
-        """Header bölümünü oluştur"""
-        return [
-            "EXTRACTION SUMMARY",
-            "=" * 50,
+        content = []
+        if timing_info:
+            content.extend(self._generate_timing_info(timing_info, len(self.source)))
+        content.extend([
+            f"Total URLs processed: {len(self.source)} | ✅ Successful: {successful} | "
+            f"❌ Failed: {failed} | 🔄 Duplicates: {duplicates}",
             ""
-        ]
+        ])
+        content.extend(self._generate_similarity_stats())
+        if run_summary is not None and run_summary.stage_latency:
+            content.append("")
+            content.append("Stage timings per URL (ms):")
+            content.extend(run_summary.format_stage_lines())
+        return content
 
     def _generate_timing_info(self, timing_info, total_count):
         """Timing bilgilerini oluştur"""
-        content = []
         llm_time = timing_info.get('llm_check_duration', 0)
         extraction_time = timing_info.get('extraction_duration', 0)
-        
-        content.append(f"⏱️ LLM connection time: {llm_time:.2f} seconds")
-        content.append(f"⏱️ Total extraction time: {extraction_time:.2f} seconds")
-        if total_count > 0:
-            avg_time = extraction_time / total_count
-            content.append(f"⏱️ Average per URL: {avg_time:.2f} seconds")
-        content.append("")
-        
-        return content
 
-    def _generate_statistics(self, results, successful_results, failed_results, duplicate_results):
-        """İstatistikleri oluştur"""
-        return [
-            f"Total URLs processed: {len(results)}",
-            f"✅ Successful extractions: {len(successful_results)}",
-            f"❌ Failed extractions: {len(failed_results)}",
-            f"🔄 Duplicate content found: {len(duplicate_results)}",
-            ""
-        ]
+        line = f"⏱️ LLM connection: {llm_time:.2f}s | Total extraction: {extraction_time:.2f}s"
+        if total_count > 0:
+            line += f" | Average per URL: {extraction_time / total_count:.2f}s"
+        return [line]
 
     def _generate_similarity_stats(self):
         """Similarity istatistiklerini oluştur"""
@@ -137,159 +110,155 @@ class PreviewWindow:
             if hasattr(self.extractor, 'get_similarity_stats'):
                 similarity_stats = self.extractor.get_similarity_stats()
                 if similarity_stats and isinstance(similarity_stats, dict):
-                    content.append("COMPREHENSIVE SIMILARITY ANALYSIS")
-                    content.append("-" * 40)
-                    content.append(f"Unique content: {similarity_stats.get('unique_count', 0)}")
-                    content.append(f"Total duplicates: {similarity_stats.get('total_duplicates', 0)}")
-                    content.append(f"Duplicate rate: {similarity_stats.get('duplicate_rate', 0)*100:.1f}%")
-                    
+                    content.append(f"Unique content: {similarity_stats.get('unique_count', 0)} | "
+                                   f"Total duplicates: {similarity_stats.get('total_duplicates', 0)} | "
+                                   f"Duplicate rate: {similarity_stats.get('duplicate_rate', 0)*100:.1f}%")
+
                     detection_methods = similarity_stats.get('detection_methods', {})
                     if detection_methods:
-                        content.append("")
-                        content.append("Duplicate Detection Methods:")
+                        methods = []
                         for method, count in detection_methods.items():
                             icon = "🧠" if method == "Embedding" else "🔍" if method == "MinHash" else "🔗"
-                            content.append(f"  {icon} {method}: {count}")
-                    
-                    category_stats = similarity_stats.get('category_stats', {})
-                    if category_stats:
-                        content.append("")
-                        content.append("CONTENT BY CATEGORY")
-                        content.append("-" * 30)
-                        for category, count in sorted(category_stats.items()):
-                            content.append(f"📁 {category}: {count} unique URLs")
-                        content.append("")
+                            methods.append(f"{icon} {method}: {count}")
+                        content.append("Duplicate Detection Methods: " + " | ".join(methods))
         except Exception as e:
             content.append(f"Note: Could not load similarity statistics: {str(e)}")
-            content.append("")
-        
-        return content
 
-    def _generate_successful_results_preview(self, successful_results):
-        """Başarılı sonuçların önizlemesini oluştur"""
-        content = [
-            "SUCCESSFUL EXTRACTIONS PREVIEW",
-            "-" * 50
-        ]
-        
-        display_count = min(10, len(successful_results))
-        for i, result in enumerate(successful_results[:display_count]):
-            try:
-                url = result.get('url', 'Unknown URL')
-                title = result.get('title', 'No title')
-                child_cat = result.get('child_category', 'Unknown')
-                
-                content.append(f"{i+1}. URL: {url}")
-                content.append(f"   Title: {title}")
-                content.append(f"   Category: {child_cat}")
-                
-                if result.get('is_duplicate'):
-                    content.extend(self._format_duplicate_info(result))
-                
-                summary = result.get('summary', '')
-                if summary:
-                    content.append(f"   Summary: {summary}")
-                
-                content_text = result.get('content', '')
-                if content_text:
-                    content_preview = content_text[:200] + "..." if len(content_text) > 200 else content_text
-                    content.append(f"   Content preview: {content_preview}")
-                
-                content.append("")
-                
-            except Exception as e:
-                content.append(f"   Error displaying result {i+1}: {str(e)}")
-                content.append("")
-        
-        if len(successful_results) > display_count:
-            remaining = len(successful_results) - display_count
-            content.append(f"... and {remaining} more successful extractions.")
-            content.append("")
-        
         return content
 
-    def _generate_failed_results_preview(self, failed_results):
-        """Başarısız sonuçların önizlemesini oluştur"""
-        content = [
-            "FAILED EXTRACTIONS",
-            "-" * 30
-        ]
-        
-        display_count = min(5, len(failed_results))
-        for i, result in enumerate(failed_results[:display_count]):
-            try:
-                url = result.get('url', 'Unknown URL')
-                error = result.get('error', 'Unknown error')
-                content.append(f"{i+1}. URL: {url}")
-                content.append(f"   Error: {error}")
-                content.append("")
-            except Exception as e:
-                content.append(f"   Error displaying failed result {i+1}: {str(e)}")
-                content.append("")
-        
-        if len(failed_results) > display_count:
-            remaining = len(failed_results) - display_count
-            content.append(f"... and {remaining} more failed extractions.")
-            content.append("")
-        
-        return content
+    def _create_filters(self, parent):
+        """Durum / duplicate / kategori filtreleri"""
+        filter_frame = ttk.Frame(parent, padding=(10, 0))
+        filter_frame.grid(row=1, column=0, columnspan=2, sticky="ew")
+
+        self.status_filter = tk.StringVar(value="All")
+        self.duplicate_filter = tk.StringVar(value="All")
+        self.category_filter = tk.StringVar(value="All")
+
+        filters = (
+            ("Status:", self.status_filter, list(self.STATUS_FILTERS)),
+            ("Duplicates:", self.duplicate_filter, list(self.DUPLICATE_FILTERS)),
+            ("Category:", self.category_filter, ["All"] + self.source.categories())
+        )
+        for label, variable, values in filters:
+            ttk.Label(filter_frame, text=label).pack(side=tk.LEFT, padx=(0, 5))
+            combo = ttk.Combobox(filter_frame, textvariable=variable, values=values, state="readonly",
+                                 width=22 if variable is self.category_filter else 12)
+            combo.pack(side=tk.LEFT, padx=(0, 15))
+            combo.bind("<<ComboboxSelected>>", lambda _event: self._on_filter_change())
+
+        self.next_btn = ttk.Button(filter_frame, text="Next ▶", command=lambda: self._change_page(1))
+        self.next_btn.pack(side=tk.RIGHT)
+        self.page_label = ttk.Label(filter_frame, text="")
+        self.page_label.pack(side=tk.RIGHT, padx=10)
+        self.prev_btn = ttk.Button(filter_frame, text="◀ Prev", command=lambda: self._change_page(-1))
+        self.prev_btn.pack(side=tk.RIGHT)
+
+    def _create_table(self, parent):
+        """Sonuç tablosu (Treeview); her seferinde tek sayfa yüklenir"""
+        columns = [name for name, _, _ in self.COLUMNS]
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", selectmode="browse")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, stretch=name in ("url", "title", "detail"))
+        self.tree.grid(row=2, column=0, sticky="nsew", padx=(10, 0), pady=5)
+
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
+        scrollbar.grid(row=2, column=1, sticky="ns", padx=(0, 10), pady=5)
+        self.tree.config(yscrollcommand=scrollbar.set)
+        self.tree.bind("<Double-1>", lambda _event: self._show_selected_details())
+
+        ttk.Label(parent, text="Double-click a row for details.", font=("Segoe UI", 9)).grid(
+            row=3, column=0, sticky="w", padx=10)
+
+    def _current_filters(self):
+        category = self.category_filter.get()
+        return {
+            'status': self.STATUS_FILTERS[self.status_filter.get()],
+            'duplicate': self.DUPLICATE_FILTERS[self.duplicate_filter.get()],
+            'category': None if category == "All" else category
+        }
+
+    def _on_filter_change(self):
+        self.current_page = 0
+        self._load_page()
+
+    def _change_page(self, step):
+        self.current_page += step
+        self._load_page()
+
+    def _load_page(self):
+        """Geçerli filtre ve sayfa için satırları tabloya yükle"""
+        filters = self._current_filters()
+        indices = self.source.matching(**filters)
+        page_count = max(1, (len(indices) + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+        self.current_page = max(0, min(self.current_page, page_count - 1))
+
+        self.tree.delete(*self.tree.get_children())
+        start = self.current_page * self.PAGE_SIZE
+        for index in indices[start:start + self.PAGE_SIZE]:
+            result = self.source.get(index)
+            self.tree.insert("", tk.END, iid=str(index), values=self._row_values(index, result))
+
+        self.page_label.config(text=f"Page {self.current_page + 1}/{page_count} ({len(indices)} rows)")
+        self.prev_btn.config(state="normal" if self.current_page > 0 else "disabled")
+        self.next_btn.config(state="normal" if self.current_page < page_count - 1 else "disabled")
+
+    def _row_values(self, index, result):
+        if result.get('status') != 'success':
+            detail = result.get('error') or 'Unknown error'
+        elif result.get('is_duplicate'):
+            dup_info = result.get('duplicate_info') or {}
+            detail = f"{dup_info.get('method', 'Unknown')} → {dup_info.get('original_url', '')}"
+        else:
+            detail = result.get('llm_error', '')
+        return (
+            index + 1,
+            result.get('url', ''),
+            result.get('title', ''),
+            result.get('child_category', ''),
+            result.get('status', ''),
+            detail
+        )
+
+    def _show_selected_details(self):
+        """Seçili satırın tüm detaylarını ayrı pencerede göster"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        result = self.source.get(int(selection[0]))
 
-    def _generate_duplicate_analysis(self, duplicate_results):
-        """Duplicate analiz bölümünü oluştur"""
         content = [
-            "DUPLICATE ANALYSIS",
-            "-" * 50,
-            ""
+            f"URL: {result.get('url', 'Unknown URL')}",
+            f"Status: {result.get('status', '')}",
+            f"Title: {result.get('title', 'No title')}",
+            f"Category: {result.get('child_category', 'Unknown')}"
         ]
-
-        # Duplicate'leri method'a göre grupla
-        duplicates_by_method = {}
-        for dup in duplicate_results:
-            dup_info = dup.get('duplicate_info', {})
-            method = dup_info.get('method', 'Unknown')
-            if method not in duplicates_by_method:
-                duplicates_by_method[method] = []
-            duplicates_by_method[method].append(dup)
-
-        for method, dups in duplicates_by_method.items():
-            method_icon = "🧠" if method == "Embedding" else "🔍" if method == "MinHash" else "🔗"
-            content.append(f"{method_icon} {method} Duplicates ({len(dups)}):")
-            content.append("-" * 30)
-            
-            for i, dup in enumerate(dups[:5]):  # İlk 5'ini göster
-                try:
-                    url = dup.get('url', 'Unknown URL')
-                    child_cat = dup.get('child_category', 'Unknown')
-                
-                    dup_info = dup.get('duplicate_info', {})
-                    original_url = dup_info.get('original_url', 'Unknown')
-                    similarity = dup_info.get('similarity', 0)
-
-                    content.append(f"  {i+1}. URL: {url}")
-                    content.append(f"     Category: {child_cat}")
-                    content.append(f"     Similarity: {similarity:.3f}")
-                    content.append(f"     Original: {original_url}")
-
-                    # Tüm similarity skorlarını göster
-                    similarity_scores = dup.get('similarity_scores', {})
-                    if similarity_scores:
-                        content.append("     All Scores:")
-                        content.append(f"       MinHash: {similarity_scores.get('minhash_max_similarity', 0):.3f}")
-                        content.append(f"       SimHash: {1 - similarity_scores.get('simhash_min_distance', 64)/64:.3f}")
-                        if similarity_scores.get('embedding_enabled', False):
-                            content.append(f"       Embedding: {similarity_scores.get('embedding_max_similarity', 0):.3f}")
-                    
-                    content.append("")
-
-                except Exception as e:
-                    content.append(f"     Error displaying duplicate {i+1}: {str(e)}")
-                    content.append("")
-            
-            if len(dups) > 5:
-                content.append(f"     ... and {len(dups) - 5} more {method} duplicates.")
-            content.append("")
-
-        return content
+        if result.get('error'):
+            content.append(f"Error: {result['error']}")
+        if result.get('llm_error'):
+            content.append(f"LLM error: {result['llm_error']}")
+        if result.get('is_duplicate'):
+            content.extend(self._format_duplicate_info(result))
+        if result.get('summary'):
+            content.append(f"Summary: {result['summary']}")
+        timings = result.get('timings') or {}
+        if timings:
+            content.append("Timings: " + " | ".join(f"{stage} {seconds * 1000:.1f} ms"
+                                                    for stage, seconds in timings.items()))
+        content_text = result.get('content', '')
+        if content_text:
+            content_preview = content_text[:2000] + "..." if len(content_text) > 2000 else content_text
+            content.extend(["", content_preview])
+
+        detail_window = tk.Toplevel(self.window)
+        detail_window.title("Result Details")
+        detail_window.geometry("700x450")
+        detail_window.transient(self.window)
+        detail_text = tk.Text(detail_window, wrap=tk.WORD, font=("Segoe UI", 10))
+        detail_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        detail_text.insert(tk.END, "\n".join(content))
+        detail_text.config(state=tk.DISABLED)
 
     def _format_duplicate_info(self, result):
         """Duplicate bilgilerini formatla"""
@@ -335,8 +304,8 @@ class PreviewWindow:
                 if hasattr(self.extractor, 'similarity_checker'):
                     filename = filedialog.asksaveasfilename(
                         title="Export Similarity Logs",
-                        defaultextension=".json",
-                        filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+                        defaultextension=".jsonl",
+                        filetypes=[("JSON Lines files", "*.jsonl"), ("All files", "*.*")]
                     )
                     if filename:
                         self.extractor.similarity_checker.export_similarity_logs(filename)
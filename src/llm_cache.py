@@ -0,0 +1,130 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from typing import Dict, Optional
+
+
+class LLMResultCache:
+    """LLM sonuçları için kalıcı, içerik adresli (SQLite) cache
+
+    Keys are a hash of the model, the prompt template version and the
+    normalized title/content, so re-runs over the same pages never call the
+    LLM again. When the cache grows past max_entries the least recently used
+    entries are evicted. The entry count is read from the database inside
+    the write transaction, so several processes can share one file.
+
+    Hits do not write: their last_access times are buffered and written in
+    one transaction every touch_batch_size hits, before each put (so LRU
+    eviction sees them) and on close().
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100000, touch_batch_size: int = 256):
+        if path is None:
+            cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'url_extractor')
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'llm_cache.sqlite3')
+        self.path = path
+        self.max_entries = max_entries
+        self.touch_batch_size = touch_batch_size
+        self.hits = 0
+        self.misses = 0
+        self._pending_touches = {}  # key -> son erişim zamanı (henüz yazılmadı)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache(last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r'\s+', ' ', text or '').strip().lower()
+
+    @classmethod
+    def make_key(cls, model: str, prompt_version, title: str, content: str) -> str:
+        payload = "\x1f".join([model, str(prompt_version), cls.normalize(title), cls.normalize(content)])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pending_touches[key] = time.time()
+            if len(self._pending_touches) >= self.touch_batch_size:
+                self._write_touches()
+                self._conn.commit()
+        return json.loads(row[0])
+
+    def _write_touches(self):
+        """Bekleyen last_access güncellemelerini yaz (kilit altında; commit çağırana kalır)"""
+        if self._pending_touches:
+            self._conn.executemany("UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                                   [(accessed, key) for key, accessed in self._pending_touches.items()])
+            self._pending_touches.clear()
+
+    def flush(self):
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+
+    def put(self, key: str, value: Dict):
+        with self._lock:
+            # İlk ifade yazma olduğu için write lock alınır; COUNT diğer süreçlerin eklediklerini de görür
+            self._write_touches()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, last_access) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if size > self.max_entries:
+                # En az kullanılan kayıtları sil (LRU)
+                excess = size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)", (excess,)
+                )
+                logging.debug(f"LLM cache evicted {excess} entries")
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._pending_touches.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        entries = len(self)
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0,
+            'path': self.path
+        }
+
+    def close(self):
+        with self._lock:
+            if self._pending_touches:
+                self._write_touches()
+                self._conn.commit()
+            self._conn.close()
@@ -1,108 +1,595 @@
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from llm_cache import LLMResultCache
+from adaptive_control import AdaptiveTimeout, AIMDLimiter, LatencyTracker, RetryPolicy
+
+# (kategori adı, açıklama) - prompt'taki taksonomi
+CATEGORIES = [
+    ("Abortion", "Sites with neutral or balanced presentation of the issue."),
+    ("Pro Choice", "Sites that provide information about or are sponsored by organizations that support legal abortion or offer support to those seeking it."),
+    ("Pro Life", "Sites that provide information about or are sponsored by organizations that oppose legal abortion or seek increased restriction."),
+    ("Adult Material", "Parent category for adult oriented content."),
+    ("Adult Content", "Sites that display full or partial nudity in a sexual context but not sexual activity."),
+    ("Nudity", "Sites that offer depictions of nude or seminude human forms."),
+    ("Sex", "Sites that depict or graphically describe sexual acts or activity including exhibitionism."),
+    ("Sex Education", "Sites that offer educational information about sex and sexuality."),
+    ("Lingerie and Swimsuit", "Sites with models in lingerie or swimsuits , including for sale."),
+    ("Advocacy Groups", "Sites that promote change or reform in public policy , public opinion , social practice , economic activities."),
+    ("Bandwidth", "Parent category for bandwidth intensive content."),
+    ("Educational Video", "Sites that host videos with academic/instructional content."),
+    ("Entertainment Video", "Entertainment oriented video hosting sites."),
+    ("Internet Radio and TV", "Sites providing Internet radio or TV programming."),
+    ("Internet Telephony", "Sites enabling VoIP or VoIP software."),
+    ("Peer to Peer File Sharing", "Sites offering P2P file sharing client software."),
+    ("Personal Network Storage and Backup", "Sites for personal file backup/exchange in the cloud."),
+    ("Streaming Media", "Sites that enable streaming media content."),
+    ("Surveillance", "Sites for real time monitoring via webcams/cameras."),
+    ("Viral Video", "Sites that host viral/popular videos."),
+    ("Business and Economy", "Sites sponsored by firms , associations , industry groups or general business."),
+    ("Financial Data and Services", "Sites providing financial services or market data."),
+    ("Education", "Educational content parent category."),
+    ("Information Technology", "Parent category for IT related content."),
+    ("Cultural Institutions", "Sites for museums , libraries , heritage , etc."),
+    ("Educational Institutions", "Sites for schools , universities , etc."),
+    ("Proxy Avoidance", "Sites that bypass web filters via proxy."),
+    ("Search Engines and Portals", "General search engines and portals."),
+    ("Web Hosting", "Sites offering hosting services."),
+    ("Hacking", "Sites related to hacking techniques/tools."),
+    ("News and Media", "Parent category for news and media content."),
+    ("Alternative Journals", "Non-mainstream news/journal sites."),
+    ("Religion", "Parent category for religious content."),
+    ("Non Traditional Religions", "Websites about new or less common religions."),
+    ("Traditional Religions", "Sites covering major world religions."),
+    ("Socicety and Lifestyle", "Parent category for society and lifestyle content."),
+    ("Restaurants and Dining", "Sites about restaurants , recipes , food culture."),
+    ("Gay or Lesbian or Bisexual Interest", "LGBTQ+ interest sites."),
+    ("Personals and Dating", "Dating and personal ads."),
+    ("Alcohol and Tobacco", "Sites promoting/marketing alcohol or tobacco."),
+    ("Drugs", "Parent category for drug related content."),
+    ("Abused Drugs", "Discussion or remedies for illegal , illicit , or abused drugs."),
+    ("Prescribed Medications", "Information about prescription medications."),
+    ("Nutrition", "Sites promoting nutritional supplements or diet info."),
+]
+
+PROMPT_RULES = """    Rules for summary:
+    - Do NOT mention company or platform names (e.g., Amazon, Wikipedia, Udemy, Coursera).
+    - Focus only on the content topic, not the source or brand.
+
+    Rules about classification : 
+    -Based on the website’s title, content, and the summary you wrote, you MUST choose exactly ONE category from the provided list.
+    -Do not say any category which is not in provided list. Choose closest category."""
+
+
+class KeywordCategoryShortlister:
+    """Sayfadaki kelimelerle kategori ad/açıklamalarının örtüşmesine göre aday kategori seçer
+
+    Category terms are weighted by inverse category frequency, so words shared
+    by many descriptions ("sites", "information") count little. Title words
+    count twice.
+    """
+
+    name = "keyword"
+    _WORD = re.compile(r"[a-z]{3,}")
+    _IGNORED = {"sites", "site", "that", "the", "and", "for", "with", "about", "are", "other", "not",
+                "information", "related", "provide", "content", "such", "including", "which", "from"}
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self._terms = {}
+        document_frequency = {}
+        for name, description in self.categories:
+            terms = self._tokenize(f"{name} {description}")
+            self._terms[name] = terms
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        count = len(self.categories)
+        self._weights = {term: 1.0 + (count / df) ** 0.5 for term, df in document_frequency.items()}
+
+    def _tokenize(self, text):
+        words = set(self._WORD.findall(text.lower())) - self._IGNORED
+        # Basit kök: sondaki 's' atılır (drugs -> drug)
+        return {word[:-1] if word.endswith("s") and len(word) > 4 else word for word in words}
+
+    def shortlist(self, title, content, top_k):
+        title_terms = self._tokenize(title)
+        page_terms = self._tokenize(content[:LLMClassifier.PROMPT_CONTENT_CHARS * 3]) | title_terms
+        scored = []
+        for index, (name, _) in enumerate(self.categories):
+            terms = self._terms[name]
+            score = sum(self._weights[t] * (2 if t in title_terms else 1) for t in terms & page_terms)
+            scored.append((-score, index, name))
+        scored.sort()
+        if not scored or scored[0][0] == 0:
+            return None
+        return [name for _, _, name in scored[:top_k]]
+
 
 class LLMClassifier:
+    # Prompt şablonu değiştiğinde artırılmalı, eski cache kayıtları kullanılmaz
+    PROMPT_VERSION = 3
+    PROMPT_CONTENT_CHARS = 1000
+    # Tek sayfa formatının son satırı; varsayılan stop sequence olarak sunucu burada durur
+    RESPONSE_END = "<END>"
+
+    def __init__(self, model="llama3", cache=None, use_cache=True, base_url="http://localhost:11434",
+                 max_in_flight=1, timeout=15, keep_alive="30m", health_ttl=30, batch_size=1, categories=None,
+                 shortlist_size=None, shortlister=None, stats_window=1000,
+                 stream=False, num_predict=256, stop=(RESPONSE_END,), on_category=None, prompt_mode="generate",
+                 max_retries=2, min_timeout=5, max_timeout=120, adaptive_concurrency=True, min_in_flight=1):
+        self.model = model
+        # batch_size > 1: classify_many K sayfayı tek istekte gönderir
+        self.batch_size = batch_size
+        self.categories = list(categories or CATEGORIES)
+        self._category_lookup = {name.lower(): name for name, _ in self.categories}
+        # Özel kategori listesi cache anahtarını da değiştirir
+        taxonomy_hash = hashlib.sha1(repr(self.categories).encode("utf-8")).hexdigest()[:12]
+        self._prompt_version = f"{self.PROMPT_VERSION}:{taxonomy_hash}"
+        # prompt_mode="chat": sabit başlık (taksonomi + kurallar + format) system mesajı olarak /api/chat'e gider,
+        # sadece sayfa kısmı değişir; Ollama başlığın KV cache'ini istekler arasında yeniden kullanabilir
+        self.prompt_mode = prompt_mode
+        if prompt_mode == "chat":
+            self._prompt_version += ":chat"
+        self._system_prompt = None
+        # shortlist_size=k: prompt'a tüm taksonomi yerine sayfaya en yakın k kategori konur.
+        # shortlister: shortlist(title, content, top_k) metodu olan nesne (varsayılan: kelime eşleşmesi)
+        self.shortlist_size = shortlist_size
+        if shortlister is None and shortlist_size:
+            shortlister = KeywordCategoryShortlister(self.categories)
+        self.shortlister = shortlister
+        # stream=True: yanıt token token okunur, Category ve Summary tamamlanınca bağlantı kapatılır.
+        # num_predict sadece stream modunda token sınırıdır; stop tek sayfa yanıtının sonunu (<END>) yakalar.
+        # İkisi de None olabilir.
+        # on_category(category, seconds) ilk kategori okunduğunda çağrılır (progress için)
+        self.stream = stream
+        self.num_predict = num_predict
+        self.stop = list(stop) if stop else None
+        self.on_category = on_category
+        # İstek başına prompt uzunluğu ve gecikme (son stats_window istek)
+        self._request_stats = deque(maxlen=stats_window)
+        self._stats_lock = threading.Lock()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.health_ttl = health_ttl
+        if cache is None and use_cache:
+            try:
+                cache = LLMResultCache()
+            except Exception as e:
+                print(f"LLM cache disabled: {e}")
+        self.cache = cache
+
+        # Keep-alive bağlantı havuzu; eşzamanlı istek sayısı Ollama'nın paralel slot sayısına göre ayarlanmalı
+        # (OLLAMA_NUM_PARALLEL)
+        self.max_in_flight = max(1, max_in_flight)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Gözlenen gecikmelerden timeout (p95 x 3) ve AIMD ile eşzamanlılık; max_in_flight üst sınırdır.
+        # timeout, yeterli ölçüm birikene kadar kullanılan başlangıç değeridir (sayfa başına).
+        self.latency_tracker = LatencyTracker()
+        self.adaptive_timeout = AdaptiveTimeout(self.latency_tracker, initial=timeout,
+                                                min_timeout=min_timeout, max_timeout=max_timeout)
+        self.retry_policy = RetryPolicy(max_retries=max_retries)
+        self._limiter = AIMDLimiter(self.max_in_flight,
+                                    min_limit=min_in_flight if adaptive_concurrency else self.max_in_flight,
+                                    tracker=self.latency_tracker)
+        self._failures = {}
+        self.retries = 0
+        self.unknown_results = 0
+        # Pencereden bağımsız toplam sayaçlar (metrics endpoint için)
+        self.total_requests = 0
+        self.total_failed_requests = 0
+        self.total_request_seconds = 0.0
+        self._health_checked_at = 0.0
+        self._health = False
+
+    def _post(self, path, payload, timeout=None, **kwargs):
+        return self.session.post(f"{self.base_url}{path}", json=payload,
+                                 timeout=timeout or self.timeout, **kwargs)
+
+    def cache_key(self, title, content, candidates=None):
+        # Sadece modelin gördüğü içerik (ve kısaltılmış kategori listesi) anahtara girer
+        prompt_version = self._prompt_version
+        if candidates:
+            variant = hashlib.sha1("\x1f".join(sorted(candidates)).encode("utf-8")).hexdigest()[:12]
+            prompt_version = f"{prompt_version}:{variant}"
+        return LLMResultCache.make_key(self.model, prompt_version, title, content[:self.PROMPT_CONTENT_CHARS])
+
+    def _cache_get(self, title, content, candidates=None):
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(title, content, candidates))
+
+    def _cache_put(self, title, content, output, candidates=None):
+        if self.cache is not None and output.get("category") and not output.get("error"):
+            self.cache.put(self.cache_key(title, content, candidates), output)
+
+    def shortlist(self, title, content):
+        """Prompt'a girecek aday kategoriler; None ise tüm taksonomi kullanılır"""
+        if not self.shortlist_size or self.shortlister is None or self.shortlist_size >= len(self.categories):
+            return None
+        try:
+            names = self.shortlister.shortlist(title, content, self.shortlist_size)
+        except Exception as e:
+            print(f"Category shortlisting failed: {e}")
+            return None
+        names = [self._canonical_category(name) for name in names or []]
+        return list(dict.fromkeys(name for name in names if name)) or None
+
+    def _taxonomy_text(self, candidates=None):
+        categories = self.categories
+        if candidates:
+            selected = set(candidates)
+            categories = [(name, description) for name, description in categories if name in selected] or categories
+        return "\n".join(f"    {name}: {description}" for name, description in categories)
 
-    def build_prompt(self, title, content):
+    def _canonical_category(self, category):
+        return self._category_lookup.get((category or "").strip().lower())
+
+    def build_prompt(self, title, content, candidates=None):
         
         prompt = f""" You are an intelligent assistant that classifies and summarizes websites.
        
     Categories:
-    Abortion: Sites with neutral or balanced presentation of the issue.
-    Pro Choice: Sites that provide information about or are sponsored by organizations that support legal abortion or offer support to those seeking it.
-    Pro Life: Sites that provide information about or are sponsored by organizations that oppose legal abortion or seek increased restriction.
-    Adult Material: Parent category for adult oriented content.
-    Adult Content: Sites that display full or partial nudity in a sexual context but not sexual activity.
-    Nudity: Sites that offer depictions of nude or seminude human forms.
-    Sex: Sites that depict or graphically describe sexual acts or activity including exhibitionism.
-    Sex Education: Sites that offer educational information about sex and sexuality.
-    Lingerie and Swimsuit: Sites with models in lingerie or swimsuits , including for sale.
-    Advocacy Groups:Sites that promote change or reform in public policy , public opinion , social practice , economic activities.
-    Bandwidth:Parent category for bandwidth intensive content.
-    Educational Video: Sites that host videos with academic/instructional content.
-    Entertainment Video: Entertainment oriented video hosting sites.
-    Internet Radio and TV: Sites providing Internet radio or TV programming.
-    Internet Telephony: Sites enabling VoIP or VoIP software.
-    Peer to Peer File Sharing: Sites offering P2P file sharing client software.
-    Personal Network Storage and Backup: Sites for personal file backup/exchange in the cloud.
-    Streaming Media: Sites that enable streaming media content.
-    Surveillance: Sites for real time monitoring via webcams/cameras.
-    Viral Video: Sites that host viral/popular videos.
-    Business and Economy:Sites sponsored by firms , associations , industry groups or general business.
-    Financial Data and Services: Sites providing financial services or market data.
-    Education: Educational content parent category.
-    Information Technology:Parent category for IT related content.
-    Cultural Institutions: Sites for museums , libraries , heritage , etc.
-    Educational Institutions: Sites for schools , universities , etc.
-    Proxy Avoidance: Sites that bypass web filters via proxy.
-    Search Engines and Portals: General search engines and portals.
-    Web Hosting: Sites offering hosting services.
-    Hacking: Sites related to hacking techniques/tools.
-    News and Media:Parent category for news and media content.
-    Alternative Journals: Non-mainstream news/journal sites.
-    Religion:Parent category for religious content.
-    Non Traditional Religions: Websites about new or less common religions.
-    Traditional Religions: Sites covering major world religions.
-    Socicety and Lifestyle:Parent category for society and lifestyle content.
-    Restaurants and Dining: Sites about restaurants , recipes , food culture.
-    Gay or Lesbian or Bisexual Interest: LGBTQ+ interest sites.
-    Personals and Dating: Dating and personal ads.
-    Alcohol and Tobacco: Sites promoting/marketing alcohol or tobacco.
-    Drugs:Parent category for drug related content.
-    Abused Drugs: Discussion or remedies for illegal , illicit , or abused drugs.
-    Prescribed Medications: Information about prescription medications.
-    Nutrition: Sites promoting nutritional supplements or diet info.
-
-    Rules for summary:
-    - Do NOT mention company or platform names (e.g., Amazon, Wikipedia, Udemy, Coursera).
-    - Focus only on the content topic, not the source or brand.
+{self._taxonomy_text(candidates)}
 
-    Rules about classification : 
-    -Based on the website’s title, content, and the summary you wrote, you MUST choose exactly ONE category from the provided list.
-    -Do not say any category which is not in provided list. Choose closest category.
+{PROMPT_RULES}
  
     Website details:
     Title: {title}
-    Content: {content[:1000]}
+    Content: {content[:self.PROMPT_CONTENT_CHARS]}
 
     Respond in the following format:
     Category: <ChosenCategory>
     Summary: <Short summary about the website>
+    {self.RESPONSE_END}
     """
         return prompt
 
-    def classify_text(self, title, content):
-        prompt = self.build_prompt(title, content)
+    def build_system_prompt(self, candidates=None):
+        """Chat modunda her istekte birebir aynı kalan başlık (kısa liste yoksa bir kez üretilir)"""
+        if candidates is None and self._system_prompt is not None:
+            return self._system_prompt
+        prompt = f""" You are an intelligent assistant that classifies and summarizes websites.
+       
+    Categories:
+{self._taxonomy_text(candidates)}
+
+{PROMPT_RULES}
+
+    You will receive the website details in the next message.
+    Respond in the following format:
+    Category: <ChosenCategory>
+    Summary: <Short summary about the website>
+    {self.RESPONSE_END}
+    """
+        if candidates is None:
+            self._system_prompt = prompt
+        return prompt
+
+    def build_page_message(self, title, content):
+        """Chat modunda sayfaya özel (değişken) kısım"""
+        return f"""    Website details:
+    Title: {title}
+    Content: {content[:self.PROMPT_CONTENT_CHARS]}
+    """
+
+    def build_batch_prompt(self, items, candidates=None):
+        """Birden fazla sayfa için tek prompt: taksonomi bir kez, sonuçlar JSON olarak istenir"""
+        websites = "\n".join(
+            f"    [{number}] Title: {title}\n        Content: {content[:self.PROMPT_CONTENT_CHARS]}"
+            for number, (title, content) in enumerate(items, 1)
+        )
+        prompt = f""" You are an intelligent assistant that classifies and summarizes websites.
+       
+    Categories:
+{self._taxonomy_text(candidates)}
+
+{PROMPT_RULES}
+ 
+    Websites:
+{websites}
+
+    Classify and summarize EACH of the {len(items)} websites separately.
+    Respond ONLY with JSON in the following format:
+    {{"results": [{{"id": <website number>, "category": "<ChosenCategory>", "summary": "<Short summary about the website>"}}]}}
+    """
+        return prompt
+
+    def _generation_options(self, pages=1, stop=True, stream=False):
+        options = {}
+        # Klasik (stream olmayan) yanıtlar baseline'daki gibi sınırsız kalır
+        if stream and self.num_predict:
+            options["num_predict"] = self.num_predict * pages
+        if stop and self.stop:
+            options["stop"] = self.stop
+        return options
+
+    def _generate(self, prompt, timeout=None, pages=1, categories=None, stream=False, options=None,
+                  system=None, **payload):
+        """/api/generate (system=None) veya system + kullanıcı mesajıyla /api/chat çağrısı"""
+        timeout = timeout or self.adaptive_timeout.timeout(pages)
+        request = {
+            "model": self.model,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            **payload
+        }
+        if system is None:
+            path = "/api/generate"
+            request["prompt"] = prompt
+        else:
+            path = "/api/chat"
+            request["messages"] = [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ]
+        if options:
+            request["options"] = options
+
+        self._limiter.acquire()
+        start = time.perf_counter()
+        ok = False
+        error = None
+        timing = {}
+        try:
+            if stream:
+                text = self._read_stream(path, request, timeout, start, timing)
+            else:
+                response = self._post(path, request, timeout=timeout)
+                response.raise_for_status()
+                data = response.json()
+                timing.update(self._server_timings(data))
+                text = self._response_text(data)
+            ok = True
+            return text.strip()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            timed_out = isinstance(error, (requests.Timeout, TimeoutError))
+            if ok or timed_out:
+                # Timeout'lar da (timeout süresiyle) sayılır, yoksa p95 hiç büyüyemez
+                self.latency_tracker.add((timeout if timed_out else latency) / pages)
+            self._limiter.release(latency / pages, error=error is not None and self.retry_policy.is_retryable(error))
+            if error is not None:
+                self._record_failure(error)
+            self._record_request(len(prompt) + len(system or ""), categories or len(self.categories), pages,
+                                 latency, ok, timing)
+
+    @staticmethod
+    def _failure_kind(error):
+        if isinstance(error, (requests.Timeout, TimeoutError)):
+            return "timeout"
+        if isinstance(error, requests.ConnectionError):
+            return "connection"
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return f"http_{error.response.status_code}"
+        if isinstance(error, ValueError):
+            return "invalid_response"
+        return type(error).__name__
+
+    def _record_failure(self, error):
+        kind = self._failure_kind(error)
+        with self._stats_lock:
+            self._failures[kind] = self._failures.get(kind, 0) + 1
+
+    def _on_retry(self, attempt, error):
+        with self._stats_lock:
+            self.retries += 1
+        print(f"LLM request failed ({self._failure_kind(error)}), retry {attempt}/{self.retry_policy.max_retries}")
+
+    @staticmethod
+    def _response_text(data):
+        if "message" in data:
+            return (data.get("message") or {}).get("content", "")
+        return data.get("response", "")
+
+    @staticmethod
+    def _server_timings(data):
+        """Ollama yanıtındaki süreler (ns) -> ms; prompt_eval_count düşükse başlık cache'ten gelmiştir"""
+        timings = {}
+        for key in ("prompt_eval_count", "eval_count"):
+            if key in data:
+                timings[key] = data[key]
+        for key in ("prompt_eval_duration", "eval_duration", "load_duration", "total_duration"):
+            if key in data:
+                timings[key.replace("_duration", "_ms")] = data[key] / 1e6
+        return timings
+
+    def _read_stream(self, path, request, timeout, start, timing):
+        """Akışı oku; Category ve Summary satırları tamamlanınca ya da süre dolunca bağlantıyı kapat
+
+        Closing the connection makes Ollama stop generating. If the time budget
+        runs out after the category arrived, the partial text is still used.
+        """
+        text = ""
+        response = self.session.post(f"{self.base_url}{path}", json=request, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                text += self._response_text(chunk)
+                if chunk.get("done"):
+                    timing.update(self._server_timings(chunk))
+                category, summary_done = self._parse_partial(text, chunk.get("done", False))
+                if category and "time_to_category" not in timing:
+                    timing["time_to_category"] = time.perf_counter() - start
+                    if self.on_category:
+                        try:
+                            self.on_category(category, timing["time_to_category"])
+                        except Exception as e:
+                            print(f"on_category callback error: {e}")
+                if chunk.get("done") or (category and summary_done):
+                    break
+                if time.perf_counter() - start > timeout:
+                    if category:
+                        break
+                    raise TimeoutError(f"LLM stream timeout after {timeout}s")
+        finally:
+            response.close()
+        return text
+
+    @staticmethod
+    def _parse_partial(text, done=False):
+        """Return (category, summary_complete) from a partial response"""
+        lines = text.split("\n")
+        if not done:
+            lines = lines[:-1]  # son satır henüz tamamlanmamış olabilir
+        category = ""
+        summary_done = False
+        for line in lines:
+            if line.lower().startswith("category:"):
+                category = line.split(":", 1)[1].strip()
+            elif line.lower().startswith("summary:") and line.split(":", 1)[1].strip():
+                summary_done = True
+        return category, summary_done
+
+    def _record_request(self, prompt_chars, categories, pages, latency, ok, timing=None):
+        timing = timing or {}
+        with self._stats_lock:
+            self.total_requests += 1
+            self.total_failed_requests += 0 if ok else 1
+            self.total_request_seconds += latency
+            self._request_stats.append({
+                "prompt_chars": prompt_chars,
+                "categories": categories,
+                "pages": pages,
+                "latency": latency,
+                "ok": ok,
+                "time_to_category": timing.get("time_to_category"),
+                "prompt_eval_count": timing.get("prompt_eval_count"),
+                "prompt_eval_ms": timing.get("prompt_eval_ms"),
+                "eval_count": timing.get("eval_count"),
+                "eval_ms": timing.get("eval_ms")
+            })
+
+    def get_request_log(self):
+        """Son isteklerin prompt uzunluğu / gecikme kayıtları"""
+        with self._stats_lock:
+            return list(self._request_stats)
+
+    def get_stats(self):
+        """Prompt length, latency, failure and adaptive control stats over the recent requests"""
+        records = self.get_request_log()
+        with self._stats_lock:
+            control = {
+                "failures": dict(self._failures),
+                "retries": self.retries,
+                "unknown_results": self.unknown_results,
+                "total_requests": self.total_requests,
+                "total_failed_requests": self.total_failed_requests,
+                "total_request_seconds": self.total_request_seconds,
+                "current_timeout": self.adaptive_timeout.timeout(),
+                "latency_per_page": self.latency_tracker.stats(),
+                "concurrency": self._limiter.stats()
+            }
+        if not records:
+            return {"requests": 0, "shortlist_size": self.shortlist_size, **control}
+        latencies = sorted(r["latency"] for r in records)
+        first_category = [r["time_to_category"] for r in records if r["time_to_category"] is not None]
+
+        def average(key):
+            values = [r[key] for r in records if r.get(key) is not None]
+            return sum(values) / len(values) if values else None
+
+        def percentile(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+        return {
+            "requests": len(records),
+            "failed_requests": sum(1 for r in records if not r["ok"]),
+            "shortlist_size": self.shortlist_size,
+            "avg_prompt_chars": sum(r["prompt_chars"] for r in records) / len(records),
+            "avg_categories": sum(r["categories"] for r in records) / len(records),
+            "avg_latency": sum(latencies) / len(latencies),
+            "p50_latency": percentile(0.5),
+            "p95_latency": percentile(0.95),
+            "avg_latency_per_page": sum(latencies) / sum(r["pages"] for r in records),
+            "streaming": self.stream,
+            "avg_time_to_category": (sum(first_category) / len(first_category)) if first_category else None,
+            "prompt_mode": self.prompt_mode,
+            "avg_prompt_eval_count": average("prompt_eval_count"),
+            "avg_prompt_eval_ms": average("prompt_eval_ms"),
+            "avg_eval_count": average("eval_count"),
+            "avg_eval_ms": average("eval_ms"),
+            **control
+        }
+
+    @staticmethod
+    def parse_response(result_text):
+        """'Category:' ve 'Summary:' satırlarını ayrıştır"""
+        category = ""
+        summary = ""
+        for line in result_text.splitlines():
+            if line.lower().startswith("category:"):
+                category = line.split(":", 1)[1].strip()
+            elif line.lower().startswith("summary:"):
+                summary = line.split(":", 1)[1].strip()
+        return category, summary
+
+    def parse_batch_response(self, result_text, count):
+        """Map a JSON batch response to {website number: output}; malformed items are left out"""
+        data = json.loads(result_text)
+        items = data.get("results", []) if isinstance(data, dict) else data
+        parsed = {}
+        if not isinstance(items, list):
+            return parsed
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                number = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            category = self._canonical_category(item.get("category"))
+            summary = item.get("summary", "")
+            if not 1 <= number <= count or number in parsed or category is None or not isinstance(summary, str):
+                continue
+            parsed[number] = {"category": category, "summary": summary.strip()}
+        return parsed
+
+    def classify_text(self, title, content, candidates=None):
+        if candidates is None:
+            candidates = self.shortlist(title, content)
+        cached = self._cache_get(title, content, candidates)
+        if cached is not None:
+            return cached
+        output = self._classify_single(title, content, candidates)
+        self._cache_put(title, content, output, candidates)
+        return output
+
+    def _classify_single(self, title, content, candidates=None):
+        system = None
+        if self.prompt_mode == "chat":
+            system = self.build_system_prompt(candidates)
+            prompt = self.build_page_message(title, content)
+        else:
+            prompt = self.build_prompt(title, content, candidates)
         print("Sending prompt to LLM:\n", prompt)  # Burada prompt'u yazdırıyoruz
 
         try:
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": "llama3",
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=15
+            result_text = self.retry_policy.call(
+                lambda: self._generate(prompt, categories=len(candidates) if candidates else None,
+                                       stream=self.stream, options=self._generation_options(stream=self.stream),
+                                       system=system),
+                on_retry=self._on_retry
             )
-            response.raise_for_status()
-            result_text = response.json().get("response", "").strip()
-            
-            # Satır satır ayır
-            lines = result_text.splitlines()
-            category = ""
-            summary = ""
-            #print
-            
             print("LLM response:\n", result_text)  # Buraya ekledik
-            
-            
-            
-            #print
-            for line in lines:
-                if line.lower().startswith("category:"):
-                    category = line.split(":", 1)[1].strip()
-                elif line.lower().startswith("summary:"):
-                    summary = line.split(":", 1)[1].strip()
+
+            category, summary = self.parse_response(result_text)
 
             # Eğer hâlâ unknown'sa, detayları raise et
             if category == "Unknown":
@@ -115,21 +602,128 @@ class LLMClassifier:
 
         except Exception as e:
             print(f"LLM classification error: {e}")
+            with self._stats_lock:
+                self.unknown_results += 1
+            # error alanı olan sonuçlar cache'e yazılmaz, sayfa sonraki çalıştırmada tekrar denenir
             return {
                 "category": "Unknown",
-                "summary": ""
+                "summary": "",
+                "error": f"{self._failure_kind(e)}: {e}"
             }
-    def is_llm_available(self):
+
+    def classify_batch(self, items, batch_size=None, candidates=None):
+        """K sayfayı tek JSON isteğinde sınıflandır; hatalı kayıtlar tek sayfalık isteğe düşer"""
+        items = list(items)
+        batch_size = max(1, batch_size or self.batch_size)
+        if candidates is None:
+            candidates = [self.shortlist(title, content) for title, content in items]
+        outputs = [None] * len(items)
+        pending = []
+        for index, (title, content) in enumerate(items):
+            cached = self._cache_get(title, content, candidates[index])
+            if cached is not None:
+                outputs[index] = cached
+            else:
+                pending.append(index)
+
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+
+        def run(chunk):
+            return chunk, self._classify_chunk([items[index] for index in chunk],
+                                               [candidates[index] for index in chunk])
+
+        if self.max_in_flight > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+                completed = list(executor.map(run, chunks))
+        else:
+            completed = [run(chunk) for chunk in chunks]
+
+        for chunk, chunk_outputs in completed:
+            for index, output in zip(chunk, chunk_outputs):
+                outputs[index] = output
+        return outputs
+
+    def _classify_chunk(self, items, candidates):
+        parsed = {}
+        if len(items) > 1:
+            # Gruptaki sayfaların aday kategorilerinin birleşimi (biri tam listeyse tam liste)
+            merged = None
+            if all(candidates):
+                merged = list(dict.fromkeys(name for names in candidates for name in names))
+            try:
+                prompt = self.build_batch_prompt(items, merged)
+                result_text = self.retry_policy.call(
+                    lambda: self._generate(prompt, format="json", pages=len(items),
+                                           categories=len(merged) if merged else None,
+                                           options=self._generation_options(len(items), stop=False)),
+                    on_retry=self._on_retry
+                )
+                parsed = self.parse_batch_response(result_text, len(items))
+            except Exception as e:
+                print(f"LLM batch classification error: {e}")
+
+        outputs = []
+        for number, (title, content) in enumerate(items, 1):
+            output = parsed.get(number)
+            if output is None:
+                output = self._classify_single(title, content, candidates[number - 1])
+            outputs.append(output)
+            self._cache_put(title, content, output, candidates[number - 1])
+        return outputs
+
+    def classify_many(self, items, candidates=None):
+        """Classify (title, content) pairs with up to max_in_flight concurrent requests; keeps input order
+
+        candidates optionally gives each page's category shortlist (None entries
+        use the full taxonomy); otherwise the configured shortlister is used.
+        """
+        items = list(items)
+        if candidates is None:
+            candidates = [self.shortlist(title, content) for title, content in items]
+        if self.batch_size > 1:
+            return self.classify_batch(items, candidates=candidates)
+        if self.max_in_flight == 1 or len(items) <= 1:
+            return [self.classify_text(title, content, names or []) for (title, content), names in zip(items, candidates)]
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            return list(executor.map(lambda item, names: self.classify_text(*item, names or []), items, candidates))
+
+    def is_llm_available(self, force=False):
+        """Model listesini (/api/tags) sorgulayarak ucuz bağlantı kontrolü; sonuç health_ttl saniye cache'lenir"""
+        now = time.time()
+        if not force and now - self._health_checked_at < self.health_ttl:
+            return self._health
+
+        available = False
         try:
-            import requests
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={"model": "llama3", "prompt": "Test", "stream": False},
-                timeout=5
-            )
-            if response.status_code == 200 and "response" in response.json():
-                return True
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+            if response.status_code == 200:
+                names = {m.get("name", "") for m in response.json().get("models", [])}
+                available = any(name == self.model or name.split(":")[0] == self.model for name in names)
         except Exception:
             pass
-        return False
+
+        self._health = available
+        self._health_checked_at = now
+        return available
+
+    def warm_up(self):
+        """Load the model into memory (empty prompt) and pin it with keep_alive"""
+        try:
+            response = self._post("/api/generate", {"model": self.model, "keep_alive": self.keep_alive},
+                                  timeout=max(self.timeout, 120))
+            response.raise_for_status()
+            if self.prompt_mode == "chat":
+                # Sabit başlığı bir kez değerlendirt; sonraki istekler prompt cache'ten başlar
+                response = self._post("/api/chat", {
+                    "model": self.model,
+                    "stream": False,
+                    "keep_alive": self.keep_alive,
+                    "messages": [{"role": "system", "content": self.build_system_prompt()}],
+                    "options": {"num_predict": 1}
+                }, timeout=max(self.timeout, 120))
+                response.raise_for_status()
+            return True
+        except Exception as e:
+            print(f"LLM warm-up failed: {e}")
+            return False
     
@@ -1,13 +1,133 @@
-from ttkbootstrap import Window
-from gui.main_window import URLExtractorGUI
+import argparse
+import logging
+import sys
+import time
 
+from profiling import RunProfiler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="URL Content Extractor")
+    parser.add_argument('--profile', action='store_true',
+                        help="Profile extraction runs (sampled cProfile + tracemalloc snapshots)")
+    parser.add_argument('--profile-dir', default='profiles', help="Where profile / memory snapshots are written")
+    parser.add_argument('--profile-sample-rate', type=float, default=0.05,
+                        help="Fraction of URLs (batches in parallel mode) run under cProfile")
+    parser.add_argument('--profile-interval', type=float, default=60, help="Seconds between snapshots")
+    parser.add_argument('--profile-top', type=int, default=25, help="Allocation sites listed per memory snapshot")
+    parser.add_argument('--no-trace-memory', action='store_true', help="Skip tracemalloc (cProfile only)")
+    parser.add_argument('--timing-columns', action='store_true',
+                        help="Add timing_<stage>_ms columns to the output file (off by default)")
+
+    headless = parser.add_argument_group('headless mode')
+    headless.add_argument('--headless', action='store_true', help="Run without the GUI (needs --input and --output)")
+    headless.add_argument('--input', help="URL file (.txt, .txt.gz, .txt.zst)")
+    headless.add_argument('--output', help="Output file; the format follows the extension (.csv, .jsonl, .parquet)")
+    headless.add_argument('--workers', type=int, default=1, help="Parallel fetch workers")
+    headless.add_argument('--delay', type=float, default=0.1, help="Delay between requests (seconds)")
+    headless.add_argument('--timeout', type=float, default=10, help="Fetch timeout (seconds)")
+    headless.add_argument('--llm-url', default='http://localhost:11434', help="Ollama base URL")
+    headless.add_argument('--llm-model', default='llama3')
+    headless.add_argument('--metrics-port', type=int, default=None,
+                          help="Serve Prometheus metrics on http://<metrics-host>:<port>/metrics during the run")
+    headless.add_argument('--metrics-host', default='127.0.0.1')
+    args = parser.parse_args(argv)
+    if args.headless and not (args.input and args.output):
+        parser.error("--headless requires --input and --output")
+    return args
+
+
+def create_profiler(args):
+    return RunProfiler(
+        output_dir=args.profile_dir,
+        sample_rate=args.profile_sample_rate,
+        snapshot_interval=args.profile_interval,
+        top_n=args.profile_top,
+        trace_memory=not args.no_trace_memory
+    )
+
+
+def run_headless(args):
+    """GUI olmadan çalıştır: oku, çıkar, yaz, özet raporu üret
+
+    Successful results are written to the output sink as they complete, so
+    memory stays flat and an interrupted run keeps everything written so far.
+    """
+    from extractor import URLExtractor
+    from file_handler import FileHandler
+    from output_sinks import create_sink
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    file_handler = FileHandler()
+    validation = file_handler.validate_txt_file(args.input)
+    if not validation['valid']:
+        logging.error("File validation failed: " + "; ".join(validation['errors']))
+        return 1
+
+    # Similarity logları geçici dosya yerine çıktının yanına yazılır
+    extractor = URLExtractor(timeout=args.timeout, delay=args.delay, max_workers=args.workers,
+                             similarity_config={'similarity_log_path': file_handler.similarity_log_path(args.output)},
+                             llm_config={'base_url': args.llm_url, 'model': args.llm_model})
+    if args.profile:
+        extractor.profiler = create_profiler(args)
+
+    metrics_server = None
+    if args.metrics_port is not None:
+        from metrics_server import MetricsServer
+        metrics_server = MetricsServer(extractor, host=args.metrics_host, port=args.metrics_port)
+        metrics_server.start()
+
+    last_report = [0.0]
+
+    def progress_callback(progress, message):
+        # Her mesajı loglamak yerine en fazla 5 saniyede bir durum satırı
+        now = time.monotonic()
+        if now - last_report[0] >= 5:
+            last_report[0] = now
+            logging.info(f"{progress:.1f}% | " + extractor.metrics.format_lines()[0])
+
+    sink = create_sink(args.output, timings=args.timing_columns)
+    extractor.result_sink = sink
+    try:
+        approx = "~" if validation.get('estimated') else ""
+        logging.info(f"Found {approx}{validation['url_count']} URLs to process")
+        if extractor.llm_classifier.is_llm_available():
+            extractor.llm_classifier.warm_up()
+        else:
+            logging.warning("LLM is not available; pages will be marked with an LLM error")
+
+        extractor.stream_multiple_urls(file_handler.iter_urls(args.input), progress_callback,
+                                       total=validation['url_count'])
+        return 0
+    finally:
+        # Yarıda kalan çalıştırmada da dosya kapatılır ve o ana kadarki özet yazılır
+        extractor.result_sink = None
+        sink.close()
+        file_handler.write_summary_report(extractor.run_summary, extractor.get_similarity_stats() or {}, args.output)
+        logging.info(f"Saved {sink.rows} successful results out of {extractor.run_summary.total} total URLs "
+                     f"to {args.output}")
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        extractor.close()
+
+
+def run_gui(args):
+    from ttkbootstrap import Window
+    from gui.main_window import URLExtractorGUI
 
-def main():
-    """Ana uygulama başlatma fonksiyonu"""
     root = Window(themename="flatly")
-    app = URLExtractorGUI(root)
+    app = URLExtractorGUI(root, profiler=create_profiler(args), profile_enabled=args.profile,
+                          timing_columns=args.timing_columns)
     root.mainloop()
+    return 0
 
-if __name__ == "__main__":
-    main()
 
+def main():
+    """Ana uygulama başlatma fonksiyonu"""
+    args = parse_args()
+    if args.headless:
+        return run_headless(args)
+    return run_gui(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
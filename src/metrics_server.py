@@ -0,0 +1,196 @@
+"""Headless çalıştırmalar için Prometheus formatında yerel /metrics endpoint'i
+
+    server = MetricsServer(extractor, port=9108)
+    server.start()
+    ...
+    curl http://127.0.0.1:9108/metrics
+
+The text exposition format is written by hand, so prometheus_client is not
+needed. Values are read from the extractor's run_summary, metrics, LLM
+classifier and similarity checker at scrape time.
+"""
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+from profiling import storage_sizes
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'url_extractor'
+# Saniye cinsinden histogram üst sınırları
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return 'NaN'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    """Prometheus text format yazıcı (HELP / TYPE satırları metrik başına bir kez)"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str, samples):
+        """samples: [(labels dict, value)] veya tek değer"""
+        full_name = f"{PREFIX}_{name}"
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{full_name}{self._labels(labels)} {_format_value(value)}")
+
+    def histogram(self, name: str, help_text: str, series: Dict[str, Tuple[List[int], float, int]], label: str):
+        full_name = f"{PREFIX}_{name}"
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} histogram")
+        for key, (cumulative, total, count) in series.items():
+            labels = {label: key} if label else {}
+            for bound, value in zip(LATENCY_BUCKETS, cumulative):
+                self.lines.append(f"{full_name}_bucket{self._labels({**labels, 'le': bound})} {value}")
+            self.lines.append(f"{full_name}_bucket{self._labels({**labels, 'le': '+Inf'})} {count}")
+            self.lines.append(f"{full_name}_sum{self._labels(labels)} {_format_value(float(total))}")
+            self.lines.append(f"{full_name}_count{self._labels(labels)} {count}")
+
+    @staticmethod
+    def _labels(labels: Dict) -> str:
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_metrics(extractor) -> str:
+    """Extractor durumunu Prometheus text formatına çevir"""
+    out = _Exposition()
+
+    summary = extractor.run_summary.snapshot()
+    live = extractor.metrics.snapshot()
+    out.metric('urls_processed_total', 'counter', 'URLs finished in the current run', summary['total'])
+    out.metric('urls_expected', 'gauge', 'Total URLs expected in the current run (may be an estimate)', live['total'])
+    out.metric('results_total', 'counter', 'Results by status',
+               [({'status': status}, count) for status, count in sorted(summary['status_counts'].items())])
+    out.metric('throughput_urls_per_second', 'gauge', 'URLs per second over the recent window', live['urls_per_sec'])
+    out.metric('eta_seconds', 'gauge', 'Estimated seconds until the run completes', live['eta'])
+    out.metric('stage_in_flight', 'gauge', 'Items currently inside each pipeline stage (queue depth)',
+               [({'stage': stage}, stats['in_flight']) for stage, stats in live['stages'].items()])
+
+    # Duplicate istatistikleri (uzak checker'da duplicate_stats yok, /stats'tan okunur)
+    checker = extractor.similarity_checker
+    duplicate_stats = getattr(checker, 'duplicate_stats', None)
+    if duplicate_stats is None:
+        try:
+            duplicate_stats = checker.get_comprehensive_stats()
+        except Exception as e:
+            logger.debug(f"Could not read duplicate stats: {e}")
+            duplicate_stats = {}
+    out.metric('duplicates_total', 'counter', 'Duplicates by detection method',
+               [({'method': method}, count)
+                for method, count in sorted(dict(duplicate_stats.get('detection_methods', {})).items())])
+
+    histograms = extractor.run_summary.histogram_buckets(LATENCY_BUCKETS)
+    out.histogram('url_duration_seconds', 'Wall time per URL (fetch + share of dedupe and classification)',
+                  {'': histograms.pop('url')}, label=None)
+    if histograms:
+        out.histogram('stage_duration_seconds', 'Per-URL time spent in each stage', histograms, label='stage')
+
+    llm = extractor.llm_classifier.get_stats()
+    concurrency = llm.get('concurrency', {})
+    latency = llm.get('latency_per_page', {})
+    out.metric('llm_requests_total', 'counter', 'LLM HTTP requests', llm.get('total_requests', 0))
+    out.metric('llm_failed_requests_total', 'counter', 'LLM requests that failed', llm.get('total_failed_requests', 0))
+    out.metric('llm_request_seconds_total', 'counter', 'Total time spent in LLM requests',
+               llm.get('total_request_seconds', 0.0))
+    out.metric('llm_retries_total', 'counter', 'LLM request retries', llm.get('retries', 0))
+    out.metric('llm_failures_total', 'counter', 'Pages whose LLM classification failed, by error kind',
+               [({'kind': kind}, count) for kind, count in sorted(llm.get('failures', {}).items())])
+    out.metric('llm_latency_per_page_seconds', 'summary', 'LLM latency per page over the recent window',
+               [({'quantile': q}, latency.get(key)) for q, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99'))])
+    out.metric('llm_in_flight', 'gauge', 'LLM requests in flight', concurrency.get('in_flight', 0))
+    out.metric('llm_concurrency_limit', 'gauge', 'Current AIMD concurrency limit', concurrency.get('limit', 0))
+    out.metric('llm_timeout_seconds', 'gauge', 'Current adaptive LLM timeout', llm.get('current_timeout'))
+
+    caches = live['caches']
+    out.metric('cache_hits_total', 'counter', 'Cache hits',
+               [({'cache': name}, c['hits']) for name, c in sorted(caches.items())])
+    out.metric('cache_misses_total', 'counter', 'Cache misses',
+               [({'cache': name}, c['misses']) for name, c in sorted(caches.items())])
+    out.metric('cache_hit_ratio', 'gauge', 'Cache hit ratio',
+               [({'cache': name}, c['hit_rate']) for name, c in sorted(caches.items())])
+
+    sizes = storage_sizes(extractor)
+    out.metric('index_entries', 'gauge', 'Entries in dedupe indexes, caches and logs',
+               [({'index': name}, size.get('entries', size.get('total_records', 0))) for name, size in sizes.items()])
+    out.metric('index_bytes', 'gauge', 'Approximate bytes used by dedupe indexes',
+               [({'index': name}, size['bytes']) for name, size in sizes.items() if 'bytes' in size])
+    return out.render()
+
+
+class MetricsServer:
+    """Arka plan thread'inde /metrics ve /health sunan küçük HTTP sunucusu"""
+
+    def __init__(self, extractor, host: str = '127.0.0.1', port: int = 9108):
+        self.extractor = extractor
+
+        class Handler(MetricsRequestHandler):
+            service = self
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+        thread.start()
+        logger.info(f"Metrics endpoint listening on http://{self.address[0]}:{self.address[1]}/metrics")
+        return thread
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    service: MetricsServer = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, body: str, content_type: str, status: int = 200):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            try:
+                body = render_metrics(self.service.extractor)
+            except Exception as e:
+                logger.exception("Failed to render metrics")
+                self._send(f"error: {e}\n", 'text/plain; charset=utf-8', 500)
+                return
+            self._send(body, 'text/plain; version=0.0.4; charset=utf-8')
+        elif path == '/health':
+            self._send("ok\n", 'text/plain; charset=utf-8')
+        else:
+            self._send("not found\n", 'text/plain; charset=utf-8', 404)
@@ -0,0 +1,310 @@
+"""Sonuç dosyası yazıcıları (CSV, JSONL, Parquet)
+
+All sinks share the same columns as the original CSV output. The content
+column can be kept ('full'), cut to content_chars ('truncate') or dropped
+('none'). CSV and JSONL can be gzip or zstd compressed; Parquet writes row
+groups in batches and needs pyarrow.
+
+    with create_sink("results.jsonl.gz", content_mode="truncate") as sink:
+        sink.write_many(results)
+    print(sink.stats())
+"""
+import io
+import os
+import csv
+import gzip
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+from timing import TIMING_STAGES
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+FIELDNAMES = [
+    'url', 'title', 'content', 'category', 'summary',
+    'minhash_score', 'simhash_score', 'embedding_score',
+    'is_duplicate', 'duplicate_of'
+]
+
+CONTENT_MODES = ('full', 'truncate', 'none')
+
+# timings=True ile eklenen aşama süresi sütunları (milisaniye)
+TIMING_FIELDNAMES = [f'timing_{stage}_ms' for stage in TIMING_STAGES]
+
+# Satır sonu / tab temizliği tek translate çağrısıyla
+_WHITESPACE_TABLE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
+
+def result_to_row(result: Dict, content_mode: str = 'full', content_chars: int = 1000, timings: bool = False) -> Dict:
+    """Extractor sonucunu çıktı satırına dönüştür (write_results_to_csv ile aynı sütunlar)"""
+    minhash_sim = result.get('minhash_similarity')
+    embedding_score = result.get('embedding_similarity')
+    simhash_dist = result.get('simhash_distance')
+    simhash_score = 1 - (simhash_dist / 64) if isinstance(simhash_dist, (int, float)) else None
+
+    content = result.get('content', '')
+    if content_mode == 'truncate':
+        content = content[:content_chars]
+
+    row = {
+        'url': result.get('url', ''),
+        'title': result.get('title', ''),
+        'content': content,
+        'category': result.get('child_category', ''),
+        'summary': result.get('summary', ''),
+        'minhash_score': minhash_sim,
+        'simhash_score': simhash_score,
+        'embedding_score': embedding_score,
+        'is_duplicate': result.get('is_duplicate', False),
+        'duplicate_of': result.get('duplicate_info', {}).get('original_url', '')
+    }
+    if content_mode == 'none':
+        del row['content']
+    if timings:
+        stage_times = result.get('timings') or {}
+        for stage, field in zip(TIMING_STAGES, TIMING_FIELDNAMES):
+            seconds = stage_times.get(stage)
+            row[field] = round(seconds * 1000, 3) if seconds is not None else None
+    return row
+
+
+def _open_output(path: str, compression: Optional[str], append: bool = False):
+    """Metin çıktısı için (gerekirse gzip / zstd sıkıştırmalı) dosya aç"""
+    mode = 'a' if append else 'w'
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='', compresslevel=6)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstandard package is required for zstd output (pip install zstandard)")
+        raw = open(path, mode + 'b')
+        return io.TextIOWrapper(zstandard.ZstdCompressor(level=3).stream_writer(raw), encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _compression_from_path(path: str) -> Optional[str]:
+    lower = path.lower()
+    if lower.endswith('.gz'):
+        return 'gzip'
+    if lower.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+class ResultSink(ABC):
+    """Sonuçları satır satır yazan çıktı hedefi (context manager)"""
+
+    format = 'base'
+
+    def __init__(self, path: str, content_mode: str = 'full', content_chars: int = 1000, timings: bool = False):
+        if content_mode not in CONTENT_MODES:
+            raise ValueError(f"Unknown content_mode: {content_mode}")
+        self.path = path
+        self.content_mode = content_mode
+        self.content_chars = content_chars
+        self.timings = timings
+        self.rows = 0
+        self._elapsed = 0.0
+        self._closed = False
+
+    @property
+    def fieldnames(self) -> List[str]:
+        fields = [f for f in FIELDNAMES if f != 'content' or self.content_mode != 'none']
+        return fields + TIMING_FIELDNAMES if self.timings else fields
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def to_row(self, result: Dict) -> Dict:
+        return result_to_row(result, self.content_mode, self.content_chars, self.timings)
+
+    def write(self, result: Dict):
+        self.write_many([result])
+
+    def write_many(self, results: Iterable[Dict]):
+        start = time.perf_counter()
+        count = self._write_rows(self.to_row(result) for result in results)
+        self.rows += count
+        self._elapsed += time.perf_counter() - start
+
+    @abstractmethod
+    def _write_rows(self, rows: Iterable[Dict]) -> int:
+        """Satırları yazar, yazılan satır sayısını döndürür"""
+
+    def close(self):
+        if not self._closed:
+            start = time.perf_counter()
+            self._close()
+            self._elapsed += time.perf_counter() - start
+            self._closed = True
+
+    def _close(self):
+        pass
+
+    def stats(self) -> Dict:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {
+            'format': self.format,
+            'path': self.path,
+            'rows': self.rows,
+            'bytes': size,
+            'bytes_per_row': size / self.rows if self.rows else 0,
+            'seconds': self._elapsed,
+            'rows_per_sec': self.rows / self._elapsed if self._elapsed else 0,
+            'content_mode': self.content_mode
+        }
+
+
+class CSVSink(ResultSink):
+    """CSV çıktısı; varsayılanlar mevcut write_results_to_csv formatıyla aynı (QUOTE_ALL)"""
+
+    format = 'csv'
+
+    def __init__(self, path: str, compression: Optional[str] = None, content_mode: str = 'full',
+                 content_chars: int = 1000, quoting: int = csv.QUOTE_ALL, append: bool = False,
+                 timings: bool = False):
+        super().__init__(path, content_mode, content_chars, timings)
+        if compression == 'auto':
+            compression = _compression_from_path(path)
+        self.compression = compression
+        write_header = not append or not os.path.exists(path)
+        self._file = _open_output(path, compression, append)
+        self._writer = csv.DictWriter(
+            self._file,
+            fieldnames=self.fieldnames,
+            quoting=quoting,
+            quotechar='"',
+            escapechar='\\',
+            delimiter=','
+        )
+        if write_header:
+            self._writer.writeheader()
+
+    def _write_rows(self, rows):
+        count = 0
+        for row in rows:
+            for key, value in row.items():
+                if isinstance(value, str):
+                    row[key] = value.translate(_WHITESPACE_TABLE).strip()
+                elif value is None:
+                    row[key] = ''
+            self._writer.writerow(row)
+            count += 1
+        return count
+
+    def _close(self):
+        self._file.close()
+
+
+class JSONLSink(ResultSink):
+    """Satır başına bir JSON nesnesi; tırnaklama / kaçırma maliyeti yok"""
+
+    format = 'jsonl'
+
+    def __init__(self, path: str, compression: Optional[str] = None, content_mode: str = 'full',
+                 content_chars: int = 1000, append: bool = False, timings: bool = False):
+        super().__init__(path, content_mode, content_chars, timings)
+        if compression == 'auto':
+            compression = _compression_from_path(path)
+        self.compression = compression
+        self._file = _open_output(path, compression, append)
+
+    def _write_rows(self, rows):
+        lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+        return len(lines)
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(ResultSink):
+    """Parquet (pyarrow) çıktısı; satırlar row_group_size'lık gruplar halinde yazılır"""
+
+    format = 'parquet'
+
+    def __init__(self, path: str, compression: str = 'zstd', content_mode: str = 'full',
+                 content_chars: int = 1000, row_group_size: int = 10000, timings: bool = False):
+        if pa is None:
+            raise ImportError("pyarrow package is required for Parquet output (pip install pyarrow)")
+        super().__init__(path, content_mode, content_chars, timings)
+        self.compression = compression
+        self.row_group_size = row_group_size
+        types = {
+            'minhash_score': pa.float64(),
+            'simhash_score': pa.float64(),
+            'embedding_score': pa.float64(),
+            'is_duplicate': pa.bool_(),
+            **{name: pa.float64() for name in TIMING_FIELDNAMES}
+        }
+        self._schema = pa.schema([(name, types.get(name, pa.string())) for name in self.fieldnames])
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression)
+        self._columns = {name: [] for name in self.fieldnames}
+        self._buffered = 0
+
+    def _write_rows(self, rows):
+        count = 0
+        for row in rows:
+            for name in self.fieldnames:
+                self._columns[name].append(row[name])
+            count += 1
+            self._buffered += 1
+            if self._buffered >= self.row_group_size:
+                self._flush()
+        return count
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self._schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self._columns = {name: [] for name in self.fieldnames}
+        self._buffered = 0
+
+    def _close(self):
+        self._flush()
+        self._writer.close()
+
+
+SINK_FORMATS = {
+    'csv': CSVSink,
+    'jsonl': JSONLSink,
+    'parquet': ParquetSink
+}
+
+
+def format_from_path(path: str) -> str:
+    lower = path.lower()
+    for suffix in ('.gz', '.zst'):
+        if lower.endswith(suffix):
+            lower = lower[:-len(suffix)]
+    if lower.endswith('.jsonl') or lower.endswith('.ndjson'):
+        return 'jsonl'
+    if lower.endswith('.parquet'):
+        return 'parquet'
+    return 'csv'
+
+
+def create_sink(path: str, format: Optional[str] = None, **options) -> ResultSink:
+    """Uzantıdan (veya format ile) uygun sink'i oluştur; .gz / .zst uzantısı sıkıştırmayı seçer"""
+    format = format or format_from_path(path)
+    if format not in SINK_FORMATS:
+        raise ValueError(f"Unknown output format: {format}. Available: {', '.join(SINK_FORMATS)}")
+    if format != 'parquet':
+        options.setdefault('compression', 'auto')
+    return SINK_FORMATS[format](path, **options)
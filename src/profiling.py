@@ -0,0 +1,185 @@
+"""İsteğe bağlı çalıştırma profili: örneklenmiş cProfile + tracemalloc snapshot'ları
+
+RunProfiler is attached to URLExtractor.profiler. Only a sampled subset of
+work units is profiled: a URL in sequential mode, or a batch in parallel
+mode (there cProfile sees the main thread's dedupe and classification work,
+not the fetch threads). tracemalloc is also switched on only for a sampled
+unit, so unsampled units pay no allocation-tracing cost; while it is on it
+traces every thread. At most one unit is profiled at a time; a unit sampled
+while another one is being profiled runs unprofiled instead of waiting.
+Every snapshot_interval seconds, and again when the run ends, it writes:
+
+    profile_<run>_<n>.prof    cumulative cProfile stats (open with pstats / snakeviz)
+    memory_<run>_<n>.txt      allocation sites still held at the end of sampled
+                              units (summed) + sizes of the dedupe stores
+
+    profiler = RunProfiler("profiles", sample_rate=0.05)
+    extractor.profiler = profiler
+"""
+import os
+import time
+import random
+import cProfile
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+
+def storage_sizes(extractor) -> Dict:
+    """Duplicate index'leri, LLM cache ve similarity log boyutları (kayıt sayısı / yaklaşık bayt)"""
+    checker = extractor.similarity_checker
+    sizes = {}
+
+    minhash_storage = getattr(checker, 'minhash_storage', None)
+    if minhash_storage is not None:
+        sizes['minhash_storage'] = {
+            'entries': len(minhash_storage),
+            'bytes': sum(m.hashvalues.nbytes for m in list(minhash_storage.values()))
+        }
+    for name in ('simhash_storage', 'embedding_storage'):
+        storage = getattr(checker, name, None)
+        if storage is not None:
+            sizes[name] = {'entries': len(storage), 'bytes': storage.nbytes}
+
+    llm_cache = getattr(checker, 'llm_cache', None)
+    if llm_cache is not None:
+        sizes['llm_cache'] = {'entries': len(llm_cache)}
+    result_cache = getattr(extractor.llm_classifier, 'cache', None)
+    if result_cache is not None:
+        sizes['llm_result_cache'] = {'entries': len(result_cache)}
+
+    logs = getattr(checker, 'similarity_logs', None)
+    if logs is not None:
+        logs.flush()
+        sizes['similarity_logs'] = {
+            'buffered': len(logs),
+            'total_records': logs.total_records,
+            'file_bytes': os.path.getsize(logs.path) if os.path.exists(logs.path) else 0
+        }
+    return sizes
+
+
+class RunProfiler:
+    """stream_multiple_urls için örneklenmiş profil ve bellek snapshot'ları"""
+
+    def __init__(self, output_dir: str = "profiles", sample_rate: float = 0.05, snapshot_interval: float = 60,
+                 top_n: int = 25, trace_memory: bool = True, memory_frames: int = 1, seed: Optional[int] = None):
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.snapshot_interval = snapshot_interval
+        self.top_n = top_n
+        self.trace_memory = trace_memory
+        self.memory_frames = memory_frames
+        self._random = random.Random(seed)
+        # _lock sayaçları korur; _active profillenen (tek) birimi. Sıra her zaman _active -> _lock
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self._profile = None
+        self._extractor = None
+        self.run_id = None
+        self.units = 0
+        self.sampled_units = 0
+        self.snapshots = 0
+        self._last_snapshot = 0.0
+        self._memory_sites = {}
+        self._memory_peak = 0
+
+    def start_run(self, extractor):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._extractor = extractor
+        self._profile = cProfile.Profile()
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+        self.units = 0
+        self.sampled_units = 0
+        self.snapshots = 0
+        self._last_snapshot = time.monotonic()
+        self._memory_sites = {}
+        self._memory_peak = 0
+        logging.info(f"Profiling run {self.run_id}: sample rate {self.sample_rate}, output {self.output_dir}")
+
+    @contextmanager
+    def unit(self):
+        """Bir iş birimini (URL veya batch) örneklenmişse cProfile altında çalıştır"""
+        with self._lock:
+            self.units += 1
+            sampled = self._profile is not None and self._random.random() < self.sample_rate
+        # cProfile aynı anda tek bir enable() kabul eder; başka birim profilleniyorsa beklemeden profilsiz çalış
+        if sampled and self._active.acquire(blocking=False):
+            try:
+                with self._lock:
+                    self.sampled_units += 1
+                started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+                if started_tracing:
+                    tracemalloc.start(self.memory_frames)
+                self._profile.enable()
+                try:
+                    yield
+                finally:
+                    self._profile.disable()
+                    if tracemalloc.is_tracing() and self.trace_memory:
+                        self._collect_memory()
+                    if started_tracing:
+                        tracemalloc.stop()
+            finally:
+                self._active.release()
+        else:
+            yield
+        if time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def _collect_memory(self):
+        """Birim sonunda hâlâ tutulan ayırmaları satır bazında topla (yalnızca örneklenmiş birimlerde)"""
+        peak = tracemalloc.get_traced_memory()[1]
+        statistics = tracemalloc.take_snapshot().statistics('lineno')
+        with self._lock:
+            self._memory_peak = max(self._memory_peak, peak)
+            for stat in statistics:
+                size, count = self._memory_sites.get(stat.traceback, (0, 0))
+                self._memory_sites[stat.traceback] = (size + stat.size, count + stat.count)
+
+    def snapshot(self):
+        """cProfile dökümü ve bellek raporunu yaz"""
+        if self._profile is None:
+            return
+        # dump_stats profili disable eder; profillenen birimin bitmesi beklenir
+        with self._active, self._lock:
+            if self._profile is None:
+                return
+            self._last_snapshot = time.monotonic()
+            self.snapshots += 1
+            base = os.path.join(self.output_dir, f"{{}}_{self.run_id}_{self.snapshots:03d}")
+            self._profile.dump_stats(base.format('profile') + '.prof')
+            self._write_memory_report(base.format('memory') + '.txt')
+
+    def _write_memory_report(self, path):
+        lines = [
+            f"Run {self.run_id} snapshot {self.snapshots} ({datetime.now().isoformat(timespec='seconds')})",
+            f"Work units: {self.units}, profiled: {self.sampled_units}",
+            "",
+            "STORAGE SIZES:"
+        ]
+        for name, size in storage_sizes(self._extractor).items():
+            lines.append(f"  {name}: " + ", ".join(f"{key}={value}" for key, value in size.items()))
+        lines.append("")
+
+        if self._memory_sites:
+            lines.append(f"TRACEMALLOC (profiled units only): highest peak in a unit "
+                         f"{self._memory_peak / 1024 / 1024:.1f} MB")
+            lines.append(f"TOP {self.top_n} ALLOCATION SITES (still held at the end of a unit, summed):")
+            top = sorted(self._memory_sites.items(), key=lambda item: item[1][0], reverse=True)[:self.top_n]
+            for traceback, (size, count) in top:
+                lines.append(f"  {traceback}: size={size / 1024:.1f} KiB, count={count}")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def finish_run(self):
+        """Son snapshot'ı yaz"""
+        if self._profile is None:
+            return
+        self.snapshot()
+        logging.info(f"Profiling run {self.run_id} finished: {self.sampled_units}/{self.units} units profiled, "
+                     f"{self.snapshots} snapshots in {self.output_dir}")
+        self._profile = None
@@ -0,0 +1,176 @@
+"""Önizleme için sayfalı, filtrelenebilir sonuç kaynakları
+
+ListResultSource wraps the in-memory results list. ResultJournal appends
+results to a JSONL file and keeps only the byte offset and a small filter
+key (status, duplicate flag, category) per row in memory, so a page is read
+back from disk on demand. Both sources share the same interface:
+
+    source = ListResultSource(results)
+    total = source.count(status='success', duplicate=False)
+    rows = source.page(0, 100, status='success', duplicate=False)
+"""
+import json
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+
+def result_key(result: Dict):
+    """Filtrelemede kullanılan kompakt satır anahtarı: (status, is_duplicate, category)"""
+    return (
+        result.get('status', 'unknown'),
+        bool(result.get('is_duplicate')),
+        result.get('child_category') or ''
+    )
+
+
+def _key_matches(key, status: Optional[str], duplicate: Optional[bool], category: Optional[str]) -> bool:
+    return ((status is None or key[0] == status)
+            and (duplicate is None or key[1] == duplicate)
+            and (category is None or key[2] == category))
+
+
+def default_journal_dir() -> str:
+    return os.path.join(os.path.expanduser('~'), '.cache', 'url_extractor', 'result_journals')
+
+
+def _close_journal_file(file, delete_path: Optional[str]):
+    if not file.closed:
+        file.close()
+    if delete_path is not None:
+        try:
+            os.remove(delete_path)
+        except OSError:
+            pass
+
+
+class ResultSource(ABC):
+    """Ortak arayüz: len(), get(i), count(**filters), page(page, page_size, **filters)
+
+    Filters are status ('success' / 'failed'), duplicate (True / False) and
+    category. Matching row indices are cached per filter combination, so
+    paging through a filtered view scans the row keys only once.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._match_cache = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    @abstractmethod
+    def get(self, index: int) -> Dict:
+        """index'teki sonucu döndür"""
+
+    def categories(self) -> List[str]:
+        return sorted({key[2] for key in self._keys if key[2]})
+
+    def _add_key(self, result: Dict):
+        with self._lock:
+            self._add_key_locked(result)
+
+    def _add_key_locked(self, result: Dict):
+        # Çağıran _lock'u tutar
+        self._keys.append(result_key(result))
+        self._match_cache.clear()
+
+    def matching(self, status: Optional[str] = None, duplicate: Optional[bool] = None,
+                 category: Optional[str] = None) -> Sequence[int]:
+        """Filtreye uyan satır indeksleri (array('q'), satırların kendisi okunmaz)"""
+        if status is None and duplicate is None and category is None:
+            return range(len(self._keys))
+        cache_key = (status, duplicate, category)
+        with self._lock:
+            cached = self._match_cache.get(cache_key)
+            if cached is None:
+                cached = array('q', (i for i, key in enumerate(self._keys)
+                                     if _key_matches(key, status, duplicate, category)))
+                self._match_cache[cache_key] = cached
+        return cached
+
+    def count(self, **filters) -> int:
+        return len(self.matching(**filters))
+
+    def page(self, page: int, page_size: int, **filters) -> List[Dict]:
+        indices = self.matching(**filters)
+        start = page * page_size
+        return [self.get(i) for i in indices[start:start + page_size]]
+
+    def iter_results(self, **filters) -> Iterator[Dict]:
+        """Filtreye uyan sonuçları sırayla döndür (kaydetme için; listeye alınmaz)"""
+        for index in self.matching(**filters):
+            yield self.get(index)
+
+
+class ListResultSource(ResultSource):
+    """Bellekteki sonuç listesi üzerinde sayfalama"""
+
+    def __init__(self, results: List[Dict]):
+        super().__init__()
+        self._results = results
+        for result in results:
+            self._add_key(result)
+
+    def get(self, index: int) -> Dict:
+        return self._results[index]
+
+
+class ResultJournal(ResultSource):
+    """Sonuçları JSONL dosyasına ekleyen, satırları offset ile geri okuyan kaynak
+
+    Without an explicit path the journal is a scratch file under
+    ~/.cache/url_extractor/result_journals that is deleted on close() or
+    when the journal is garbage collected; an explicit path is kept.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__()
+        owned = path is None
+        if owned:
+            journal_dir = default_journal_dir()
+            os.makedirs(journal_dir, exist_ok=True)
+            path = os.path.join(journal_dir, f"results_{os.getpid()}_{id(self):x}.jsonl")
+        self.path = path
+        self._offsets = array('q')
+        self._file = open(self.path, 'w+b')
+        self._finalizer = weakref.finalize(self, _close_journal_file, self._file, path if owned else None)
+
+    def append(self, result: Dict):
+        line = (json.dumps(result, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        # Yazma, offset ve key aynı kilit altında: eşzamanlı append'lerde satır i'nin key'i i. sırada kalır
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            self._offsets.append(self._file.tell())
+            self._file.write(line)
+            self._add_key_locked(result)
+
+    def get(self, index: int) -> Dict:
+        with self._lock:
+            self._file.flush()
+            self._file.seek(self._offsets[index])
+            line = self._file.readline()
+        return json.loads(line)
+
+    def __iter__(self):
+        return self.iter_results()
+
+    def iter_results(self, status: Optional[str] = None, duplicate: Optional[bool] = None,
+                     category: Optional[str] = None) -> Iterator[Dict]:
+        """Dosyayı baştan sona ayrı bir handle ile oku; satır başına seek yapılmaz"""
+        with self._lock:
+            self._file.flush()
+            count = len(self._offsets)
+            keys = self._keys[:count]
+        with open(self.path, 'rb') as f:
+            for key, line in zip(keys, f):
+                if _key_matches(key, status, duplicate, category):
+                    yield json.loads(line)
+
+    def close(self):
+        with self._lock:
+            self._finalizer()
@@ -0,0 +1,160 @@
+"""Çalışma sırasında canlı throughput / aşama gecikmesi ölçümleri
+
+The extractor wraps each pipeline stage (fetch, parse, similarity, llm) in
+RunMetrics.stage(), which tracks the number of in-flight items and a rolling
+latency window per stage. snapshot() returns URLs/sec, ETA, per-stage
+p50/p95 and cache hit rates; the GUI polls it at a low fixed rate.
+"""
+import time
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from adaptive_control import LatencyTracker
+
+STAGES = ('fetch', 'parse', 'similarity', 'llm')
+
+
+class RunMetrics:
+    """Thread-safe canlı metrikler: aşama gecikmeleri, in-flight sayıları, hız ve ETA
+
+    Latencies are per item: a stage that handles a batch of n pages records
+    elapsed / n. The throughput shown is measured over the last rate_window
+    seconds, so it follows slowdowns instead of averaging them away.
+    """
+
+    def __init__(self, window: int = 500, rate_window: float = 30.0):
+        self.window = window
+        self.rate_window = rate_window
+        self._lock = threading.Lock()
+        self._cache_providers: Dict[str, Callable[[], Dict]] = {}
+        self.start()
+
+    def start(self, total: Optional[int] = None):
+        """Yeni çalıştırma için sayaçları sıfırla"""
+        with self._lock:
+            self.total = total
+            self.started_at = time.monotonic()
+            self.completed = 0
+            self._completions = deque()
+            self._latency = {stage: LatencyTracker(self.window) for stage in STAGES}
+            self._in_flight = Counter()
+            self._cache_counts = {}
+
+    @contextmanager
+    def stage(self, name: str, count: int = 1):
+        """Bir aşamayı ölç: süresince in-flight sayılır, bitince gecikme kaydedilir"""
+        if count <= 0:
+            yield
+            return
+        with self._lock:
+            self._in_flight[name] += count
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._in_flight[name] -= count
+                tracker = self._tracker(name)
+            per_item = elapsed / count
+            for _ in range(count):
+                tracker.add(per_item)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            tracker = self._tracker(name)
+        tracker.add(seconds)
+
+    def _tracker(self, name: str) -> LatencyTracker:
+        """name için tracker (lock altında çağrılır; yalnızca ilk kayıtta oluşturulur)"""
+        tracker = self._latency.get(name)
+        if tracker is None:
+            tracker = self._latency[name] = LatencyTracker(self.window)
+        return tracker
+
+    def count_cache(self, name: str, hit: bool):
+        """Extractor içindeki cache'ler için hit / miss say"""
+        with self._lock:
+            counts = self._cache_counts.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def register_cache(self, name: str, provider: Callable[[], Dict]):
+        """stats() sözlüğünde 'hits' / 'misses' döndüren dış cache ekle (ör. LLMResultCache)"""
+        self._cache_providers[name] = provider
+
+    def url_done(self):
+        now = time.monotonic()
+        with self._lock:
+            self.completed += 1
+            self._completions.append(now)
+            while self._completions and now - self._completions[0] > self.rate_window:
+                self._completions.popleft()
+
+    def _rate(self, now: float) -> float:
+        if not self._completions:
+            return 0.0
+        while self._completions and now - self._completions[0] > self.rate_window:
+            self._completions.popleft()
+        span = min(self.rate_window, now - self.started_at)
+        return len(self._completions) / span if span > 0 else 0.0
+
+    def snapshot(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self.started_at
+            rate = self._rate(now)
+            remaining = self.total - self.completed if self.total else None
+            stages = {}
+            for name, tracker in self._latency.items():
+                stages[name] = {**tracker.stats(), 'in_flight': self._in_flight.get(name, 0)}
+            caches = {}
+            for name, (hits, misses) in self._cache_counts.items():
+                caches[name] = {'hits': hits, 'misses': misses}
+            providers = dict(self._cache_providers)
+            completed = self.completed
+            total = self.total
+
+        for name, provider in providers.items():
+            try:
+                stats = provider() or {}
+                caches[name] = {'hits': stats.get('hits', 0), 'misses': stats.get('misses', 0)}
+            except Exception:
+                continue
+        for counts in caches.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_rate'] = counts['hits'] / lookups if lookups else None
+
+        return {
+            'completed': completed,
+            'total': total,
+            'elapsed': elapsed,
+            'urls_per_sec': rate,
+            'avg_urls_per_sec': completed / elapsed if elapsed > 0 else 0.0,
+            'eta': remaining / rate if remaining is not None and remaining > 0 and rate > 0 else None,
+            'stages': stages,
+            'caches': caches
+        }
+
+    def format_lines(self):
+        """GUI paneli için kısa metin satırları"""
+        snap = self.snapshot()
+        eta = snap['eta']
+        eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta is not None else '--'
+        lines = [
+            f"Done: {snap['completed']}/{snap['total'] or '?'} | {snap['urls_per_sec']:.2f} URLs/sec "
+            f"(avg {snap['avg_urls_per_sec']:.2f}) | ETA {eta_text}"
+        ]
+        for name in STAGES:
+            stage = snap['stages'].get(name)
+            if not stage or not (stage['samples'] or stage['in_flight']):
+                continue
+            p50 = f"{stage['p50'] * 1000:.0f}" if stage['p50'] is not None else '--'
+            p95 = f"{stage['p95'] * 1000:.0f}" if stage['p95'] is not None else '--'
+            lines.append(f"{name:>10}: p50 {p50:>6} ms | p95 {p95:>6} ms | in flight {stage['in_flight']}")
+        caches = [f"{name} {c['hit_rate'] * 100:.0f}%" for name, c in sorted(snap['caches'].items())
+                  if c['hit_rate'] is not None]
+        if caches:
+            lines.append("Cache hit rate: " + " | ".join(caches))
+        return lines
@@ -0,0 +1,249 @@
+"""Çalıştırma özeti için artımlı (tek geçişli) istatistik toplayıcı
+
+The extractor feeds every finished result into a SummaryAggregator, so the
+summary report can be rendered at any time (also mid-run) without keeping
+the results list around.
+"""
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from timing import TIMING_STAGES
+
+
+class LatencyHistogram:
+    """Logaritmik kovalı gecikme histogramı (sabit bellek, ~%19 çözünürlük)
+
+    Bucket i covers [min_value * 2^(i/4), min_value * 2^((i+1)/4)).
+    """
+
+    BUCKETS_PER_DOUBLING = 4
+
+    def __init__(self, min_value: float = 0.001):
+        self.min_value = min_value
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        value = max(float(value), 0.0)
+        index = 0
+        if value > self.min_value:
+            index = int(math.log2(value / self.min_value) * self.BUCKETS_PER_DOUBLING)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _bucket_upper(self, index: int) -> float:
+        return self.min_value * 2 ** ((index + 1) / self.BUCKETS_PER_DOUBLING)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._bucket_upper(index), self.max)
+        return self.max
+
+    def cumulative(self, bounds) -> List[int]:
+        """Her üst sınır için <= sınır olan gözlem sayısı (Prometheus 'le' bucket'ları; kova çözünürlüğünde)"""
+        counts = []
+        for bound in bounds:
+            counts.append(sum(n for index, n in self.buckets.items() if self._bucket_upper(index) <= bound * 1.0001))
+        return counts
+
+    def stats(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': self.max
+        }
+
+
+class SummaryAggregator:
+    """Sonuçlar tamamlandıkça güncellenen sayaçlar; rapor her an üretilebilir"""
+
+    def __init__(self, max_duplicate_examples: int = 50):
+        self.max_duplicate_examples = max_duplicate_examples
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.total = 0
+            self.status_counts = Counter()
+            self.error_counts = Counter()
+            self.llm_error_counts = Counter()
+            self.category_counts = Counter()
+            self.classified_by_counts = Counter()
+            self.detection_methods = Counter()
+            self.duplicate_count = 0
+            self.duplicate_examples: List[Dict] = []
+            self.latency = LatencyHistogram()
+            # result['timings'] aşamaları için ayrı histogramlar
+            self.stage_latency: Dict[str, LatencyHistogram] = {}
+
+    def add(self, result: Dict):
+        with self._lock:
+            self.total += 1
+            status = result.get('status', 'unknown')
+            self.status_counts[status] += 1
+            if status != 'success':
+                self.error_counts[result.get('error') or 'Unknown error'] += 1
+            else:
+                if result.get('llm_error'):
+                    self.llm_error_counts[result['llm_error'].split(':', 1)[0]] += 1
+                if result.get('is_duplicate'):
+                    self.duplicate_count += 1
+                    info = result.get('duplicate_info') or {}
+                    self.detection_methods[info.get('method', 'Unknown')] += 1
+                    if len(self.duplicate_examples) < self.max_duplicate_examples:
+                        self.duplicate_examples.append({
+                            'url': result.get('url', ''),
+                            'original_url': info.get('original_url', ''),
+                            'method': info.get('method', 'Unknown'),
+                            'similarity': info.get('similarity'),
+                            'category': result.get('child_category', '')
+                        })
+                else:
+                    self.category_counts[result.get('child_category') or '(none)'] += 1
+                    if result.get('classified_by'):
+                        self.classified_by_counts[result['classified_by']] += 1
+            if result.get('elapsed') is not None:
+                self.latency.add(result['elapsed'])
+            for stage, seconds in (result.get('timings') or {}).items():
+                histogram = self.stage_latency.get(stage)
+                if histogram is None:
+                    histogram = self.stage_latency[stage] = LatencyHistogram()
+                histogram.add(seconds)
+
+    def add_many(self, results):
+        for result in results:
+            self.add(result)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            successful = self.status_counts.get('success', 0)
+            return {
+                'total': self.total,
+                'successful': successful,
+                'failed': self.total - successful,
+                'success_rate': successful / self.total if self.total else 0,
+                'status_counts': dict(self.status_counts),
+                'error_counts': dict(self.error_counts),
+                'llm_error_counts': dict(self.llm_error_counts),
+                'category_counts': dict(self.category_counts),
+                'classified_by_counts': dict(self.classified_by_counts),
+                'detection_methods': dict(self.detection_methods),
+                'duplicate_count': self.duplicate_count,
+                'duplicate_examples': list(self.duplicate_examples),
+                'latency': self.latency.stats(),
+                'stage_latency': {stage: self.stage_latency[stage].stats() for stage in self._stage_order()}
+            }
+
+    def histogram_buckets(self, bounds) -> Dict:
+        """{'url' | aşama: (kümülatif sayılar, toplam süre, sayı)} — metrics endpoint için kilit altında kopya"""
+        with self._lock:
+            histograms = {'url': self.latency}
+            histograms.update((stage, self.stage_latency[stage]) for stage in self._stage_order())
+            return {name: (h.cumulative(bounds), h.total, h.count) for name, h in histograms.items()}
+
+    def _stage_order(self):
+        known = [stage for stage in TIMING_STAGES if stage in self.stage_latency]
+        return known + sorted(stage for stage in self.stage_latency if stage not in TIMING_STAGES)
+
+    def format_stage_lines(self, stage_latency: Optional[Dict] = None) -> List[str]:
+        """Aşama başına ms cinsinden ortalama / p50 / p95 satırları"""
+        if stage_latency is None:
+            stage_latency = self.snapshot()['stage_latency']
+        lines = []
+        for stage, stats in stage_latency.items():
+            lines.append(f"  {stage:>16}: mean {stats['mean'] * 1000:8.1f} | p50 {stats['p50'] * 1000:8.1f} | "
+                         f"p95 {stats['p95'] * 1000:8.1f} | max {stats['max'] * 1000:8.1f} ({stats['count']} URLs)")
+        return lines
+
+    def render(self, similarity_stats: Optional[Dict] = None) -> str:
+        """Özet raporu metin olarak üret"""
+        summary = self.snapshot()
+        similarity_stats = similarity_stats or {}
+        lines = ["URL EXTRACTION SUMMARY REPORT", "=" * 50, ""]
+
+        lines += [
+            "GENERAL STATISTICS:",
+            f"Total URLs processed: {summary['total']}",
+            f"Successful extractions: {summary['successful']}",
+            f"Failed extractions: {summary['failed']}",
+            f"Success rate: {summary['success_rate'] * 100:.1f}%",
+            ""
+        ]
+
+        lines += [
+            "SIMILARITY ANALYSIS:",
+            f"Unique content: {similarity_stats.get('unique_count', summary['successful'] - summary['duplicate_count'])}",
+            f"Duplicate content: {similarity_stats.get('total_duplicates', summary['duplicate_count'])}",
+            f"Total processed: {similarity_stats.get('total_processed', summary['successful'])}",
+            ""
+        ]
+
+        if summary['detection_methods']:
+            lines.append("DUPLICATES BY DETECTION METHOD:")
+            for method, count in sorted(summary['detection_methods'].items()):
+                lines.append(f"  {method}: {count}")
+            lines.append("")
+
+        lines.append("CONTENT BY CATEGORY:")
+        for category, count in sorted(summary['category_counts'].items()):
+            lines.append(f"  {category}: {count} unique URLs")
+        lines.append("")
+
+        if summary['classified_by_counts'] or summary['llm_error_counts']:
+            lines.append("CLASSIFICATION:")
+            for method, count in sorted(summary['classified_by_counts'].items()):
+                lines.append(f"  Classified by {method}: {count}")
+            for error_type, count in sorted(summary['llm_error_counts'].items()):
+                lines.append(f"  LLM error ({error_type}): {count}")
+            lines.append("")
+
+        if summary['error_counts']:
+            lines.append("ERROR ANALYSIS:")
+            for error_type, count in sorted(summary['error_counts'].items()):
+                lines.append(f"  {error_type}: {count} occurrences")
+            lines.append("")
+
+        latency = summary['latency']
+        if latency['count']:
+            lines += [
+                "LATENCY PER URL (seconds):",
+                f"  Mean: {latency['mean']:.3f} | p50: {latency['p50']:.3f} | p95: {latency['p95']:.3f} | "
+                f"p99: {latency['p99']:.3f} | Max: {latency['max']:.3f}",
+                ""
+            ]
+
+        if summary['stage_latency']:
+            lines.append("STAGE TIMINGS PER URL (ms):")
+            lines += self.format_stage_lines(summary['stage_latency'])
+            lines.append("")
+
+        if summary['duplicate_examples']:
+            shown = len(summary['duplicate_examples'])
+            lines.append(f"DUPLICATE CONTENT FOUND (first {shown} of {summary['duplicate_count']}):")
+            for dup in summary['duplicate_examples']:
+                lines.append(f"  URL: {dup['url']}")
+                lines.append(f"  Original: {dup['original_url']}")
+                lines.append(f"  Method: {dup['method']}")
+                lines.append(f"  Category: {dup['category']}")
+                lines.append("")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,162 @@
+import re
+import hashlib
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Fingerprint formatı: simhash kütüphanesi (1.x / 2.x) varsayılanlarıyla birebir aynı.
+# 64-bit, md5 digest'in son 8 byte'ı, 4 karakterlik kaydırmalı shingle'lar.
+# Algoritma değişirse artırılmalı; farklı versiyonlardaki fingerprint'ler karşılaştırılamaz.
+SIMHASH_VERSION = 1
+SIMHASH_BITS = 64
+
+_TOKEN_PATTERN = re.compile(r'[\w\u4e00-\u9fcc]+')
+_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def simhash_features(text: str, width: int = 4) -> List[str]:
+    """Tokenize text exactly like simhash.Simhash(text) does"""
+    content = ''.join(_TOKEN_PATTERN.findall(text.lower()))
+    return [content[i:i + width] for i in range(max(len(content) - width + 1, 1))]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((int(a) ^ int(b)) & ((1 << SIMHASH_BITS) - 1)).count('1')
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    as_bytes = values.view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1)
+
+
+class SimHashBuilder:
+    """Bir grup token listesi için SimHash fingerprint'lerini NumPy ile toplu hesaplar
+
+    Feature hashes are memoized (shingles repeat heavily across pages), and the
+    per-bit weighted voting is done for the whole batch in a few array ops.
+    Output values are plain uint64 fingerprints identical to simhash.Simhash.value.
+    """
+
+    def __init__(self, max_cached_features: int = 500000):
+        self.max_cached_features = max_cached_features
+        self._hash_cache = {}
+
+    def _feature_hash(self, feature: str) -> int:
+        value = self._hash_cache.get(feature)
+        if value is None:
+            if len(self._hash_cache) >= self.max_cached_features:
+                self._hash_cache.clear()
+            value = int.from_bytes(hashlib.md5(feature.encode('utf-8')).digest()[-8:], 'big')
+            self._hash_cache[feature] = value
+        return value
+
+    def fingerprints(self, feature_lists: Sequence[Iterable[str]]) -> np.ndarray:
+        """Compute one uint64 fingerprint per feature list"""
+        hashes = []
+        weights = []
+        offsets = []
+        for features in feature_lists:
+            counts = Counter(features)
+            if not counts:
+                counts = Counter([''])
+            offsets.append(len(hashes))
+            for feature, weight in counts.items():
+                hashes.append(self._feature_hash(feature))
+                weights.append(weight)
+
+        if not offsets:
+            return np.zeros(0, dtype=np.uint64)
+
+        hash_array = np.array(hashes, dtype=np.uint64)
+        weight_array = np.array(weights, dtype=np.int64)
+        offset_array = np.array(offsets, dtype=np.int64)
+
+        # Her bit için ağırlıklı oy; bit set ⇔ oy > toplam ağırlık / 2.
+        # Bitler tek tek işlenir: n_features x 64 ara matris oluşmaz (feature başına ~16 byte geçici bellek)
+        votes = np.empty((len(offset_array), SIMHASH_BITS), dtype=np.int64)
+        for bit in range(SIMHASH_BITS):
+            bit_values = (hash_array >> _SHIFTS[bit]) & np.uint64(1)
+            votes[:, bit] = np.add.reduceat(bit_values.view(np.int64) * weight_array, offset_array)
+        totals = np.add.reduceat(weight_array, offset_array)
+        fingerprint_bits = (votes * 2 > totals[:, None]).astype(np.uint64)
+        return (fingerprint_bits << _SHIFTS).sum(axis=1, dtype=np.uint64)
+
+    def fingerprint_texts(self, texts: Sequence[str]) -> np.ndarray:
+        return self.fingerprints([simhash_features(text) for text in texts])
+
+    def fingerprint(self, text: str) -> int:
+        return int(self.fingerprint_texts([text])[0])
+
+
+class SimHashIndex:
+    """uint64 SimHash fingerprint'lerini tutan, vektörize Hamming araması yapan index"""
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._values = np.zeros(initial_capacity, dtype=np.uint64)
+        self._urls: List[str] = []
+        self._rows = {}
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __contains__(self, url):
+        return url in self._rows
+
+    def __getitem__(self, url) -> int:
+        return int(self._values[self._rows[url]])
+
+    def keys(self) -> List[str]:
+        return list(self._urls)
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        for row, url in enumerate(self._urls):
+            yield url, int(self._values[row])
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._urls) * self._values.itemsize
+
+    def add(self, url: str, fingerprint: int):
+        row = self._rows.get(url)
+        if row is None:
+            row = len(self._urls)
+            if row >= self._values.shape[0]:
+                values = np.zeros(self._values.shape[0] * 2, dtype=np.uint64)
+                values[:row] = self._values
+                self._values = values
+            self._urls.append(url)
+            self._rows[url] = row
+        self._values[row] = np.uint64(fingerprint)
+
+    def remove(self, url: str) -> bool:
+        row = self._rows.pop(url, None)
+        if row is None:
+            return False
+        last = len(self._urls) - 1
+        if row != last:
+            last_url = self._urls[last]
+            self._values[row] = self._values[last]
+            self._urls[row] = last_url
+            self._rows[last_url] = row
+        self._urls.pop()
+        return True
+
+    def distances(self, fingerprint: int) -> np.ndarray:
+        count = len(self._urls)
+        return _popcount64(self._values[:count] ^ np.uint64(fingerprint)).astype(np.int64)
+
+    def search(self, fingerprint: int) -> Tuple[Optional[str], int]:
+        """Return (url, distance) of the closest stored fingerprint"""
+        if not self._urls:
+            return None, SIMHASH_BITS
+        distances = self.distances(fingerprint)
+        row = int(np.argmin(distances))
+        return self._urls[row], int(distances[row])
+
+    def clear(self):
+        self._values = np.zeros_like(self._values)
+        self._urls = []
+        self._rows = {}
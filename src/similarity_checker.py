@@ -1,13 +1,18 @@
 import re
-import json
+import time
+import threading
 import numpy as np
 from datasketch import MinHash, MinHashLSH
-from simhash import Simhash
-from collections import defaultdict
-from typing import Dict, Tuple, List, Optional
-from sentence_transformers import SentenceTransformer
+from collections import defaultdict, OrderedDict
+from typing import Dict, Tuple, List, Optional, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.metrics.pairwise import cosine_similarity
 import logging
+from similarity_log import SimilarityLogSink
+from embedding_index import EmbeddingIndex
+from embedding_backend import create_embedding_backend
+from simhash_index import SimHashBuilder, SimHashIndex, hamming_distance, SIMHASH_VERSION
+from timing import NULL_TIMER
 
 class SimilarityChecker:
     ENGLISH_STOPWORDS = {
@@ -18,11 +23,17 @@ class SimilarityChecker:
         }
     
     def __init__(self, threshold_minhash=0.35, threshold_simhash=16, threshold_embedding=0.8, 
-        embedding_model_name='all-MiniLM-L6-v2',embedding_enabled = True):
+        embedding_model_name='all-MiniLM-L6-v2',embedding_enabled = True,
+        similarity_log_path=None, similarity_log_buffer=1000, embedding_storage_mode='float32',
+        embedding_backend='sentence-transformers', embedding_backend_options=None,
+        window_size=None, window_hours=None, max_workers=1):
         self.minhash_lsh = MinHashLSH(threshold=threshold_minhash)
         self.minhash_storage = {}
-        self.simhash_storage = {}
-        self.embedding_storage = {}
+        # SimHash'ler düz uint64 olarak tek dizide tutulur (Simhash nesnesi yok)
+        self.simhash_builder = SimHashBuilder()
+        self.simhash_storage = SimHashIndex()
+        # Embedding'ler tek matriste; float16 / int8 modları belleği azaltır
+        self.embedding_storage = EmbeddingIndex(mode=embedding_storage_mode)
         self.llm_cache = {}
         self.embedding_enabled = embedding_enabled
 
@@ -30,10 +41,23 @@ class SimilarityChecker:
         self.threshold_simhash = threshold_simhash
         self.threshold_embedding = threshold_embedding
 
+        # Sliding window: sadece son N doküman / son T saat index'te tutulur
+        self.window_size = window_size
+        self.window_hours = window_hours
+        self._window = OrderedDict()  # url -> insert time (eskiden yeniye)
+        self.unique_total = 0
+        self.evicted_count = 0
+
+        # İmza hesaplama paralel, karşılaştırma + ekleme bu kilit altında seri yapılır
+        self.max_workers = max_workers
+        self._lock = threading.RLock()
+
         # embedding_enabled kaldırıldı, embedding modeli kesin yükleniyor
         try:
-            self.embedding_model = SentenceTransformer(embedding_model_name)
-            logging.info(f"Embedding model '{embedding_model_name}' loaded successfully")
+            self.embedding_model = create_embedding_backend(
+                embedding_backend, embedding_model_name, **(embedding_backend_options or {})
+            )
+            logging.info(f"Embedding model '{embedding_model_name}' loaded successfully ({embedding_backend} backend)")
         except Exception as e:
             logging.warning(f"Failed to load embedding model: {e}")
             self.embedding_model = None
@@ -44,10 +68,15 @@ class SimilarityChecker:
             'category_stats': defaultdict(int)
         }
 
-        self.similarity_logs = []
+        # Loglar diske akıtılır, bellekte sadece son kayıtlar tutulur
+        self.similarity_logs = SimilarityLogSink(similarity_log_path, buffer_size=similarity_log_buffer)
 
+        # get_comprehensive_stats'a eklenecek dış istatistikler (ör. 'llm' -> LLMClassifier.get_stats)
+        self._stats_providers = {}
 
-    def clean_text(self, text, remove_stopwords=False):
+
+    @staticmethod
+    def clean_text(text, remove_stopwords=False):
         """Daha yumuşak metin temizleme"""
         if not text:
             return ""
@@ -65,7 +94,7 @@ class SimilarityChecker:
         text = re.sub(r'[^\w\s\.\,\!\?]', '', text)
 
         if remove_stopwords:
-            words = [w for w in text.split() if w not in self.ENGLISH_STOPWORDS]
+            words = [w for w in text.split() if w not in SimilarityChecker.ENGLISH_STOPWORDS]
             text = ' '.join(words)
 
         return text
@@ -95,16 +124,20 @@ class SimilarityChecker:
 
 
     def create_simhash(self, content):
-        cleaned_text = self.clean_text(content, remove_stopwords=True)
-        return Simhash(cleaned_text)
+        """64-bit SimHash fingerprint (int), simhash.Simhash(cleaned_text).value ile aynı"""
+        return int(self.create_simhash_batch([content])[0])
+
+    def create_simhash_batch(self, contents):
+        """Vectorized SimHash fingerprints (uint64 array) for a list of texts"""
+        cleaned_texts = [self.clean_text(content, remove_stopwords=True) for content in contents]
+        return self.simhash_builder.fingerprint_texts(cleaned_texts)
     
     def create_embedding(self, content):
         if self.embedding_model is None:
             return None
         try:
             cleaned_text = self.clean_text(content,remove_stopwords=False)
-            if len(cleaned_text) > 5000:
-                cleaned_text = cleaned_text[:5000]
+            # Backend metni token bütçesine göre kırpar (MiniLM: 256 token)
             embedding = self.embedding_model.encode(cleaned_text)
             return embedding
         except Exception as e:
@@ -134,11 +167,71 @@ class SimilarityChecker:
         result = self.is_duplicate_comprehensive(url, "", content)
         return result[0], result[1].get('original_url'), result[1].get('method'), result[1].get('similarity', 0.0)
 
-    def is_duplicate_comprehensive(self, url, title, content) -> Tuple[bool, Dict, Dict]:
+    def compute_signatures(self, title, content, include_simhash=True, timer=NULL_TIMER) -> Dict:
+        """MinHash, SimHash and embedding for a page; safe to run concurrently"""
         combined_text = f"{title} {content}"
-        minhash = self.create_minhash(combined_text)
-        simhash = self.create_simhash(combined_text)
-        embedding = self.create_embedding(combined_text)
+        with timer.stage('minhash'):
+            minhash = self.create_minhash(combined_text)
+        with timer.stage('embedding'):
+            embedding = self.create_embedding(combined_text)
+        signatures = {
+            'minhash': minhash,
+            'embedding': embedding
+        }
+        if include_simhash:
+            with timer.stage('simhash'):
+                signatures['simhash'] = self.create_simhash(combined_text)
+        return signatures
+
+    def is_duplicate_comprehensive(self, url, title, content, signatures=None, timer=NULL_TIMER) -> Tuple[bool, Dict, Dict]:
+        if signatures is None:
+            signatures = self.compute_signatures(title, content, timer=timer)
+        with self._lock:
+            return self._check_and_insert(url, title, content, signatures, timer)
+
+    def check_many(self, items: Iterable[Tuple[str, str, str]], max_workers: Optional[int] = None,
+                   timers=None) -> List[Tuple[bool, Dict, Dict]]:
+        """Check (url, title, content) items; signatures in parallel, compare-and-insert in input order
+
+        Results are identical to calling is_duplicate_comprehensive on the items
+        one by one, regardless of the number of workers. timers, if given, is a
+        list of timing.StageTimer aligned with items.
+        """
+        items = list(items)
+        timers = list(timers) if timers is not None else [NULL_TIMER] * len(items)
+        workers = max_workers or self.max_workers
+        if workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                signatures = list(executor.map(
+                    lambda pair: self.compute_signatures(pair[0][1], pair[0][2], include_simhash=False, timer=pair[1]),
+                    zip(items, timers)
+                ))
+        else:
+            signatures = [self.compute_signatures(title, content, include_simhash=False, timer=timer)
+                          for (_, title, content), timer in zip(items, timers)]
+
+        # SimHash tüm batch için tek seferde hesaplanır; süre sayfalara eşit paylaştırılır
+        simhash_start = time.perf_counter()
+        fingerprints = self.create_simhash_batch([f"{title} {content}" for _, title, content in items])
+        if items:
+            share = (time.perf_counter() - simhash_start) / len(items)
+            for timer in timers:
+                timer.add('simhash', share)
+        for signature, fingerprint in zip(signatures, fingerprints):
+            signature['simhash'] = int(fingerprint)
+
+        with self._lock:
+            return [
+                self._check_and_insert(url, title, content, signature, timer)
+                for (url, title, content), signature, timer in zip(items, signatures, timers)
+            ]
+
+    def _check_and_insert(self, url, title, content, signatures, timer=NULL_TIMER) -> Tuple[bool, Dict, Dict]:
+        """Kritik bölüm: mevcut index'lerle karşılaştır, duplicate değilse ekle (kilit altında çağrılmalı)"""
+        self._evict_expired()
+        minhash = signatures['minhash']
+        simhash = signatures['simhash']
+        embedding = signatures['embedding']
 
         similarity_scores = {
             'minhash_max_similarity': 0.0,
@@ -149,32 +242,33 @@ class SimilarityChecker:
 
         best_minhash_similarity = 0
         best_minhash_url = None
-        for stored_url, stored_minhash in self.minhash_storage.items():
-            similarity = minhash.jaccard(stored_minhash)
-            if similarity > best_minhash_similarity:
-                best_minhash_similarity = similarity
-                best_minhash_url = stored_url
+        with timer.stage('minhash_search'):
+            for stored_url, stored_minhash in self.minhash_storage.items():
+                similarity = minhash.jaccard(stored_minhash)
+                if similarity > best_minhash_similarity:
+                    best_minhash_similarity = similarity
+                    best_minhash_url = stored_url
 
         similarity_scores['minhash_max_similarity'] = best_minhash_similarity
 
         best_simhash_distance = 64
         best_simhash_url = None
-        for stored_url, stored_simhash in self.simhash_storage.items():
-            distance = simhash.distance(stored_simhash)
-            if distance < best_simhash_distance:
-                best_simhash_distance = distance
-                best_simhash_url = stored_url
+        with timer.stage('simhash_search'):
+            stored_url, distance = self.simhash_storage.search(simhash)
+        if distance < best_simhash_distance:
+            best_simhash_distance = distance
+            best_simhash_url = stored_url
 
         similarity_scores['simhash_min_distance'] = best_simhash_distance
 
         best_embedding_similarity = 0
         best_embedding_url = None
         if embedding is not None:
-            for stored_url, stored_embedding in self.embedding_storage.items():
-                similarity = self.calculate_embedding_similarity(embedding, stored_embedding)
-                if similarity > best_embedding_similarity:
-                    best_embedding_similarity = similarity
-                    best_embedding_url = stored_url
+            with timer.stage('embedding_search'):
+                stored_url, similarity = self.embedding_storage.search(embedding)
+            if similarity > best_embedding_similarity:
+                best_embedding_similarity = similarity
+                best_embedding_url = stored_url
 
         similarity_scores['embedding_max_similarity'] = best_embedding_similarity
 
@@ -215,24 +309,57 @@ class SimilarityChecker:
             self.duplicate_stats['detection_methods']['SimHash'] += 1
 
         if not is_duplicate:
-            self.minhash_storage[url] = minhash
-            self.simhash_storage[url] = simhash
-            self.minhash_lsh.insert(url, minhash)
-            if embedding is not None:
-                self.embedding_storage[url] = embedding
+            with timer.stage('index_insert'):
+                if url in self.minhash_storage:
+                    # Aynı URL yeni içerikle geldi: eski kayıt silinir, window'da en sona geçer
+                    self._window.pop(url, None)
+                    self._remove_document(url, evicted=False)
+                self.minhash_storage[url] = minhash
+                self.simhash_storage.add(url, simhash)
+                self.minhash_lsh.insert(url, minhash)
+                if embedding is not None:
+                    self.embedding_storage.add(url, embedding)
+                self.unique_total += 1
+                self._window[url] = time.time()
+                self._evict_expired()
 
         return is_duplicate, duplicate_info, similarity_scores
 
+    def _evict_expired(self):
+        """Window dışına çıkan dokümanları tüm index'lerden sil"""
+        if self.window_size:
+            while len(self._window) > self.window_size:
+                url, _ = self._window.popitem(last=False)
+                self._remove_document(url)
+        if self.window_hours:
+            cutoff = time.time() - self.window_hours * 3600
+            while self._window:
+                url, inserted_at = next(iter(self._window.items()))
+                if inserted_at >= cutoff:
+                    break
+                self._window.popitem(last=False)
+                self._remove_document(url)
+
+    def _remove_document(self, url, evicted=True):
+        """Remove a stored document from MinHash LSH, SimHash and embedding storage"""
+        self.minhash_storage.pop(url, None)
+        self.simhash_storage.remove(url)
+        self.embedding_storage.remove(url)
+        if url in self.minhash_lsh:
+            self.minhash_lsh.remove(url)
+        self.llm_cache.pop(url, None)
+        if evicted:
+            self.evicted_count += 1
+
 
     def log_similarity_scores(self, url, similarity_scores, title, content):
         log_entry = {
             'url': url,
             'title': title[:100],
             'content_length': len(content),
-            'timestamp': np.datetime64('now'),
             'scores': similarity_scores.copy()
         }
-        self.similarity_logs.append(log_entry)
+        self.similarity_logs.write(log_entry)
         logging.info(f"Similarity check for {url}: "
                     f"MinHash={similarity_scores['minhash_max_similarity']:.3f}, "
                     f"SimHash={1 - similarity_scores['simhash_min_distance']/64:.3f}, "
@@ -253,64 +380,78 @@ class SimilarityChecker:
         
         print(f"\nSimilarity scores with existing {len(self.minhash_storage)} documents:")
         
-        for stored_url, stored_minhash in self.minhash_storage.items():
-            minhash_sim = minhash.jaccard(stored_minhash)
-            simhash_dist = simhash.distance(self.simhash_storage[stored_url])
-            simhash_sim = 1 - simhash_dist / 64
-            
-            embedding_sim = 0.0
-            if self.embedding_enabled and embedding is not None and stored_url in self.embedding_storage:
-                embedding_sim = self.calculate_embedding_similarity(embedding, self.embedding_storage[stored_url])
-            
-            print(f"  vs {stored_url[:50]}...")
-            print(f"    MinHash: {minhash_sim:.3f} (threshold: {self.threshold_minhash})")
-            print(f"    SimHash: {simhash_sim:.3f} (distance: {simhash_dist}, threshold: {self.threshold_simhash})")
-            print(f"    Embedding: {embedding_sim:.3f} (threshold: {self.threshold_embedding})")
-            print()
+        # Karşılaştırma sırasında index'in değişmemesi için kilit tutulur
+        with self._lock:
+            for stored_url, stored_minhash in self.minhash_storage.items():
+                minhash_sim = minhash.jaccard(stored_minhash)
+                simhash_dist = hamming_distance(simhash, self.simhash_storage[stored_url])
+                simhash_sim = 1 - simhash_dist / 64
+
+                embedding_sim = 0.0
+                if self.embedding_enabled and embedding is not None and stored_url in self.embedding_storage:
+                    embedding_sim = self.calculate_embedding_similarity(embedding, self.embedding_storage[stored_url])
+
+                print(f"  vs {stored_url[:50]}...")
+                print(f"    MinHash: {minhash_sim:.3f} (threshold: {self.threshold_minhash})")
+                print(f"    SimHash: {simhash_sim:.3f} (distance: {simhash_dist}, threshold: {self.threshold_simhash})")
+                print(f"    Embedding: {embedding_sim:.3f} (threshold: {self.threshold_embedding})")
+                print()
 
     def get_similarity_logs(self, limit: Optional[int] = None) -> List[Dict]:
-        """Get similarity logs for analysis"""
-        if limit:
-            return self.similarity_logs[-limit:]
-        return self.similarity_logs
+        """Get the most recent similarity logs kept in memory"""
+        return self.similarity_logs.get_logs(limit)
 
     def export_similarity_logs(self, filename: str):
-        """Export similarity logs to file"""
-        
-        
-        # Convert numpy datetime to string for JSON serialization
-        logs_for_export = []
-        for log in self.similarity_logs:
-            log_copy = log.copy()
-            if 'timestamp' in log_copy:
-                log_copy['timestamp'] = str(log_copy['timestamp'])
-            logs_for_export.append(log_copy)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(logs_for_export, f, indent=2, ensure_ascii=False)
-        
-        logging.info(f"Similarity logs exported to {filename}")
+        """Export similarity logs (JSONL) to file"""
+        self.similarity_logs.export(filename)
 
     def cache_llm_output(self, url, llm_data):
         """Cache LLM output data"""
-        self.llm_cache[url] = llm_data
-        
-        # Update category statistics
-        if isinstance(llm_data, dict) and 'category' in llm_data:
-            category = llm_data['category']
-            self.duplicate_stats['category_stats'][category] += 1
+        with self._lock:
+            self.llm_cache[url] = llm_data
+
+            # Update category statistics
+            if isinstance(llm_data, dict) and 'category' in llm_data:
+                category = llm_data['category']
+                self.duplicate_stats['category_stats'][category] += 1
 
     def get_cached_llm_output(self, url):
         """Get cached LLM output for a URL"""
-        return self.llm_cache.get(url, None)
+        with self._lock:
+            return self.llm_cache.get(url, None)
+
+    def get_embedding(self, url):
+        """Index'teki sayfa embedding'i (yoksa None)"""
+        with self._lock:
+            if url in self.embedding_storage:
+                return self.embedding_storage[url]
+            return None
+
+    def register_stats_provider(self, name, provider):
+        """provider() sonucu get_comprehensive_stats()[name] altında raporlanır"""
+        self._stats_providers[name] = provider
 
     def get_comprehensive_stats(self):
         """Get comprehensive statistics about similarity detection"""
-        unique_count = len(self.minhash_storage)
+        with self._lock:
+            stats = self._build_stats()
+        for name, provider in list(self._stats_providers.items()):
+            try:
+                stats[name] = provider()
+            except Exception as e:
+                stats[name] = {'error': str(e)}
+        return stats
+
+    def _build_stats(self):
+        unique_count = self.unique_total
         total_duplicates = self.duplicate_stats['total_duplicates']
         
         return {
             'unique_count': unique_count,
+            'indexed_count': len(self.minhash_storage),
+            'window_size': self.window_size,
+            'window_hours': self.window_hours,
+            'evicted_count': self.evicted_count,
             'total_duplicates': total_duplicates,
             'total_processed': unique_count + total_duplicates,
             'detection_methods': dict(self.duplicate_stats['detection_methods']),
@@ -318,7 +459,11 @@ class SimilarityChecker:
             'duplicate_rate': total_duplicates / (unique_count + total_duplicates) if (unique_count + total_duplicates) > 0 else 0,
             'embedding_enabled': self.embedding_enabled,
             'embedding_count': len(self.embedding_storage),
-            'similarity_logs_count': len(self.similarity_logs)
+            'embedding_storage_mode': self.embedding_storage.mode,
+            'embedding_storage_bytes': self.embedding_storage.nbytes,
+            'simhash_version': SIMHASH_VERSION,
+            'similarity_logs_count': self.similarity_logs.total_records,
+            'similarity_log_path': self.similarity_logs.path
         }
 
     def analyze_similarity_distribution(self):
@@ -328,26 +473,30 @@ class SimilarityChecker:
         embedding_similarities = []
         
         # Calculate all pairwise similarities (for analysis)
-        urls = list(self.minhash_storage.keys())
+        with self._lock:
+            minhash_storage = dict(self.minhash_storage)
+            simhash_storage = dict(self.simhash_storage.items())
+            embedding_storage = {url: self.embedding_storage[url] for url in self.embedding_storage.keys()}
+        urls = list(minhash_storage.keys())
         for i, url1 in enumerate(urls):
             for j, url2 in enumerate(urls[i+1:], i+1):
-                minhash1 = self.minhash_storage[url1]
-                minhash2 = self.minhash_storage[url2]
-                simhash1 = self.simhash_storage[url1]
-                simhash2 = self.simhash_storage[url2]
+                minhash1 = minhash_storage[url1]
+                minhash2 = minhash_storage[url2]
+                simhash1 = simhash_storage[url1]
+                simhash2 = simhash_storage[url2]
                 
                 minhash_sim = minhash1.jaccard(minhash2)
-                simhash_dist = simhash1.distance(simhash2)
+                simhash_dist = hamming_distance(simhash1, simhash2)
                 
                 minhash_similarities.append(minhash_sim)
                 simhash_distances.append(simhash_dist)
                 
                 # Calculate embedding similarity if available
                 if (self.embedding_enabled and 
-                    url1 in self.embedding_storage and 
-                    url2 in self.embedding_storage):
-                    embedding1 = self.embedding_storage[url1]
-                    embedding2 = self.embedding_storage[url2]
+                    url1 in embedding_storage and 
+                    url2 in embedding_storage):
+                    embedding1 = embedding_storage[url1]
+                    embedding2 = embedding_storage[url2]
                     embedding_sim = self.calculate_embedding_similarity(embedding1, embedding2)
                     embedding_similarities.append(embedding_sim)
         
@@ -373,25 +522,24 @@ class SimilarityChecker:
 
     def reset_stats(self):
         """Reset all statistics"""
-        self.duplicate_stats = {
-            'total_duplicates': 0,
-            'detection_methods': defaultdict(int),
-            'category_stats': defaultdict(int)
-        }
-        self.similarity_logs = []
+        with self._lock:
+            self.duplicate_stats = {
+                'total_duplicates': 0,
+                'detection_methods': defaultdict(int),
+                'category_stats': defaultdict(int)
+            }
+            self.similarity_logs.reset()
+
+    def close(self):
+        """Similarity log dosyasını kapat (çalıştırma sonunda çağrılır)"""
+        self.similarity_logs.close()
 
     def get_embedding_model_info(self):
         """Get information about the embedding model"""
-        if not self.embedding_enabled:
+        if not self.embedding_enabled or self.embedding_model is None:
             return {"enabled": False, "model": None, "error": "Model not loaded"}
         
         try:
-            model_info = {
-                "enabled": True,
-                "model_name": self.embedding_model.get_model_name() if hasattr(self.embedding_model, 'get_model_name') else "Unknown",
-                "max_seq_length": getattr(self.embedding_model, 'max_seq_length', 'Unknown'),
-                "embedding_dimension": self.embedding_model.get_sentence_embedding_dimension() if hasattr(self.embedding_model, 'get_sentence_embedding_dimension') else 'Unknown'
-            }
-            return model_info
+            return self.embedding_model.info()
         except Exception as e:
             return {"enabled": True, "model": "Loaded but info unavailable", "error": str(e)}
\ No newline at end of file
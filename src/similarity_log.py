@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import threading
+import logging
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def default_log_dir() -> str:
+    return os.path.join(os.path.expanduser('~'), '.cache', 'url_extractor', 'similarity_logs')
+
+
+def _close_log_file(file, delete_path: Optional[str]):
+    if not file.closed:
+        file.close()
+    if delete_path is not None:
+        try:
+            os.remove(delete_path)
+        except OSError:
+            pass
+
+
+class SimilarityLogSink:
+    """Similarity kayıtlarını JSONL olarak diske yazar, bellekte sadece son N kaydı tutar
+
+    Without an explicit path the log is a scratch file under
+    ~/.cache/url_extractor/similarity_logs that is deleted on close(); an
+    explicit path is kept. The file is also closed when the sink is garbage
+    collected or the interpreter exits.
+    """
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = 1000):
+        owned = path is None
+        if owned:
+            log_dir = default_log_dir()
+            os.makedirs(log_dir, exist_ok=True)
+            path = os.path.join(log_dir, f"similarity_logs_{os.getpid()}_{id(self):x}.jsonl")
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = deque(maxlen=buffer_size)
+        self.total_records = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'w' if owned else 'a', encoding='utf-8')
+        self._finalizer = weakref.finalize(self, _close_log_file, self._file, path if owned else None)
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def write(self, record: Dict):
+        """Append one record to the JSONL file and the in-memory ring buffer"""
+        record = dict(record)
+        record.setdefault('timestamp', datetime.now().isoformat(timespec='seconds'))
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.buffer.append(record)
+            self.total_records += 1
+
+    def get_logs(self, limit: Optional[int] = None) -> List[Dict]:
+        """Return the most recent buffered records (oldest first)"""
+        with self._lock:
+            logs = list(self.buffer)
+        if limit:
+            return logs[-limit:]
+        return logs
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def export(self, filename: str):
+        """Copy the JSONL log file to the given location"""
+        self.flush()
+        if os.path.abspath(filename) != os.path.abspath(self.path):
+            shutil.copyfile(self.path, filename)
+        logging.info(f"Similarity logs exported to {filename}")
+
+    def reset(self):
+        """Clear the ring buffer and truncate the log file"""
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+            self.buffer.clear()
+            self.total_records = 0
+
+    def close(self):
+        """Dosyayı kapat; varsayılan (scratch) log dosyası silinir"""
+        with self._lock:
+            self._finalizer()
@@ -0,0 +1,79 @@
+"""Sonuç başına aşama zamanlayıcısı
+
+A StageTimer adds the wall time of each `with timer.stage(name):` block to a
+{stage: seconds} dict that is stored on the result as result['timings'].
+When timing is disabled the code uses NULL_TIMER, whose stage() returns one
+shared no-op context manager: no clock reads and no allocations.
+"""
+from time import perf_counter
+from typing import Dict, Optional
+
+# Sabit sıra: rapor / CSV sütunları bu sırayla yazılır
+TIMING_STAGES = (
+    'fetch', 'parse', 'clean',
+    'minhash', 'simhash', 'embedding',
+    'minhash_search', 'simhash_search', 'embedding_search', 'index_insert',
+    'dedupe_remote', 'llm'
+)
+
+
+class _Span:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = perf_counter() - self.start
+        self.timings[self.name] = self.timings.get(self.name, 0.0) + elapsed
+        return False
+
+
+class StageTimer:
+    """Aşama sürelerini (saniye) timings sözlüğüne toplar; aynı aşama tekrar ölçülürse eklenir"""
+
+    enabled = True
+
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        self.timings = {} if timings is None else timings
+
+    def stage(self, name: str) -> _Span:
+        return _Span(self.timings, name)
+
+    def add(self, name: str, seconds: float):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NullTimer:
+    """Zamanlama kapalıyken kullanılan boş zamanlayıcı"""
+
+    enabled = False
+    _span = _NullSpan()
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        return {}
+
+    def stage(self, name: str) -> _NullSpan:
+        return self._span
+
+    def add(self, name: str, seconds: float):
+        pass
+
+
+NULL_TIMER = NullTimer()
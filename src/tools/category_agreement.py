@@ -0,0 +1,75 @@
+"""Embedding kategori sınıflandırıcısının LLM etiketleriyle uyum raporu
+
+Runs EmbeddingCategoryClassifier on a labeled sample (for example an
+extractor CSV whose `category` column came from the LLM) and reports accuracy
+and coverage per margin threshold, so margin_threshold can be picked.
+
+Usage (from src/):
+    python -m tools.category_agreement results.csv --limit 2000 --categories categories.csv
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+from category_classifier import EmbeddingCategoryClassifier
+from embedding_backend import EMBEDDING_BACKENDS, create_embedding_backend
+from file_handler import FileHandler
+
+
+def load_labeled_documents(path, limit=None):
+    """Read (title, content, category) rows from an extractor CSV or a JSONL file"""
+    documents = []
+    csv.field_size_limit(sys.maxsize)
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if path.lower().endswith('.csv'):
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            label = record.get('category') or record.get('label') or ''
+            # Duplicate satırları ve sınıflandırılamayanları atla
+            if str(record.get('is_duplicate', '')).lower() == 'true' or label in ('', 'Unknown', '(unknown)'):
+                continue
+            documents.append((record.get('title', ''), record.get('content', ''), label))
+            if limit and len(documents) >= limit:
+                break
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agreement of the embedding category classifier with labeled pages")
+    parser.add_argument('input', help="Extractor CSV or JSONL with title, content and category fields")
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--categories', help="Categories CSV (name, description); defaults to the LLM prompt taxonomy")
+    parser.add_argument('--backend', default='sentence-transformers', choices=sorted(EMBEDDING_BACKENDS))
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--thresholds', default='0,0.02,0.05,0.1,0.15', help="Comma separated margin thresholds")
+    parser.add_argument('--json', dest='json_path', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    samples = load_labeled_documents(args.input, args.limit)
+    categories = FileHandler().read_categories_from_csv(args.categories) if args.categories else None
+    classifier = EmbeddingCategoryClassifier(create_embedding_backend(args.backend, args.model), categories)
+
+    start = time.perf_counter()
+    report = classifier.agreement_report(samples, [float(t) for t in args.thresholds.split(',')])
+    elapsed = time.perf_counter() - start
+    report['seconds_per_page'] = elapsed / max(len(samples), 1)
+
+    print(f"{report['samples']} labeled pages, accuracy {report.get('accuracy', 0):.3f}, "
+          f"{report['seconds_per_page'] * 1000:.1f} ms/page")
+    for row in report.get('by_threshold', []):
+        print(f"  margin >= {row['margin_threshold']:.2f}: coverage {row['coverage']:.1%}, accuracy {row['accuracy']:.3f}")
+    for confusion in report.get('top_confusions', []):
+        print(f"  {confusion['label']} -> {confusion['predicted']}: {confusion['count']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Embedding backend benchmark: docs/sec ve benzerlik uyumu
+
+Compares each backend against the current production path (stock
+SentenceTransformer on the cleaned text cut at 5000 characters): throughput
+in docs/sec and cosine parity of the produced embeddings.
+
+Usage (from src/):
+    python -m tools.embedding_backend_benchmark results.csv --limit 500 \\
+        --backend sentence-transformers --backend onnx:num_threads=4,quantize=true
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from embedding_backend import create_embedding_backend
+from similarity_checker import SimilarityChecker
+from tools.embedding_quantization_report import load_documents
+
+
+def parse_backend_spec(spec):
+    """'onnx:num_threads=4,quantize=false' -> ('onnx', {'num_threads': 4, 'quantize': False})"""
+    name, _, raw_options = spec.partition(':')
+    options = {}
+    for item in filter(None, raw_options.split(',')):
+        key, _, value = item.partition('=')
+        if value.lower() in ('true', 'false'):
+            options[key] = value.lower() == 'true'
+        elif value.isdigit():
+            options[key] = int(value)
+        else:
+            options[key] = value
+    return name, options
+
+
+def time_encoding(encode, texts, batch=False):
+    start = time.perf_counter()
+    if batch:
+        embeddings = np.asarray(encode(texts))
+    else:
+        embeddings = np.vstack([encode(text) for text in texts])
+    elapsed = time.perf_counter() - start
+    return embeddings, elapsed
+
+
+def parity(reference, candidate):
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = np.sum(reference * candidate, axis=1)
+    return {'mean_cosine': float(cosines.mean()), 'min_cosine': float(cosines.min())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends against the current model")
+    parser.add_argument('input', help="Extractor CSV, JSONL (title/content) or text file with one document per line")
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--backend', action='append', default=[],
+                        help="Backend spec name[:key=value,...]; may be given multiple times")
+    parser.add_argument('--json', dest='json_path', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Metinler pipeline'daki gibi temizlenir
+    texts = [SimilarityChecker.clean_text(f"{title} {content}")
+             for title, content in load_documents(args.input, args.limit)]
+    if not texts:
+        print("No documents found")
+        return 1
+
+    from sentence_transformers import SentenceTransformer
+    legacy_model = SentenceTransformer(args.model)
+    reference, elapsed = time_encoding(lambda text: legacy_model.encode(text[:5000]), texts)
+    results = {'documents': len(texts), 'baseline': {'docs_per_sec': len(texts) / elapsed}}
+    print(f"{'baseline (stock, 5000 chars)':<40} {len(texts) / elapsed:8.1f} docs/sec")
+
+    for spec in args.backend or ['sentence-transformers']:
+        name, options = parse_backend_spec(spec)
+        backend = create_embedding_backend(name, args.model, **options)
+        single, single_elapsed = time_encoding(backend.encode, texts)
+        _, batch_elapsed = time_encoding(backend.encode_batch, texts, batch=True)
+        results[spec] = {
+            'docs_per_sec': len(texts) / single_elapsed,
+            'batch_docs_per_sec': len(texts) / batch_elapsed,
+            **parity(reference, single)
+        }
+        row = results[spec]
+        print(f"{spec:<40} {row['docs_per_sec']:8.1f} docs/sec | batch {row['batch_docs_per_sec']:8.1f} docs/sec"
+              f" | cosine vs baseline mean={row['mean_cosine']:.4f} min={row['min_cosine']:.4f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Quantized embedding storage için doğruluk raporu
+
+Compares embedding_max_similarity computed on float16 / int8 indexes against
+the float32 reference, replaying a sample of documents in order exactly as
+SimilarityChecker.is_duplicate_comprehensive would. It also reports the
+search time per query: quantized modes score the stored rows directly (int8
+also quantizes the query), which saves memory but is slower per query than
+float32 BLAS.
+
+Usage (from src/):
+    python -m tools.embedding_quantization_report results.csv --limit 2000
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+import numpy as np
+
+from embedding_index import EmbeddingIndex
+from similarity_checker import SimilarityChecker
+
+
+def load_documents(path, limit=None):
+    """Read (title, content) pairs from an extractor CSV, a JSONL file or a plain text file"""
+    documents = []
+    csv.field_size_limit(sys.maxsize)
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if path.lower().endswith('.csv'):
+            for row in csv.DictReader(f):
+                documents.append((row.get('title', ''), row.get('content', '')))
+                if limit and len(documents) >= limit:
+                    break
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if path.lower().endswith('.jsonl'):
+                    record = json.loads(line)
+                    documents.append((record.get('title', ''), record.get('content', '')))
+                else:
+                    documents.append(('', line))
+                if limit and len(documents) >= limit:
+                    break
+    return documents
+
+
+def build_report(embeddings, threshold, modes=('float16', 'int8')):
+    """Replay embeddings through each index mode and measure drift against float32"""
+    reference = EmbeddingIndex('float32')
+    candidates = {mode: EmbeddingIndex(mode) for mode in modes}
+    reference_scores = []
+    candidate_scores = {mode: [] for mode in modes}
+    search_seconds = {mode: 0.0 for mode in ('float32',) + tuple(modes)}
+
+    for i, embedding in enumerate(embeddings):
+        url = f"doc-{i}"
+        start = time.perf_counter()
+        reference_scores.append(reference.search(embedding)[1])
+        search_seconds['float32'] += time.perf_counter() - start
+        reference.add(url, embedding)
+        for mode, index in candidates.items():
+            start = time.perf_counter()
+            candidate_scores[mode].append(index.search(embedding)[1])
+            search_seconds[mode] += time.perf_counter() - start
+            index.add(url, embedding)
+
+    reference_scores = np.asarray(reference_scores, dtype=np.float64)
+    reference_duplicates = reference_scores >= threshold
+    count = max(len(reference), 1)
+
+    report = {
+        'documents': len(reference),
+        'threshold': threshold,
+        'modes': {
+            'float32': {'bytes_per_document': reference.nbytes / count,
+                        'search_ms_per_query': search_seconds['float32'] * 1000 / count}
+        }
+    }
+    for mode, index in candidates.items():
+        scores = np.asarray(candidate_scores[mode], dtype=np.float64)
+        drift = np.abs(scores - reference_scores)
+        duplicates = scores >= threshold
+        report['modes'][mode] = {
+            'bytes_per_document': index.nbytes / count,
+            'search_ms_per_query': search_seconds[mode] * 1000 / count,
+            'mean_abs_drift': float(drift.mean()) if drift.size else 0.0,
+            'p95_abs_drift': float(np.percentile(drift, 95)) if drift.size else 0.0,
+            'max_abs_drift': float(drift.max()) if drift.size else 0.0,
+            'decision_flips': int(np.count_nonzero(duplicates != reference_duplicates)),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report embedding_max_similarity drift of quantized storage modes")
+    parser.add_argument('input', help="Extractor CSV, JSONL (title/content) or text file with one document per line")
+    parser.add_argument('--limit', type=int, default=1000, help="Number of documents to sample")
+    parser.add_argument('--threshold', type=float, default=0.8, help="Embedding duplicate threshold")
+    parser.add_argument('--json', dest='json_path', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    documents = load_documents(args.input, args.limit)
+    checker = SimilarityChecker(threshold_embedding=args.threshold)
+    if checker.embedding_model is None:
+        print("Embedding model could not be loaded")
+        return 1
+
+    start = time.time()
+    embeddings = [checker.create_embedding(f"{title} {content}") for title, content in documents]
+    embeddings = [e for e in embeddings if e is not None]
+    print(f"Embedded {len(embeddings)} documents in {time.time() - start:.1f}s")
+
+    report = build_report(embeddings, args.threshold)
+    for mode, values in report['modes'].items():
+        line = f"{mode:>8}: {values['bytes_per_document']:.0f} bytes/doc | search {values['search_ms_per_query']:.3f} ms"
+        if 'mean_abs_drift' in values:
+            line += (f" | drift mean={values['mean_abs_drift']:.5f} p95={values['p95_abs_drift']:.5f}"
+                     f" max={values['max_abs_drift']:.5f} | decision flips @{args.threshold}: {values['decision_flips']}")
+        print(line)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
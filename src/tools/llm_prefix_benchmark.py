@@ -0,0 +1,63 @@
+"""Sabit prompt başlığının (prefix) yeniden kullanımı için Ollama benchmark'ı
+
+Classifies the same pages with the plain /api/generate prompt and with the
+chat mode (static system header + per-page message), without the result
+cache, and compares Ollama's prompt_eval / eval timings. A much lower
+prompt_eval_count in chat mode means the header came from the prompt cache.
+
+Usage (from src/):
+    python -m tools.llm_prefix_benchmark results.csv --limit 50 --model llama3
+"""
+import argparse
+import json
+import sys
+
+from llm_classifier import LLMClassifier
+from tools.embedding_quantization_report import load_documents
+
+
+def run_mode(documents, prompt_mode, args):
+    classifier = LLMClassifier(model=args.model, base_url=args.base_url, use_cache=False,
+                               timeout=args.timeout, keep_alive=args.keep_alive, prompt_mode=prompt_mode)
+    if not classifier.is_llm_available(force=True):
+        raise RuntimeError(f"Model '{args.model}' is not available at {args.base_url}")
+    classifier.warm_up()
+    for title, content in documents:
+        classifier.classify_text(title, content, [])
+    return classifier.get_stats()
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else '--'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare prompt-eval time of the generate and chat prompt modes")
+    parser.add_argument('input', help="Extractor CSV, JSONL (title/content) or text file with one document per line")
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--model', default='llama3')
+    parser.add_argument('--base-url', default='http://localhost:11434')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--keep-alive', default='30m')
+    parser.add_argument('--json', dest='json_path', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    documents = load_documents(args.input, args.limit)
+    report = {'documents': len(documents), 'modes': {}}
+    for prompt_mode in ('generate', 'chat'):
+        stats = run_mode(documents, prompt_mode, args)
+        report['modes'][prompt_mode] = stats
+        # Kayıt yoksa (boş girdi) get_stats bu alanları döndürmez
+        print(f"{prompt_mode:>8}: {stats['requests']} requests | "
+              f"prompt_eval {_fmt(stats.get('avg_prompt_eval_count'), '.0f')} tokens / "
+              f"{_fmt(stats.get('avg_prompt_eval_ms'), '.0f')} ms | eval {_fmt(stats.get('avg_eval_ms'), '.0f')} ms | "
+              f"latency avg {_fmt(stats.get('avg_latency'), '.2f')}s p95 {_fmt(stats.get('p95_latency'), '.2f')}s")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Çıktı formatlarının yazma hızı ve dosya boyutu karşılaştırması
+
+Replays rows from an extractor output file through every output sink
+(CSV, compressed CSV, JSONL, Parquet when pyarrow is installed) and reports
+rows/sec and bytes per row.
+
+Usage (from src/):
+    python -m tools.output_sink_benchmark results.csv --rows 200000 --content-mode truncate
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+
+from output_sinks import CONTENT_MODES, create_sink, pa, zstandard
+
+
+def load_results(path, limit=None):
+    """Extractor çıktısını (CSV / JSONL) tekrar result dict'lerine çevir"""
+    results = []
+    csv.field_size_limit(sys.maxsize)
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        records = csv.DictReader(f) if path.lower().endswith('.csv') else (json.loads(l) for l in f if l.strip())
+        for record in records:
+            simhash_score = record.get('simhash_score')
+            results.append({
+                'url': record.get('url', ''),
+                'title': record.get('title', ''),
+                'content': record.get('content', ''),
+                'child_category': record.get('category', ''),
+                'summary': record.get('summary', ''),
+                'minhash_similarity': float(record['minhash_score']) if record.get('minhash_score') not in (None, '') else None,
+                'simhash_distance': round((1 - float(simhash_score)) * 64) if simhash_score not in (None, '') else None,
+                'embedding_similarity': float(record['embedding_score']) if record.get('embedding_score') not in (None, '') else None,
+                'is_duplicate': str(record.get('is_duplicate', '')).lower() == 'true',
+                'duplicate_info': {'original_url': record['duplicate_of']} if record.get('duplicate_of') else {}
+            })
+            if limit and len(results) >= limit:
+                break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare write throughput and size of the output sinks")
+    parser.add_argument('input', help="Extractor output (CSV or JSONL)")
+    parser.add_argument('--rows', type=int, default=100000, help="Rows to write (input rows are repeated)")
+    parser.add_argument('--content-mode', default='full', choices=CONTENT_MODES)
+    parser.add_argument('--content-chars', type=int, default=1000)
+    parser.add_argument('--json', dest='json_path', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    sample = load_results(args.input, args.rows)
+    if not sample:
+        print("No rows in input")
+        return 1
+    results = [sample[i % len(sample)] for i in range(args.rows)]
+
+    targets = ['results.csv', 'results.csv.gz', 'results.jsonl', 'results.jsonl.gz']
+    if zstandard is not None:
+        targets += ['results.csv.zst', 'results.jsonl.zst']
+    if pa is not None:
+        targets.append('results.parquet')
+
+    report = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in targets:
+            path = os.path.join(tmp, name)
+            with create_sink(path, content_mode=args.content_mode, content_chars=args.content_chars) as sink:
+                sink.write_many(results)
+            stats = sink.stats()
+            stats['target'] = name
+            report.append(stats)
+            print(f"{name:>18}: {stats['rows_per_sec']:>10.0f} rows/sec | "
+                  f"{stats['bytes'] / 1024 / 1024:>8.1f} MB | {stats['bytes_per_row']:.0f} bytes/row")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""NumPy SimHash builder ile simhash kütüphanesinin karşılaştırması
+
+Checks that SimHashBuilder produces the same fingerprints as simhash.Simhash
+on a document sample and reports the speedup.
+
+Usage (from src/):
+    python -m tools.simhash_parity results.csv --limit 5000
+"""
+import argparse
+import sys
+import time
+
+from simhash import Simhash
+
+from similarity_checker import SimilarityChecker
+from simhash_index import SimHashBuilder, SIMHASH_VERSION
+from tools.embedding_quantization_report import load_documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare vectorized SimHash fingerprints with simhash.Simhash")
+    parser.add_argument('input', help="Extractor CSV, JSONL (title/content) or text file with one document per line")
+    parser.add_argument('--limit', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    texts = [SimilarityChecker.clean_text(f"{title} {content}", remove_stopwords=True)
+             for title, content in load_documents(args.input, args.limit)]
+
+    start = time.perf_counter()
+    reference = [Simhash(text).value for text in texts]
+    library_elapsed = time.perf_counter() - start
+
+    builder = SimHashBuilder()
+    start = time.perf_counter()
+    fingerprints = []
+    for offset in range(0, len(texts), args.batch_size):
+        fingerprints.extend(int(v) for v in builder.fingerprint_texts(texts[offset:offset + args.batch_size]))
+    builder_elapsed = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(reference, fingerprints) if a != b)
+    print(f"SimHash version {SIMHASH_VERSION}: {len(texts)} documents, {mismatches} mismatches")
+    print(f"simhash.Simhash: {len(texts) / max(library_elapsed, 1e-9):.0f} docs/sec")
+    print(f"SimHashBuilder:  {len(texts) / max(builder_elapsed, 1e-9):.0f} docs/sec")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""SimilarityChecker micro-benchmark: sentetik near-duplicate korpusu
+
+Generates a reproducible corpus in which a controlled fraction of documents
+are near-duplicates of earlier originals, each produced with a word-level
+edit rate (substitutions, insertions, deletions) taken from --edit-rates.
+For every corpus size it measures:
+
+    signatures   create_minhash / create_simhash / create_embedding on a sample
+                 (docs/sec, per-call p50/p95/p99)
+    dedupe       is_duplicate_comprehensive over the whole corpus
+                 (docs/sec, per-query latency, docs/sec as the index grows)
+    memory       index sizes, peak RSS and optionally the tracemalloc peak
+    quality      precision / recall / F1 against the ground truth, recall per
+                 edit rate and whether the reported original is the right one
+
+The default 'hashing' embedding backend needs no model download; pass
+--backend sentence-transformers to benchmark the real model. Results are
+written as JSON; --baseline prints the change against an earlier run.
+
+Usage (from src/):
+    python -m tools.similarity_benchmark --sizes 1000,10000 --json bench.json
+    python -m tools.similarity_benchmark --sizes 1000,10000,100000,1000000 --max-seconds 600 \\
+        --json bench_new.json --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from itertools import islice
+from types import SimpleNamespace
+
+from profiling import storage_sizes
+from run_summary import LatencyHistogram
+from similarity_checker import SimilarityChecker
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def build_vocabulary(size, seed):
+    """Tekrarsız sahte kelimeler (3-10 harf)
+
+    The full alphabet keeps character shingles diverse; a small alphabet makes
+    unrelated documents look alike to SimHash and MinHash.
+    """
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 10))))
+    return sorted(words)
+
+
+class SyntheticCorpus:
+    """Kontrollü near-duplicate oranına sahip tekrarlanabilir korpus
+
+    Iterating yields (url, title, content, original_index, edit_rate) where
+    original_index is None for originals. Original i is regenerated from
+    (seed, i) when a duplicate of it is needed, so only the list of original
+    indexes is kept in memory, not the texts.
+    """
+
+    def __init__(self, size, duplicate_rate=0.2, edit_rates=(0.05,), doc_words=300, vocab_size=20000,
+                 zipf_exponent=0.5, seed=42):
+        self.size = size
+        self.duplicate_rate = duplicate_rate
+        self.edit_rates = tuple(edit_rates)
+        self.doc_words = doc_words
+        self.seed = seed
+        self.vocabulary = build_vocabulary(vocab_size, seed)
+        # Zipf dağılımı: sık kelimeler ilgisiz dokümanlar arasında da ortak olur.
+        # Exponent ~1 makes unrelated documents share so many words that SimHash
+        # distances fall under the default threshold (a stress setting).
+        total = 0.0
+        self._cum_weights = []
+        for rank in range(1, vocab_size + 1):
+            total += 1.0 / rank ** zipf_exponent
+            self._cum_weights.append(total)
+
+    def url(self, index):
+        return f"https://bench.example/doc/{index}"
+
+    def _original_words(self, index):
+        rng = random.Random((self.seed << 32) | index)
+        length = rng.randint(self.doc_words // 2, self.doc_words * 3 // 2)
+        return rng.choices(self.vocabulary, cum_weights=self._cum_weights, k=length)
+
+    def _edit(self, words, edit_rate, rng):
+        edited = []
+        for word in words:
+            if rng.random() >= edit_rate:
+                edited.append(word)
+                continue
+            operation = rng.randrange(3)
+            if operation == 0:  # substitute
+                edited.append(rng.choices(self.vocabulary, cum_weights=self._cum_weights)[0])
+            elif operation == 1:  # insert
+                edited.append(word)
+                edited.append(rng.choices(self.vocabulary, cum_weights=self._cum_weights)[0])
+            # operation == 2: delete
+        return edited
+
+    @staticmethod
+    def _document(words):
+        return ' '.join(words[:8]).capitalize(), ' '.join(words[8:])
+
+    def __iter__(self):
+        rng = random.Random(self.seed)
+        originals = array('q')
+        for index in range(self.size):
+            if originals and rng.random() < self.duplicate_rate:
+                original = originals[rng.randrange(len(originals))]
+                edit_rate = rng.choice(self.edit_rates)
+                words = self._edit(self._original_words(original), edit_rate, rng)
+                title, content = self._document(words)
+                yield self.url(index), title, content, original, edit_rate
+            else:
+                originals.append(index)
+                title, content = self._document(self._original_words(index))
+                yield self.url(index), title, content, None, None
+
+
+def latency_stats(histogram, elapsed, count):
+    stats = histogram.stats()
+    return {
+        'count': count,
+        'docs_per_sec': count / elapsed if elapsed > 0 else None,
+        'latency_ms': {key: (stats[key] * 1000 if stats[key] is not None else None)
+                       for key in ('mean', 'p50', 'p95', 'p99', 'max')}
+    }
+
+
+def bench_signatures(checker, corpus, sample):
+    """İmza fonksiyonlarını örneklem üzerinde tek tek ölç"""
+    texts = [f"{title} {content}" for _, title, content, _, _ in islice(corpus, sample)]
+    functions = {
+        'create_minhash': checker.create_minhash,
+        'create_simhash': checker.create_simhash,
+        'create_embedding': checker.create_embedding,
+    }
+    results = {}
+    for name, function in functions.items():
+        histogram = LatencyHistogram(min_value=1e-6)
+        start = time.perf_counter()
+        for text in texts:
+            call_start = time.perf_counter()
+            function(text)
+            histogram.add(time.perf_counter() - call_start)
+        results[name] = latency_stats(histogram, time.perf_counter() - start, len(texts))
+    return results
+
+
+def bench_dedupe(checker, corpus, max_seconds=None, checkpoints=10, trace_memory=False):
+    """is_duplicate_comprehensive'i tüm korpus üzerinde çalıştır, ground truth ile karşılaştır"""
+    histogram = LatencyHistogram(min_value=1e-6)
+    counts = {'tp': 0, 'fp': 0, 'fn': 0, 'tn': 0}
+    correct_original = 0
+    methods = {}
+    per_edit_rate = {}
+    growth = []
+    checkpoint_every = max(1, corpus.size // checkpoints)
+
+    if trace_memory:
+        tracemalloc.start()
+    processed = 0
+    truncated = False
+    start = chunk_start = time.perf_counter()
+    for url, title, content, original, edit_rate in corpus:
+        call_start = time.perf_counter()
+        is_duplicate, info, _ = checker.is_duplicate_comprehensive(url, title, content)
+        histogram.add(time.perf_counter() - call_start)
+        processed += 1
+
+        expected = original is not None
+        if is_duplicate:
+            methods[info['method']] = methods.get(info['method'], 0) + 1
+        if expected:
+            bucket = per_edit_rate.setdefault(str(edit_rate), {'duplicates': 0, 'detected': 0})
+            bucket['duplicates'] += 1
+            if is_duplicate:
+                bucket['detected'] += 1
+                counts['tp'] += 1
+                correct_original += info.get('original_url') == corpus.url(original)
+            else:
+                counts['fn'] += 1
+        else:
+            counts['fp' if is_duplicate else 'tn'] += 1
+
+        if processed % checkpoint_every == 0:
+            now = time.perf_counter()
+            growth.append({
+                'processed': processed,
+                'index_size': checker.unique_total,
+                'docs_per_sec': checkpoint_every / (now - chunk_start)
+            })
+            chunk_start = now
+        if max_seconds and time.perf_counter() - start > max_seconds:
+            truncated = processed < corpus.size
+            break
+    elapsed = time.perf_counter() - start
+
+    memory = {'indexes': storage_sizes(SimpleNamespace(similarity_checker=checker, llm_classifier=None))}
+    if trace_memory:
+        memory['tracemalloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+    if resource is not None:
+        # Linux'ta KB; süreç boyunca en yüksek değer (önceki boyutları da kapsar)
+        memory['rss_peak_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    tp, fp, fn = counts['tp'], counts['fp'], counts['fn']
+    precision = tp / (tp + fp) if tp + fp else None
+    recall = tp / (tp + fn) if tp + fn else None
+    f1 = 2 * precision * recall / (precision + recall) if precision and recall else None
+    for bucket in per_edit_rate.values():
+        bucket['recall'] = bucket['detected'] / bucket['duplicates']
+
+    return {
+        'processed': processed,
+        'truncated': truncated,
+        'elapsed_seconds': elapsed,
+        **latency_stats(histogram, elapsed, processed),
+        'growth': growth,
+        'memory': memory,
+        'quality': {
+            **counts,
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'original_match_rate': correct_original / tp if tp else None,
+            'recall_by_edit_rate': per_edit_rate,
+            'detection_methods': methods
+        }
+    }
+
+
+def run_size(args, size):
+    corpus = SyntheticCorpus(size, duplicate_rate=args.dup_rate, edit_rates=args.edit_rates,
+                             doc_words=args.doc_words, vocab_size=args.vocab_size, zipf_exponent=args.zipf,
+                             seed=args.seed)
+    log_dir = tempfile.mkdtemp(prefix='similarity_bench_')
+    try:
+        checker = SimilarityChecker(
+            embedding_backend=args.backend, embedding_model_name=args.model,
+            embedding_storage_mode=args.storage_mode,
+            similarity_log_path=os.path.join(log_dir, 'similarity_logs.jsonl')
+        )
+        if checker.embedding_model is None:
+            raise RuntimeError(f"Embedding backend '{args.backend}' could not be loaded")
+        result = {'size': size, 'signatures': bench_signatures(checker, corpus, min(size, args.micro_sample))}
+        result['dedupe'] = bench_dedupe(checker, corpus, args.max_seconds, trace_memory=args.trace_memory)
+        checker.similarity_logs.close()
+        return result
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def _fmt(value, spec):
+    return format(value, spec) if value is not None else '--'
+
+
+def print_run(run, baseline=None):
+    dedupe = run['dedupe']
+    quality = dedupe['quality']
+    suffix = " (truncated)" if dedupe['truncated'] else ""
+    print(f"\n=== {run['size']} documents: {dedupe['processed']} processed{suffix} ===")
+    for name, stats in run['signatures'].items():
+        print(f"  {name:<26} {_fmt(stats['docs_per_sec'], '10.1f')} docs/sec | "
+              f"p50 {_fmt(stats['latency_ms']['p50'], '.3f')} ms | p95 {_fmt(stats['latency_ms']['p95'], '.3f')} ms")
+    print(f"  {'is_duplicate_comprehensive':<26} {_fmt(dedupe['docs_per_sec'], '10.1f')} docs/sec | "
+          f"p50 {_fmt(dedupe['latency_ms']['p50'], '.3f')} ms | p95 {_fmt(dedupe['latency_ms']['p95'], '.3f')} ms"
+          f" | p99 {_fmt(dedupe['latency_ms']['p99'], '.3f')} ms")
+    if dedupe['growth']:
+        last = dedupe['growth'][-1]
+        print(f"  at index size {last['index_size']}: {last['docs_per_sec']:.1f} docs/sec")
+    print(f"  precision {_fmt(quality['precision'], '.4f')} | recall {_fmt(quality['recall'], '.4f')} | "
+          f"F1 {_fmt(quality['f1'], '.4f')} | correct original {_fmt(quality['original_match_rate'], '.4f')}")
+    for rate, bucket in sorted(quality['recall_by_edit_rate'].items(), key=lambda item: float(item[0])):
+        print(f"    edit rate {rate}: recall {bucket['recall']:.4f} ({bucket['detected']}/{bucket['duplicates']})")
+    index_bytes = sum(size.get('bytes', 0) for size in dedupe['memory']['indexes'].values())
+    print(f"  index memory {index_bytes / 1024 / 1024:.1f} MB | peak RSS "
+          f"{_fmt(dedupe['memory'].get('rss_peak_mb'), '.1f')} MB")
+
+    if baseline is None:
+        return
+    before = baseline['dedupe']
+    print(f"  vs baseline: docs/sec {_fmt(before['docs_per_sec'], '.1f')} -> {_fmt(dedupe['docs_per_sec'], '.1f')}"
+          f" | p95 {_fmt(before['latency_ms']['p95'], '.3f')} -> {_fmt(dedupe['latency_ms']['p95'], '.3f')} ms"
+          f" | F1 {_fmt(before['quality']['f1'], '.4f')} -> {_fmt(quality['f1'], '.4f')}")
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SimilarityChecker on a synthetic near-duplicate corpus")
+    parser.add_argument('--sizes', default='1000,10000', type=lambda v: parse_list(v, int),
+                        help="Comma-separated corpus sizes, e.g. 1000,10000,100000,1000000")
+    parser.add_argument('--dup-rate', type=float, default=0.2, help="Fraction of documents that are near-duplicates")
+    parser.add_argument('--edit-rates', default='0.02,0.05,0.1,0.2', type=lambda v: parse_list(v, float),
+                        help="Word edit rates; each near-duplicate picks one at random")
+    parser.add_argument('--doc-words', type=int, default=300, help="Average words per document")
+    parser.add_argument('--vocab-size', type=int, default=20000)
+    parser.add_argument('--zipf', type=float, default=0.5,
+                        help="Zipf exponent of word frequencies; higher values make unrelated documents more alike")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--backend', default='hashing', help="Embedding backend (hashing needs no model)")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2', help="Model name for model-based backends")
+    parser.add_argument('--storage-mode', default='float32', help="Embedding storage mode (float32, float16, int8)")
+    parser.add_argument('--micro-sample', type=int, default=1000,
+                        help="Documents used for the per-function signature benchmarks")
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help="Stop the dedupe pass of a size after this many seconds (reported as truncated)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Measure the tracemalloc peak of the dedupe pass (slows it down)")
+    parser.add_argument('--json', dest='json_path', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    baseline_runs = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline_runs = {run['size']: run for run in json.load(f).get('runs', [])}
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {key: value for key, value in vars(args).items() if key not in ('json_path', 'baseline')},
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'runs': []
+    }
+    for size in args.sizes:
+        run = run_size(args, size)
+        report['runs'].append(run)
+        print_run(run, baseline_runs.get(size))
+        if args.json_path:
+            # Her boyuttan sonra yaz: uzun çalıştırma yarıda kesilirse de sonuçlar kalır
+            with open(args.json_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+"""Testler için tekrarlanabilir sahte dokümanlar
+
+make_documents returns (url, title, content) tuples; a duplicate_rate share
+of them are near-duplicates of an earlier document with edit_rate of the
+words replaced. The uniform vocabulary keeps unrelated documents far apart
+for MinHash, SimHash and the hashing embedding.
+"""
+import random
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def make_documents(count, duplicate_rate=0.0, edit_rate=0.02, words=120, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 10))) for _ in range(5000)]
+    originals = []
+    documents = []
+    for index in range(count):
+        if originals and rng.random() < duplicate_rate:
+            body = [word if rng.random() >= edit_rate else rng.choice(vocabulary) for word in rng.choice(originals)]
+        else:
+            body = [rng.choice(vocabulary) for _ in range(words)]
+            originals.append(body)
+        documents.append((f"https://docs.example/{index}", ' '.join(body[:8]).capitalize(), ' '.join(body[8:])))
+    return documents
@@ -0,0 +1,26 @@
+"""Ağa çıkmayan Goose yerine geçen sahte extractor
+
+/page/<n> returns a fixed page; an odd n is a near-duplicate of page n-1.
+URLs containing 'down' raise a connection error.
+"""
+
+
+class FakeArticle:
+    def __init__(self, title, cleaned_text):
+        self.title = title
+        self.cleaned_text = cleaned_text
+
+
+class FakeGoose:
+    def extract(self, url, raw_html=None):
+        if 'down' in url:
+            raise ConnectionError("connection refused")
+        number = int(url.rstrip('/').rsplit('/', 1)[1])
+        original = number - number % 2
+        words = [f"topic{original}word{i % 37}" for i in range(120)]
+        if number % 2:
+            words[3] = 'changed'
+        return FakeArticle(f"Page {original}", ' '.join(words))
+
+    def close(self):
+        pass
@@ -0,0 +1,143 @@
+"""Testler için yerel, sahte Ollama sunucusu
+
+Answers /api/tags, /api/generate and /api/chat. Single-page prompts get a
+"Category / Summary / <END>" reply naming the page title, batch (format=json)
+prompts get one JSON result per "[n] Title:" line. Every request body is
+recorded; delay, failing status codes and the reply text can be changed per
+test.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class OllamaStub:
+    def __init__(self, models=('llama3:latest',), category='News and Media'):
+        self.models = list(models)
+        self.category = category
+        self.delay = 0.0
+        self.stream_chunk_delay = 0.002
+        # Sıradaki isteklere dönülecek HTTP hata kodları (ör. [503, 503])
+        self.fail_statuses = []
+        # reply(path, body, prompt) -> str; None ise varsayılan yanıt
+        self.reply = None
+        self.requests = []
+        self.tag_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.streamed_chars = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        stub = self
+
+        class Handler(_Handler):
+            service = stub
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def default_reply(self, body, prompt):
+        if body.get('format') == 'json':
+            pages = re.findall(r'\[(\d+)\] Title: (.*)', prompt)
+            return json.dumps({'results': [{'id': int(number), 'category': self.category,
+                                            'summary': f"about {title.strip()}"} for number, title in pages]})
+        match = re.search(r'Title: (.*)', prompt)
+        title = match.group(1).strip() if match else ''
+        return f"Category: {self.category}\nSummary: about {title}\n<END>\n" + "rambling " * 40
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    service: OllamaStub = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, payload):
+        data = (json.dumps(payload) + "\n").encode('utf-8')
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == '/api/tags':
+            with self.service._lock:
+                self.service.tag_requests += 1
+            self._send_json({'models': [{'name': name} for name in self.service.models]})
+        else:
+            self._send_json({'error': 'not found'}, status=404)
+
+    def do_POST(self):
+        stub = self.service
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with stub._lock:
+            stub.requests.append((self.path, body))
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            status = stub.fail_statuses.pop(0) if stub.fail_statuses else None
+        try:
+            time.sleep(stub.delay)
+            if status is not None:
+                return self._send_json({'error': 'stub failure'}, status=status)
+            if 'prompt' not in body and 'messages' not in body:
+                return self._send_json({'model': body.get('model'), 'response': '', 'done': True})
+            if self.path == '/api/chat':
+                prompt = "\n".join(message['content'] for message in body['messages'])
+            else:
+                prompt = body['prompt']
+            text = (stub.reply or (lambda path, b, p: stub.default_reply(b, p)))(self.path, body, prompt)
+            key = 'message' if self.path == '/api/chat' else 'response'
+
+            def wrap(piece):
+                return {'role': 'assistant', 'content': piece} if key == 'message' else piece
+
+            timings = {'prompt_eval_count': len(prompt) // 4, 'prompt_eval_duration': 1_000_000,
+                       'eval_count': 20, 'eval_duration': 2_000_000}
+            if not body.get('stream', True):
+                return self._send_json({key: wrap(text), 'done': True, **timings})
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for start in range(0, len(text), 5):
+                    self._send_chunk({key: wrap(text[start:start + 5]), 'done': False})
+                    with stub._lock:
+                        stub.streamed_chars += len(text[start:start + 5])
+                    time.sleep(stub.stream_chunk_delay)
+                self._send_chunk({key: wrap(''), 'done': True, **timings})
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        finally:
+            with stub._lock:
+                stub.in_flight -= 1
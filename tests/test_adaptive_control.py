@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from adaptive_control import AdaptiveTimeout, AIMDLimiter, LatencyTracker, RetryPolicy
+from llm_classifier import LLMClassifier
+from tests.ollama_stub import OllamaStub
+
+
+@pytest.fixture
+def ollama():
+    with OllamaStub() as stub:
+        yield stub
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"status {status}", response=response)
+
+
+def test_latency_tracker_window_and_percentiles():
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(0.5) is None
+    for value in range(1, 21):
+        tracker.add(float(value))
+
+    assert len(tracker) == 10
+    assert tracker.percentile(0.0) == 11.0
+    assert tracker.percentile(0.5) == 16.0
+    assert tracker.stats()['p99'] == 20.0
+
+
+def test_adaptive_timeout_uses_p95_within_bounds():
+    tracker = LatencyTracker(window=20)
+    timeout = AdaptiveTimeout(tracker, initial=15, min_timeout=5, max_timeout=60, min_samples=5)
+    assert timeout.timeout(pages=2) == 30
+
+    for _ in range(5):
+        tracker.add(4.0)
+    assert timeout.timeout() == 12.0
+    assert timeout.timeout(pages=3) == 36.0
+
+    for _ in range(20):
+        tracker.add(0.1)
+    assert timeout.timeout() == 5
+
+    for _ in range(20):
+        tracker.add(100.0)
+    assert timeout.timeout() == 60
+
+
+def test_retry_policy_retries_transient_errors_only():
+    policy = RetryPolicy(max_retries=2, base_delay=0.0, jitter=False)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise http_error(503)
+        return 'ok'
+
+    retried = []
+    assert policy.call(flaky, on_retry=lambda attempt, error: retried.append(attempt)) == 'ok'
+    assert retried == [1, 2]
+
+    with pytest.raises(requests.HTTPError):
+        policy.call(lambda: (_ for _ in ()).throw(http_error(400)))
+    assert policy.is_retryable(requests.Timeout()) and policy.is_retryable(TimeoutError())
+    assert not policy.is_retryable(ValueError())
+
+    calls = []
+
+    def always_down():
+        calls.append(1)
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        policy.call(always_down)
+    assert len(calls) == 3
+
+
+def test_retry_delay_is_exponential_and_capped():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    assert 0 <= RetryPolicy(base_delay=0.5).delay(1) <= 1.0
+
+
+def test_aimd_limiter_increases_additively_and_halves_on_errors():
+    limiter = AIMDLimiter(max_limit=8, min_limit=1, initial=2)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 3
+
+    limiter.acquire()
+    limiter.release(error=True)
+    assert limiter.limit == 1
+    # Cooldown içinde ikinci hata limiti tekrar düşürmez
+    limiter._limit = 4.0
+    limiter.acquire()
+    limiter.release(error=True)
+    assert limiter.limit == 4
+    assert limiter.stats()['decreases'] == 1
+
+
+def test_aimd_limiter_treats_latency_spikes_as_congestion():
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.add(0.1)
+    limiter = AIMDLimiter(max_limit=8, tracker=tracker)
+    limiter.acquire()
+    limiter.release(latency=0.15)
+    assert limiter.limit == 8
+    limiter.acquire()
+    limiter.release(latency=0.5)
+    assert limiter.limit == 4
+
+
+def test_aimd_limiter_blocks_above_the_limit():
+    limiter = AIMDLimiter(max_limit=2)
+    limiter.acquire()
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def third():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=third)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    limiter.release()
+    assert acquired.wait(1)
+    thread.join()
+    assert limiter.in_flight == 2
+
+
+def test_classifier_retries_server_errors(ollama):
+    ollama.fail_statuses = [503]
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, max_retries=2)
+    classifier.retry_policy.base_delay = 0.01
+
+    assert classifier.classify_text("Page", "c")["summary"] == "about Page"
+    stats = classifier.get_stats()
+    assert stats["retries"] == 1
+    assert stats["failures"] == {"http_503": 1}
+    assert stats["total_requests"] == 2 and stats["total_failed_requests"] == 1
@@ -0,0 +1,83 @@
+import numpy as np
+
+from category_classifier import EmbeddingCategoryClassifier
+
+CATEGORIES = [("Sports", "sport"), ("Music", "music"), ("Code", "code")]
+
+
+class KeywordBackend:
+    """Her kategori kelimesi bir eksen: metindeki tekrar sayısı kadar ağırlık"""
+
+    def encode_batch(self, texts):
+        return np.array([[text.lower().count(word) for _, word in CATEGORIES] for text in texts], dtype=np.float32)
+
+
+class RecordingLLM:
+    def __init__(self, shortlist_size=None):
+        self.shortlist_size = shortlist_size
+        self.calls = []
+
+    def classify_many(self, items, candidates=None):
+        self.calls.append((list(items), candidates))
+        return [{'category': 'Music', 'summary': f"llm {title}"} for title, _ in items]
+
+
+def test_confident_pages_are_decided_by_embedding():
+    llm = RecordingLLM()
+    classifier = EmbeddingCategoryClassifier(KeywordBackend(), CATEGORIES, margin_threshold=0.1, llm_classifier=llm)
+    output = classifier.classify("Match report", "sport sport sport")
+
+    assert output['category'] == 'Sports'
+    assert output['classified_by'] == 'embedding'
+    assert output['category_margin'] > 0.1
+    assert llm.calls == []
+
+
+def test_ambiguous_pages_fall_back_to_llm_in_one_call():
+    llm = RecordingLLM(shortlist_size=2)
+    classifier = EmbeddingCategoryClassifier(KeywordBackend(), CATEGORIES, margin_threshold=0.1, llm_classifier=llm)
+    items = [("a", "sport music"), ("b", "code code"), ("c", "music code")]
+    outputs = classifier.classify_many(items)
+
+    assert [output['classified_by'] for output in outputs] == ['llm', 'embedding', 'llm']
+    assert [output['category'] for output in outputs] == ['Music', 'Code', 'Music']
+    assert len(llm.calls) == 1
+    fallback_items, candidates = llm.calls[0]
+    assert fallback_items == [items[0], items[2]]
+    assert [sorted(names) for names in candidates] == [['Music', 'Sports'], ['Code', 'Music']]
+    assert classifier.get_stats()['llm_fallback_rate'] == 2 / 3
+
+
+def test_require_summary_sends_every_page_to_llm():
+    llm = RecordingLLM()
+    classifier = EmbeddingCategoryClassifier(KeywordBackend(), CATEGORIES, llm_classifier=llm, require_summary=True)
+    classifier.classify_many([("a", "sport"), ("b", "code")])
+
+    assert len(llm.calls[0][0]) == 2
+    assert llm.calls[0][1] is None
+
+
+def test_precomputed_embeddings_are_not_recomputed():
+    class CountingBackend(KeywordBackend):
+        texts = []
+
+        def encode_batch(self, texts):
+            self.texts.extend(texts)
+            return super().encode_batch(texts)
+
+    backend = CountingBackend()
+    classifier = EmbeddingCategoryClassifier(backend, CATEGORIES)
+    classifier.classify_many([("a", "sport"), ("b", "code")], embeddings=[np.array([0, 1, 0]), None])
+
+    assert [text for text in backend.texts if ':' not in text] == ["b code"]
+
+
+def test_shortlist_and_agreement_report():
+    classifier = EmbeddingCategoryClassifier(KeywordBackend(), CATEGORIES)
+
+    assert classifier.shortlist("t", "music music code", 2) == ['Music', 'Code']
+    report = classifier.agreement_report([("a", "sport", "sports"), ("b", "code", "Music"), ("c", "x", "")],
+                                         thresholds=(0.0,))
+    assert report['samples'] == 2
+    assert report['accuracy'] == 0.5
+    assert report['top_confusions'] == [{'label': 'Music', 'predicted': 'Code', 'count': 1}]
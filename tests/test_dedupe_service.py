@@ -0,0 +1,106 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from dedupe_service import DedupeIndexServer, RemoteSimilarityChecker
+from similarity_checker import SimilarityChecker
+from tests.corpus import make_documents
+
+
+def local_checker(path):
+    return SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(path))
+
+
+@pytest.fixture
+def remote(tmp_path):
+    server = DedupeIndexServer(local_checker(tmp_path / "server.jsonl"), port=0)
+    server.start()
+    host, port = server.address
+    yield server, RemoteSimilarityChecker(f"http://{host}:{port}", timeout=30)
+    server.shutdown()
+
+
+def corpus_items(count=20):
+    return make_documents(count, duplicate_rate=0.4, seed=5)
+
+
+def test_remote_results_match_local_checker(remote, tmp_path):
+    _, client = remote
+    items = corpus_items()
+    local = local_checker(tmp_path / "local.jsonl")
+    expected = local.check_many(items)
+
+    results = client.check_many(items[:7]) + [client.is_duplicate_comprehensive(*item) for item in items[7:]]
+
+    assert [r[0] for r in results] == [r[0] for r in expected]
+    assert [r[1].get('original_url') for r in results] == [r[1].get('original_url') for r in expected]
+    assert any(r[0] for r in results)
+
+
+def test_concurrent_clients_share_one_index(remote):
+    server, client = remote
+    url, title, content = corpus_items(1)[0]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda i: client.is_duplicate_comprehensive(f"{url}#{i}", title, content),
+                                    range(6)))
+
+    assert sorted(r[0] for r in results) == [False] + [True] * 5
+    assert len(server.checker.simhash_storage) == 1
+
+
+def test_llm_cache_and_logs_round_trip(remote):
+    server, client = remote
+    client.cache_llm_output('https://a.example', {'category': 'Spor'})
+    client.check_many(corpus_items(2))
+
+    assert client.get_cached_llm_output('https://a.example') == {'category': 'Spor'}
+    assert client.get_cached_llm_output('https://missing.example') is None
+    assert len(client.get_similarity_logs()) == 2
+    assert len(client.get_similarity_logs(limit=1)) == 1
+
+
+def serve_index(log_path, port_queue, stop):
+    """Ayrı süreçte index sunucusu: portu bildirir, stop gelene kadar çalışır"""
+    server = DedupeIndexServer(local_checker(log_path), port=0)
+    server.start()
+    port_queue.put(server.address[1])
+    stop.wait(60)
+    port_queue.put(len(server.checker.simhash_storage))
+    server.shutdown()
+
+
+def check_shard(client, shard):
+    return [(url, is_duplicate) for (url, _, _), (is_duplicate, _, _) in zip(shard, client.check_many(shard))]
+
+
+def test_worker_processes_share_one_server_process(tmp_path):
+    # spawn: istemci ve iş parçaları gerçekten pickle edilir, fork'tan durum sızmaz
+    context = multiprocessing.get_context('spawn')
+    port_queue, stop = context.Queue(), context.Event()
+    server_process = context.Process(target=serve_index, args=(str(tmp_path / "server.jsonl"), port_queue, stop))
+    server_process.start()
+    try:
+        client = RemoteSimilarityChecker(f"http://127.0.0.1:{port_queue.get(timeout=60)}", timeout=30)
+        assert pickle.loads(pickle.dumps(client)).base_url == client.base_url
+
+        # Her sayfanın birebir kopyası üç shard'da da var: yalnızca biri unique sayılmalı
+        originals = make_documents(12, seed=8)
+        shards = [[(f"{url}?shard={n}", title, content) for url, title, content in originals] for n in range(3)]
+        with context.Pool(3) as pool:
+            results = pool.starmap(check_shard, [(client, shard) for shard in shards])
+
+        unique = [url.split('?')[0] for shard in results for url, is_duplicate in shard if not is_duplicate]
+        assert sorted(unique) == sorted(url for url, _, _ in originals)
+        assert client.get_comprehensive_stats()['total_duplicates'] == 24
+    finally:
+        stop.set()
+    assert port_queue.get(timeout=60) == 12
+    server_process.join(60)
+    assert server_process.exitcode == 0
+
+    with pytest.raises(requests.ConnectionError):
+        client.is_duplicate_comprehensive('https://after.example', 'title', 'content')
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from embedding_backend import EmbeddingBackend, create_embedding_backend, truncate_to_token_budget
+from similarity_checker import SimilarityChecker
+
+
+class FixedBackend(EmbeddingBackend):
+    name = 'fixed'
+
+    def encode_batch(self, texts):
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_truncate_to_token_budget_keeps_first_words():
+    assert truncate_to_token_budget("a b c d e", 3) == "a b c"
+    assert truncate_to_token_budget("a b c", 3) == "a b c"
+    assert truncate_to_token_budget("  a  b ", 5) == "  a  b "
+    assert truncate_to_token_budget("", 3) == ""
+    assert truncate_to_token_budget("a b", 0) == "a b"
+
+
+def test_backend_without_encode_batch_cannot_be_created():
+    class Incomplete(EmbeddingBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete('model')
+
+
+def test_encode_and_prepare_use_encode_batch_and_token_budget():
+    backend = FixedBackend('model', max_seq_length=2)
+
+    assert backend.prepare("one two three") == "one two"
+    np.testing.assert_array_equal(backend.encode("abc"), [3.0, 1.0])
+    assert backend.info()['backend'] == 'fixed'
+    assert backend.info()['embedding_dimension'] == 'Unknown'
+
+
+def test_unknown_backend_name_is_rejected():
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        create_embedding_backend('does-not-exist')
+
+
+def test_clean_text_is_a_staticmethod():
+    assert SimilarityChecker.clean_text("The  Cat sat\n on the MAT") == "the cat sat on the mat"
+    assert SimilarityChecker.clean_text("The cat sat on the mat", remove_stopwords=True) == "cat sat mat"
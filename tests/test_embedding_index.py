@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from embedding_index import EmbeddingIndex
+
+
+def random_vectors(count, dimension=64, seed=0):
+    return np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+
+
+def reference_scores(vectors, query):
+    matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return matrix @ (query / np.linalg.norm(query))
+
+
+@pytest.mark.parametrize('mode, tolerance', [('float32', 1e-5), ('float16', 2e-3), ('int8', 2e-2)])
+def test_similarities_match_float32_reference(mode, tolerance):
+    vectors = random_vectors(300)
+    # Küçük search_chunk_rows ile chunk sınırları da test edilir
+    index = EmbeddingIndex(mode=mode, initial_capacity=4, search_chunk_rows=64)
+    for i, vector in enumerate(vectors):
+        index.add(f"u{i}", vector)
+    query = random_vectors(1, seed=1)[0]
+
+    scores = index.similarities(query)
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, reference_scores(vectors, query), atol=tolerance)
+
+
+@pytest.mark.parametrize('mode', EmbeddingIndex.MODES)
+def test_search_finds_the_same_vector(mode):
+    vectors = random_vectors(50)
+    index = EmbeddingIndex(mode=mode)
+    for i, vector in enumerate(vectors):
+        index.add(f"u{i}", vector)
+
+    url, score = index.search(vectors[17] * 3)
+    assert url == 'u17'
+    assert 0.98 < score <= 1.0
+
+
+@pytest.mark.parametrize('mode', EmbeddingIndex.MODES)
+def test_remove_moves_last_row_into_the_slot(mode):
+    vectors = random_vectors(5)
+    index = EmbeddingIndex(mode=mode)
+    for i, vector in enumerate(vectors):
+        index.add(f"u{i}", vector)
+
+    assert index.remove('u1')
+    assert not index.remove('u1')
+    assert len(index) == 4
+    assert 'u1' not in index
+    assert sorted(index.keys()) == ['u0', 'u2', 'u3', 'u4']
+    assert index.search(vectors[4])[0] == 'u4'
+    np.testing.assert_allclose(index['u4'], vectors[4] / np.linalg.norm(vectors[4]), atol=2e-2)
+
+
+def test_nbytes_per_mode():
+    vectors = random_vectors(10, dimension=32)
+    sizes = {}
+    for mode in EmbeddingIndex.MODES:
+        index = EmbeddingIndex(mode=mode)
+        for i, vector in enumerate(vectors):
+            index.add(f"u{i}", vector)
+        sizes[mode] = index.nbytes
+
+    assert sizes == {'float32': 10 * 32 * 4, 'float16': 10 * 32 * 2, 'int8': 10 * 32 + 10 * 4}
+
+
+def test_add_replaces_and_ignores_zero_vectors():
+    index = EmbeddingIndex()
+    index.add('u', [1.0, 0.0])
+    index.add('u', [0.0, 2.0])
+    index.add('zero', [0.0, 0.0])
+
+    assert len(index) == 1
+    np.testing.assert_allclose(index['u'], [0.0, 1.0])
+    with pytest.raises(ValueError):
+        index.add('other', [1.0, 0.0, 0.0])
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        EmbeddingIndex(mode='bfloat16')
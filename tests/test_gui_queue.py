@@ -0,0 +1,82 @@
+import queue
+import threading
+
+import pytest
+
+pytest.importorskip('tkinter')
+pytest.importorskip('ttkbootstrap')
+pytest.importorskip('goose3')
+
+from gui.main_window import URLExtractorGUI  # noqa: E402
+
+
+class FakeVar:
+    def __init__(self):
+        self.values = []
+
+    def set(self, value):
+        self.values.append(value)
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func):
+        self.scheduled.append((ms, func))
+
+
+@pytest.fixture
+def gui():
+    """Tk penceresi açmadan yalnızca kuyruk mantığını kuran GUI nesnesi"""
+    gui = URLExtractorGUI.__new__(URLExtractorGUI)
+    gui.root = FakeRoot()
+    gui.progress_var = FakeVar()
+    gui._ui_queue = queue.Queue()
+    gui._pending_progress = None
+    gui.logged = []
+    gui._append_log = gui.logged.extend
+    return gui
+
+
+def test_progress_is_coalesced_but_every_message_is_logged(gui):
+    for i in range(1, 6):
+        gui.update_progress(i * 10, f"step {i}")
+    gui.update_progress(60, "")
+
+    gui._drain_ui_queue()
+
+    assert gui.progress_var.values == [60]
+    assert gui.logged == [f"step {i}\n" for i in range(1, 6)]
+    assert gui.root.scheduled == [(gui._ui_interval_ms, gui._drain_ui_queue)]
+
+
+def test_messages_keep_their_order_across_threads(gui):
+    def worker(name):
+        for i in range(100):
+            gui.log_message(f"{name} {i}")
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gui._drain_ui_queue()
+
+    for name in "ab":
+        assert [line for line in gui.logged if line.startswith(name)] == [f"{name} {i}\n" for i in range(100)]
+
+
+def test_drain_is_bounded_per_frame_and_runs_calls(gui, monkeypatch):
+    monkeypatch.setattr(URLExtractorGUI, 'MAX_MESSAGES_PER_FRAME', 3)
+    called = []
+    for i in range(4):
+        gui.log_message(f"m{i}")
+    gui.call_in_ui(lambda: called.append(True))
+
+    gui._drain_ui_queue()
+    assert gui.logged == ["m0\n", "m1\n", "m2\n"]
+    gui._drain_ui_queue()
+    assert gui.logged[-1] == "m3\n"
+    assert called == [True]
+    assert gui.progress_var.values == []
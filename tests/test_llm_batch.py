@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from llm_classifier import LLMClassifier
+from tests.ollama_stub import OllamaStub
+
+PAGES = [(f"Page {i}", f"Content of page {i}") for i in range(5)]
+
+
+@pytest.fixture
+def ollama():
+    with OllamaStub() as stub:
+        yield stub
+
+
+def test_parse_batch_response_skips_malformed_items():
+    classifier = LLMClassifier(use_cache=False)
+    text = json.dumps({'results': [
+        {'id': 1, 'category': 'news and media', 'summary': ' one '},
+        {'id': '2', 'category': 'Hacking', 'summary': 'two'},
+        {'id': 2, 'category': 'Religion', 'summary': 'duplicate id'},
+        {'id': 3, 'category': 'Not A Category', 'summary': 'three'},
+        {'id': 4, 'category': 'Religion', 'summary': None},
+        {'id': 9, 'category': 'Religion', 'summary': 'out of range'},
+        {'id': 'x', 'category': 'Religion', 'summary': 'bad id'},
+        'not an object',
+    ]})
+
+    assert classifier.parse_batch_response(text, 5) == {
+        1: {'category': 'News and Media', 'summary': 'one'},
+        2: {'category': 'Hacking', 'summary': 'two'},
+    }
+    assert classifier.parse_batch_response('[{"id": 1, "category": "Drugs", "summary": ""}]', 1) == {
+        1: {'category': 'Drugs', 'summary': ''}
+    }
+    assert classifier.parse_batch_response('{"results": {}}', 1) == {}
+
+
+def test_batch_prompt_lists_every_page_once():
+    classifier = LLMClassifier(use_cache=False)
+    prompt = classifier.build_batch_prompt(PAGES[:3])
+
+    assert prompt.count('Categories:') == 1
+    assert [f"[{n}] Title: Page {n - 1}" in prompt for n in (1, 2, 3)] == [True] * 3
+    assert 'EACH of the 3 websites' in prompt
+
+
+def test_classify_many_sends_one_json_request_per_batch(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, batch_size=3)
+    outputs = classifier.classify_many(PAGES)
+
+    assert [output['summary'] for output in outputs] == [f"about {title}" for title, _ in PAGES]
+    assert len(ollama.requests) == 2
+    assert all(body['format'] == 'json' for _, body in ollama.requests)
+    # Batch yanıtlarında stop sequence yok (JSON'un ortasında kesilmesin)
+    assert all('stop' not in body.get('options', {}) for _, body in ollama.requests)
+
+
+def test_missing_batch_items_fall_back_to_single_requests(ollama):
+    def reply(path, body, prompt):
+        if body.get('format') == 'json':
+            return json.dumps({'results': [{'id': 1, 'category': 'Hacking', 'summary': 'first'}]})
+        return ollama.default_reply(body, prompt)
+
+    ollama.reply = reply
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, batch_size=3)
+    outputs = classifier.classify_many(PAGES[:3])
+
+    assert [output['category'] for output in outputs] == ['Hacking', 'News and Media', 'News and Media']
+    assert [body.get('format') for _, body in ollama.requests] == ['json', None, None]
+
+
+def test_invalid_json_falls_back_for_the_whole_batch(ollama):
+    ollama.reply = lambda path, body, prompt: 'not json' if body.get('format') else ollama.default_reply(body, prompt)
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, batch_size=2)
+    outputs = classifier.classify_many(PAGES[:2])
+
+    assert [output['summary'] for output in outputs] == ['about Page 0', 'about Page 1']
+    assert len(ollama.requests) == 3
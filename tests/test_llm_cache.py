@@ -0,0 +1,108 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+import llm_cache
+from llm_cache import LLMResultCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Her çağrıda artan saat: last_access eşitlikleri LRU sırasını belirsizleştirmesin"""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(llm_cache, 'time', SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_key_ignores_whitespace_and_case_but_not_model_or_version():
+    key = LLMResultCache.make_key('m', 1, 'Title', 'Some  content\n')
+
+    assert key == LLMResultCache.make_key('m', 1, '  title ', 'some content')
+    assert key != LLMResultCache.make_key('other', 1, 'Title', 'Some content')
+    assert key != LLMResultCache.make_key('m', 2, 'Title', 'Some content')
+
+
+def test_get_put_and_hit_rate(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.get('k') is None
+    cache.put('k', {'category': 'Teknoloji', 'summary': 'özet'})
+
+    assert cache.get('k') == {'category': 'Teknoloji', 'summary': 'özet'}
+    stats = cache.stats()
+    assert (stats['entries'], stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 1, 0.5)
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    for key in 'abc':
+        cache.put(key, {'key': key})
+    cache.get('a')  # a en son kullanılan olur
+    cache.put('d', {'key': 'd'})
+    cache.put('e', {'key': 'e'})
+
+    assert len(cache) == 3
+    assert cache.get('b') is None
+    assert cache.get('c') is None
+    assert [cache.get(key)['key'] for key in 'ade'] == ['a', 'd', 'e']
+    cache.close()
+
+
+def test_hits_are_written_in_batches(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMResultCache(path, touch_batch_size=3)
+    for key in 'abc':
+        cache.put(key, {'key': key})
+    changes = cache._conn.total_changes
+
+    for key in 'aab':
+        cache.get(key)
+    assert cache._conn.total_changes == changes  # okuma yolu yazmaz; tekrar eden key tek kayıt
+    cache.get('c')
+    assert cache._conn.total_changes == changes + 3
+    cache.get('a')
+    cache.close()
+
+    reopened = LLMResultCache(path)
+    last_access = reopened._conn.execute("SELECT last_access FROM llm_cache WHERE key = 'a'").fetchone()[0]
+    assert last_access == 8.0  # close() bekleyen son erişimi de yazar
+    reopened.close()
+
+
+def test_replacing_a_key_does_not_grow_the_cache(tmp_path, clock):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.put('a', {'v': 1})
+    cache.put('a', {'v': 2})
+    cache.put('b', {'v': 3})
+
+    assert len(cache) == 2
+    assert cache.get('a') == {'v': 2}
+    cache.close()
+
+
+def test_entry_count_is_shared_between_connections(tmp_path, clock):
+    path = str(tmp_path / "cache.sqlite3")
+    first = LLMResultCache(path, max_entries=3)
+    second = LLMResultCache(path, max_entries=3)
+    first.put('a', {})
+    first.put('b', {})
+    second.put('c', {})
+    second.put('d', {})
+
+    assert len(first) == len(second) == 3
+    assert first.get('a') is None
+    first.close()
+    second.close()
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMResultCache(path)
+    cache.put('k', {'v': 1})
+    cache.close()
+
+    reopened = LLMResultCache(path)
+    assert reopened.get('k') == {'v': 1}
+    reopened.clear()
+    assert len(reopened) == 0
+    reopened.close()
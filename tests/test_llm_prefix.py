@@ -0,0 +1,86 @@
+import json
+import sys
+
+import pytest
+
+from llm_classifier import LLMClassifier
+from tests.ollama_stub import OllamaStub
+from tools import llm_prefix_benchmark
+
+
+@pytest.fixture
+def ollama():
+    with OllamaStub() as stub:
+        yield stub
+
+
+def test_chat_requests_share_one_system_message(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, prompt_mode="chat", max_in_flight=1)
+    outputs = classifier.classify_many([("Page 0", "first"), ("Page 1", "second")])
+
+    assert [output["summary"] for output in outputs] == ["about Page 0", "about Page 1"]
+    paths = [path for path, _ in ollama.requests]
+    assert paths == ["/api/chat", "/api/chat"]
+    systems = [body["messages"][0] for _, body in ollama.requests]
+    assert systems[0] == systems[1]
+    assert systems[0]["role"] == "system"
+    assert "Categories:" in systems[0]["content"]
+    users = [body["messages"][1]["content"] for _, body in ollama.requests]
+    assert "Title: Page 0" in users[0] and "Categories:" not in users[0]
+
+
+def test_server_timings_are_recorded(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, prompt_mode="chat")
+    classifier.classify_text("Page", "content")
+
+    record = classifier.get_request_log()[0]
+    assert record["prompt_eval_count"] > 0
+    assert record["prompt_eval_ms"] == 1.0
+    assert classifier.get_stats()["prompt_mode"] == "chat"
+
+
+def test_shortlisted_system_prompt_is_not_memoized():
+    classifier = LLMClassifier(use_cache=False, prompt_mode="chat")
+    full = classifier.build_system_prompt()
+    short = classifier.build_system_prompt(["Hacking"])
+
+    assert classifier.build_system_prompt() is full
+    assert "    Hacking:" in short and "    Religion:" not in short
+    assert "    Religion:" in full
+
+
+def test_chat_and_generate_results_are_cached_separately():
+    generate = LLMClassifier(use_cache=False)
+    chat = LLMClassifier(use_cache=False, prompt_mode="chat")
+
+    assert generate.cache_key("t", "c") != chat.cache_key("t", "c")
+
+
+def test_warm_up_primes_the_system_prompt(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, prompt_mode="chat")
+
+    assert classifier.warm_up()
+    (load_path, load_body), (chat_path, chat_body) = ollama.requests
+    assert load_path == "/api/generate" and "prompt" not in load_body
+    assert chat_path == "/api/chat"
+    assert chat_body["messages"] == [{"role": "system", "content": classifier.build_system_prompt()}]
+    assert chat_body["options"] == {"num_predict": 1}
+
+
+@pytest.mark.parametrize("lines", ["", "first page\nsecond page\n"])
+def test_prefix_benchmark_reports_empty_and_normal_runs(ollama, monkeypatch, tmp_path, capsys, lines):
+    documents = tmp_path / "documents.txt"
+    documents.write_text(lines, encoding="utf-8")
+    report_path = tmp_path / "report.json"
+    monkeypatch.setattr(sys, "argv", ["llm_prefix_benchmark", str(documents), "--base-url", ollama.url,
+                                      "--json", str(report_path)])
+
+    assert llm_prefix_benchmark.main() == 0
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    output = capsys.readouterr().out
+    if not lines:
+        assert report["modes"]["chat"]["requests"] == 0
+        assert "generate: 0 requests | prompt_eval -- tokens" in output
+    else:
+        assert report["modes"]["chat"]["requests"] == 2
+        assert "latency avg --" not in output
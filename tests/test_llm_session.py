@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from llm_cache import LLMResultCache
+from llm_classifier import LLMClassifier
+from tests.ollama_stub import OllamaStub
+
+PAGES = [(f"Page {i}", f"Content of page {i} about current events") for i in range(8)]
+
+
+@pytest.fixture
+def ollama():
+    with OllamaStub() as stub:
+        yield stub
+
+
+def test_classify_many_runs_requests_concurrently_and_keeps_order(ollama):
+    ollama.delay = 0.1
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, max_in_flight=4)
+
+    start = time.perf_counter()
+    outputs = classifier.classify_many(PAGES)
+    elapsed = time.perf_counter() - start
+
+    assert [output['summary'] for output in outputs] == [f"about {title}" for title, _ in PAGES]
+    assert all(output['category'] == 'News and Media' for output in outputs)
+    assert 1 < ollama.max_in_flight <= 4
+    assert elapsed < 0.1 * len(PAGES)
+
+
+def test_sequential_when_max_in_flight_is_one(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, max_in_flight=1)
+    classifier.classify_many(PAGES[:4])
+
+    assert ollama.max_in_flight == 1
+    assert all(body['keep_alive'] == classifier.keep_alive for _, body in ollama.requests)
+
+
+def test_health_check_is_cached(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, health_ttl=60)
+
+    assert classifier.is_llm_available()
+    assert classifier.is_llm_available()
+    assert ollama.tag_requests == 1
+    assert classifier.is_llm_available(force=True)
+    assert ollama.tag_requests == 2
+    assert not LLMClassifier(base_url=ollama.url, use_cache=False, model='mistral').is_llm_available()
+
+
+def test_cached_pages_skip_the_server(ollama, tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"))
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, cache=cache)
+    first = classifier.classify_text(*PAGES[0])
+    second = classifier.classify_text(*PAGES[0])
+
+    assert first == second
+    assert len(ollama.requests) == 1
+    cache.close()
+
+
+def test_server_error_gives_unknown_result_without_caching(ollama, tmp_path):
+    ollama.fail_statuses = [400]
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"))
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, cache=cache)
+
+    output = classifier.classify_text(*PAGES[0])
+    assert output['category'] == 'Unknown'
+    assert output['error'].startswith('http_400')
+    assert len(cache) == 0
+    assert classifier.classify_text(*PAGES[0])['category'] == 'News and Media'
+    cache.close()
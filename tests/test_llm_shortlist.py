@@ -0,0 +1,65 @@
+import pytest
+
+from llm_classifier import CATEGORIES, KeywordCategoryShortlister, LLMClassifier
+from tests.ollama_stub import OllamaStub
+
+
+@pytest.fixture
+def ollama():
+    with OllamaStub() as stub:
+        yield stub
+
+
+def test_keyword_shortlister_ranks_matching_categories_first():
+    shortlister = KeywordCategoryShortlister(CATEGORIES)
+
+    top = shortlister.shortlist("Best restaurants in town", "Recipes, dining and restaurant reviews", 3)
+    assert top[0] == "Restaurants and Dining"
+    assert len(top) == 3
+    assert shortlister.shortlist("zzz", "qqq", 3) is None
+
+
+def test_prompt_contains_only_shortlisted_categories():
+    classifier = LLMClassifier(use_cache=False, shortlist_size=3)
+    candidates = classifier.shortlist("Hacking tools", "exploit and hacking techniques for web hosting proxy")
+    prompt = classifier.build_prompt("Hacking tools", "content", candidates)
+
+    assert candidates and len(candidates) == 3 and "Hacking" in candidates
+    for name, _ in CATEGORIES:
+        assert (f"    {name}:" in prompt) == (name in candidates)
+    assert len(prompt) < len(classifier.build_prompt("Hacking tools", "content"))
+
+
+def test_shortlist_is_disabled_without_size_or_when_it_covers_everything():
+    assert LLMClassifier(use_cache=False).shortlist("Hacking", "hacking") is None
+    assert LLMClassifier(use_cache=False, shortlist_size=len(CATEGORIES)).shortlist("Hacking", "hacking") is None
+
+
+def test_custom_shortlister_names_are_canonicalized_and_errors_ignored():
+    class Shortlister:
+        def shortlist(self, title, content, top_k):
+            if title == "boom":
+                raise RuntimeError("failed")
+            return ["hacking", "HACKING", "Not A Category", "religion"]
+
+    classifier = LLMClassifier(use_cache=False, shortlist_size=2, shortlister=Shortlister())
+
+    assert classifier.shortlist("t", "c") == ["Hacking", "Religion"]
+    assert classifier.shortlist("boom", "c") is None
+
+
+def test_cache_key_depends_on_candidates_but_not_their_order():
+    classifier = LLMClassifier(use_cache=False)
+    key = classifier.cache_key("t", "c", ["Hacking", "Religion"])
+
+    assert key == classifier.cache_key("t", "c", ["Religion", "Hacking"])
+    assert key != classifier.cache_key("t", "c")
+    assert key != LLMClassifier(use_cache=False, categories=CATEGORIES[:5]).cache_key("t", "c", ["Hacking", "Religion"])
+
+
+def test_requests_report_the_category_count(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, shortlist_size=4)
+    classifier.classify_many([("Hacking tools", "hacking exploit tools")])
+
+    assert classifier.get_request_log()[0]['categories'] == 4
+    assert classifier.get_stats()['avg_categories'] == 4
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from llm_classifier import LLMClassifier
+from tests.ollama_stub import OllamaStub
+
+
+@pytest.fixture
+def ollama():
+    with OllamaStub() as stub:
+        yield stub
+
+
+def test_parse_partial_ignores_the_unfinished_last_line():
+    parse = LLMClassifier._parse_partial
+
+    assert parse("Category: Hack") == ("", False)
+    assert parse("Category: Hacking\nSumm") == ("Hacking", False)
+    assert parse("Category: Hacking\nSummary:\n") == ("Hacking", False)
+    assert parse("Category: Hacking\nSummary: tools\n") == ("Hacking", True)
+    assert parse("Category: Hacking\nSummary: tools", done=True) == ("Hacking", True)
+
+
+def test_parse_response_reads_category_and_summary_lines():
+    text = "Some preamble\ncategory: Hacking\nSummary: tools: and more\n<END>"
+    assert LLMClassifier.parse_response(text) == ("Hacking", "tools: and more")
+
+
+def test_generation_options_cap_tokens_only_when_streaming():
+    classifier = LLMClassifier(use_cache=False, num_predict=100)
+
+    assert classifier._generation_options() == {"stop": ["<END>"]}
+    assert classifier._generation_options(pages=3, stream=True) == {"num_predict": 300, "stop": ["<END>"]}
+    assert classifier._generation_options(pages=3, stop=False, stream=True) == {"num_predict": 300}
+    assert LLMClassifier(use_cache=False, num_predict=None, stop=None)._generation_options(stream=True) == {}
+
+
+def test_prompt_ends_with_the_stop_marker():
+    classifier = LLMClassifier(use_cache=False)
+
+    assert classifier.build_prompt("t", "c").rstrip().endswith(LLMClassifier.RESPONSE_END)
+    assert classifier.build_system_prompt().rstrip().endswith(LLMClassifier.RESPONSE_END)
+
+
+def test_stream_stops_once_summary_is_complete(ollama):
+    ollama.stream_chunk_delay = 0.02
+    ollama.reply = lambda path, body, prompt: "Category: Hacking\nSummary: tools\n" + "rambling " * 60
+    categories = []
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, stream=True, on_category=lambda category, seconds: categories.append(category))
+
+    start = time.perf_counter()
+    output = classifier.classify_text("t", "c")
+    elapsed = time.perf_counter() - start
+
+    assert output == {"category": "Hacking", "summary": "tools"}
+    # Tüm yanıtın akması ~2.5 saniye sürerdi
+    assert elapsed < 1.0
+    assert categories == ["Hacking"]
+    _, body = ollama.requests[0]
+    assert body["stream"] is True
+    assert body["options"] == {"num_predict": 256, "stop": ["<END>"]}
+    assert classifier.get_stats()["avg_time_to_category"] is not None
+
+
+def test_non_streaming_request_is_not_capped(ollama):
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False)
+    assert classifier.classify_text("Page", "c")["summary"] == "about Page"
+
+    _, body = ollama.requests[0]
+    assert body["stream"] is False
+    assert body["options"] == {"stop": ["<END>"]}
+
+
+def test_stream_without_category_times_out(ollama):
+    ollama.stream_chunk_delay = 0.02
+    ollama.reply = lambda path, body, prompt: "rambling " * 100
+    classifier = LLMClassifier(base_url=ollama.url, use_cache=False, stream=True, timeout=0.3, max_retries=0)
+
+    output = classifier.classify_text("t", "c")
+    assert output["category"] == "Unknown"
+    assert output["error"].startswith("timeout")
@@ -0,0 +1,125 @@
+import functools
+import json
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from llm_classifier import LLMClassifier
+from metrics_server import MetricsServer, _Exposition, render_metrics
+from run_metrics import RunMetrics
+from run_summary import SummaryAggregator
+from similarity_checker import SimilarityChecker
+from tests.fake_goose import FakeGoose
+from tests.ollama_stub import OllamaStub
+
+
+@pytest.fixture
+def fake_extractor(tmp_path):
+    """Ağ ve goose3 gerektirmeyen, render_metrics'in okuduğu alanlara sahip extractor"""
+    checker = SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(tmp_path / "logs.jsonl"))
+    checker.is_duplicate_comprehensive('u1', 'Title', 'shared body text ' * 40)
+    checker.is_duplicate_comprehensive('u2', 'Title', 'shared body text ' * 40)
+    summary = SummaryAggregator()
+    summary.add({'url': 'u1', 'status': 'success', 'elapsed': 0.02, 'timings': {'fetch': 0.01}})
+    summary.add({'url': 'u2', 'status': 'failed', 'error': 'Timeout error', 'elapsed': 3.0})
+    metrics = RunMetrics()
+    metrics.start(total=10)
+    return SimpleNamespace(run_summary=summary, metrics=metrics, similarity_checker=checker,
+                           llm_classifier=LLMClassifier(use_cache=False))
+
+
+def samples(text):
+    return {line.rsplit(' ', 1)[0]: line.rsplit(' ', 1)[1]
+            for line in text.splitlines() if line and not line.startswith('#')}
+
+
+def test_exposition_escapes_labels_and_formats_values():
+    out = _Exposition()
+    out.metric('example', 'gauge', 'Example', [({'path': 'a"b\\c\nd'}, 1.5), ({'path': 'none'}, None)])
+    out.metric('flag', 'gauge', 'Flag', True)
+    text = out.render()
+
+    assert text.count('# TYPE url_extractor_example gauge') == 1
+    assert 'url_extractor_example{path="a\\"b\\\\c\\nd"} 1.5' in text
+    assert 'url_extractor_example{path="none"} NaN' in text
+    assert 'url_extractor_flag 1' in text
+
+
+def test_render_metrics_reports_summary_duplicates_and_histograms(fake_extractor):
+    values = samples(render_metrics(fake_extractor))
+
+    assert values['url_extractor_urls_processed_total'] == '2'
+    assert values['url_extractor_urls_expected'] == '10'
+    assert values['url_extractor_results_total{status="failed"}'] == '1'
+    assert values['url_extractor_results_total{status="success"}'] == '1'
+    assert sum(int(value) for key, value in values.items()
+               if key.startswith('url_extractor_duplicates_total{')) == 1
+    # Kümülatif bucket'lar: 0.02s olan 0.025'e, 3s olan 5'e düşer
+    assert values['url_extractor_url_duration_seconds_bucket{le="0.025"}'] == '1'
+    assert values['url_extractor_url_duration_seconds_bucket{le="5"}'] == '2'
+    assert values['url_extractor_url_duration_seconds_bucket{le="+Inf"}'] == '2'
+    assert values['url_extractor_url_duration_seconds_count'] == '2'
+    assert values['url_extractor_stage_duration_seconds_count{stage="fetch"}'] == '1'
+    assert values['url_extractor_index_entries{index="simhash_storage"}'] == '1'
+
+
+def test_server_serves_metrics_health_and_404(fake_extractor):
+    server = MetricsServer(fake_extractor, port=0)
+    server.start()
+    base = 'http://%s:%d' % server.address
+    try:
+        with urllib.request.urlopen(base + '/metrics?x=1', timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert 'url_extractor_urls_processed_total 2' in response.read().decode('utf-8')
+        with urllib.request.urlopen(base + '/health', timeout=5) as response:
+            assert response.read() == b"ok\n"
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(base + '/other', timeout=5)
+        assert error.value.code == 404
+
+        fake_extractor.run_summary = None
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(base + '/metrics', timeout=5)
+        assert error.value.code == 500
+    finally:
+        server.shutdown()
+
+
+def test_parse_args_requires_input_and_output_for_headless():
+    from main import parse_args
+
+    with pytest.raises(SystemExit):
+        parse_args(['--headless', '--input', 'urls.txt'])
+    args = parse_args(['--headless', '--input', 'urls.txt', '--output', 'out.jsonl', '--metrics-port', '0'])
+    assert (args.metrics_port, args.workers) == (0, 1)
+
+
+def test_run_headless_streams_results_and_writes_report(monkeypatch, tmp_path):
+    pytest.importorskip('goose3')
+    import extractor as extractor_module
+    from main import parse_args, run_headless
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setattr(extractor_module.URLExtractor, '_create_goose', lambda self: FakeGoose())
+    monkeypatch.setattr(extractor_module, 'SimilarityChecker',
+                        functools.partial(SimilarityChecker, embedding_backend='hashing', threshold_simhash=6))
+    urls = tmp_path / 'urls.txt'
+    urls.write_text("\n".join(['https://example.com/page/0', 'https://example.com/page/1',
+                               'https://example.com/page/2', 'https://down.example.com/page/4']) + "\n")
+    output = tmp_path / 'out.jsonl'
+
+    with OllamaStub() as ollama:
+        args = parse_args(['--headless', '--input', str(urls), '--output', str(output), '--delay', '0',
+                           '--llm-url', ollama.url, '--metrics-port', '0'])
+        assert run_headless(args) == 0
+
+    rows = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert sorted(row['url'] for row in rows) == ['https://example.com/page/0', 'https://example.com/page/1',
+                                                  'https://example.com/page/2']
+    report = (tmp_path / 'out_summary_report.txt').read_text(encoding='utf-8')
+    assert 'Total URLs processed: 4' in report
+    assert 'Failed extractions: 1' in report
+    assert 'Duplicate content: 1' in report
+    assert (tmp_path / 'out_similarity_logs.jsonl').exists()
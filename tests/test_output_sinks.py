@@ -0,0 +1,122 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from file_handler import FileHandler
+from output_sinks import FIELDNAMES, TIMING_FIELDNAMES, ResultSink, create_sink, format_from_path, result_to_row
+
+RESULTS = [
+    {
+        'url': f"https://a.example/page/{n}", 'title': f"Page {n}", 'content': f"line one\nline\ttwo {n} " * 20,
+        'child_category': 'News and Media', 'summary': 'özet, "quoted"', 'minhash_similarity': 0.25,
+        'simhash_distance': 16, 'embedding_similarity': 0.5, 'is_duplicate': bool(n % 2),
+        'duplicate_info': {'original_url': f"https://a.example/page/{n - 1}"} if n % 2 else {},
+        'timings': {'fetch': 0.0123, 'llm': 1.5},
+    }
+    for n in range(5)
+]
+
+
+def read_text(path):
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+            return f.read()
+    if path.endswith('.zst'):
+        import zstandard
+        with open(path, 'rb') as f:
+            return zstandard.ZstdDecompressor().stream_reader(f).read().decode('utf-8')
+    with open(path, encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def test_result_to_row_columns_and_content_modes():
+    row = result_to_row(RESULTS[1])
+    assert list(row) == FIELDNAMES
+    assert row['simhash_score'] == 0.75
+    assert row['duplicate_of'] == 'https://a.example/page/0'
+
+    assert len(result_to_row(RESULTS[1], 'truncate', content_chars=10)['content']) == 10
+    assert 'content' not in result_to_row(RESULTS[1], 'none')
+    timed = result_to_row(RESULTS[1], timings=True)
+    assert timed['timing_fetch_ms'] == 12.3
+    assert list(timed)[-len(TIMING_FIELDNAMES):] == TIMING_FIELDNAMES
+
+
+@pytest.mark.parametrize('name', ['out.jsonl', 'out.jsonl.gz', 'out.ndjson.zst'])
+def test_jsonl_round_trip(tmp_path, name):
+    if name.endswith('.zst'):
+        pytest.importorskip('zstandard')
+    path = str(tmp_path / name)
+    with create_sink(path) as sink:
+        sink.write_many(RESULTS[:3])
+        sink.write(RESULTS[3])
+
+    rows = [json.loads(line) for line in read_text(path).splitlines()]
+    assert rows == [result_to_row(result) for result in RESULTS[:4]]
+    stats = sink.stats()
+    assert stats['format'] == 'jsonl' and stats['rows'] == 4 and stats['bytes'] > 0
+
+
+@pytest.mark.parametrize('name', ['out.csv', 'out.csv.gz'])
+def test_csv_round_trip_flattens_whitespace(tmp_path, name):
+    path = str(tmp_path / name)
+    with create_sink(path, content_mode='truncate', content_chars=50, timings=True) as sink:
+        sink.write_many(RESULTS)
+
+    rows = list(csv.DictReader(io.StringIO(read_text(path)), escapechar='\\'))
+    assert [row['url'] for row in rows] == [result['url'] for result in RESULTS]
+    assert all('\n' not in row['content'] and '\t' not in row['content'] for row in rows)
+    assert len(rows[0]['content']) <= 50
+    assert rows[0]['summary'] == 'özet, "quoted"'
+    assert rows[1]['is_duplicate'] == 'True'
+    assert rows[0]['timing_llm_ms'] == '1500.0'
+    assert rows[0]['timing_parse_ms'] == ''
+
+
+def test_csv_append_writes_header_once(tmp_path):
+    from output_sinks import CSVSink
+
+    path = str(tmp_path / "out.csv")
+    for result in RESULTS[:2]:
+        with CSVSink(path, append=True) as sink:
+            sink.write(result)
+
+    assert read_text(path).count('"url"') == 1
+    assert len(list(csv.DictReader(open(path, encoding='utf-8'), escapechar='\\'))) == 2
+
+
+def test_parquet_round_trip(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = str(tmp_path / "out.parquet")
+    with create_sink(path, content_mode='none', row_group_size=2) as sink:
+        sink.write_many(RESULTS)
+
+    table = pq.read_table(path)
+    assert table.num_rows == 5
+    assert 'content' not in table.column_names
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+
+def test_format_selection():
+    assert format_from_path('a.CSV.GZ') == 'csv'
+    assert format_from_path('a.jsonl.zst') == 'jsonl'
+    assert format_from_path('a.parquet') == 'parquet'
+    with pytest.raises(ValueError):
+        create_sink('a.csv', format='xml')
+    with pytest.raises(ValueError):
+        create_sink('a.csv', content_mode='partial')
+    with pytest.raises(TypeError):
+        ResultSink('a.csv')
+
+
+def test_write_results_to_csv_accepts_a_generator(tmp_path, caplog):
+    path = tmp_path / "out.csv"
+    caplog.set_level('INFO', logger='file_handler')
+    assert FileHandler().write_results_to_csv((result for result in RESULTS[:4]), str(path))
+
+    with open(path, encoding='utf-8') as f:
+        assert len(list(csv.DictReader(f))) == 4
+    assert "Successfully wrote 4 results" in caplog.text
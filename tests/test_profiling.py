@@ -0,0 +1,116 @@
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from profiling import RunProfiler, storage_sizes
+from similarity_checker import SimilarityChecker
+
+
+def busy_work():
+    return sum(i * i for i in range(2000))
+
+
+def fake_extractor(tmp_path):
+    """storage_sizes'ın okuduğu alanlar: checker index'leri ve LLM cache'i (yok)"""
+    checker = SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(tmp_path / "logs.jsonl"))
+    return SimpleNamespace(similarity_checker=checker, llm_classifier=SimpleNamespace(cache=None))
+
+
+def test_storage_sizes_reports_every_store(tmp_path):
+    extractor = fake_extractor(tmp_path)
+    extractor.similarity_checker.is_duplicate_comprehensive('u', 'Title', 'page content ' * 30)
+    sizes = storage_sizes(extractor)
+
+    assert sizes['minhash_storage']['entries'] == 1 and sizes['minhash_storage']['bytes'] > 0
+    assert sizes['simhash_storage'] == {'entries': 1, 'bytes': 8}
+    assert sizes['embedding_storage']['bytes'] == 384 * 4
+    assert sizes['similarity_logs']['total_records'] == 1
+    assert sizes['similarity_logs']['file_bytes'] > 0
+    assert 'llm_result_cache' not in sizes
+
+
+def test_sampled_units_produce_profile_and_memory_report(tmp_path):
+    profiler = RunProfiler(str(tmp_path), sample_rate=1.0, snapshot_interval=3600, seed=1)
+    tracing_before = tracemalloc.is_tracing()
+    profiler.start_run(fake_extractor(tmp_path))
+    for _ in range(3):
+        with profiler.unit():
+            busy_work()
+    profiler.finish_run()
+
+    assert (profiler.units, profiler.sampled_units, profiler.snapshots) == (3, 3, 1)
+    files = sorted(name for name in os.listdir(tmp_path) if name.endswith(('.prof', '.txt')))
+    assert files == [f"memory_{profiler.run_id}_001.txt", f"profile_{profiler.run_id}_001.prof"]
+    stats = pstats.Stats(str(tmp_path / files[1]))
+    assert any(func[2] == 'busy_work' for func in stats.stats)
+    report = (tmp_path / files[0]).read_text(encoding='utf-8')
+    assert "Work units: 3, profiled: 3" in report
+    assert "TRACEMALLOC" in report
+    assert tracemalloc.is_tracing() == tracing_before
+
+
+def test_memory_is_traced_only_inside_sampled_units(tmp_path):
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc is already enabled for the test session")
+    retained = []
+    profiler = RunProfiler(str(tmp_path), sample_rate=0.5, snapshot_interval=3600, seed=3)
+    profiler.start_run(fake_extractor(tmp_path))
+    assert not tracemalloc.is_tracing()
+
+    tracing = []
+    for _ in range(20):
+        with profiler.unit():
+            tracing.append(tracemalloc.is_tracing())
+            retained.append([object() for _ in range(1000)])
+    profiler.finish_run()
+
+    assert sum(tracing) == profiler.sampled_units and 0 < profiler.sampled_units < 20
+    assert not tracemalloc.is_tracing()
+    report = next(name for name in os.listdir(tmp_path) if name.startswith('memory_'))
+    assert "test_profiling.py" in (tmp_path / report).read_text(encoding='utf-8')
+
+
+def test_busy_profiler_does_not_block_other_units(tmp_path):
+    profiler = RunProfiler(str(tmp_path), sample_rate=1.0, snapshot_interval=3600, trace_memory=False)
+    profiler.start_run(fake_extractor(tmp_path))
+    entered, release = threading.Event(), threading.Event()
+
+    def sampled_unit():
+        with profiler.unit():
+            entered.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=sampled_unit)
+    worker.start()
+    assert entered.wait(5)
+    # İkinci birim de örneklenir ama profil meşgul: beklemeden profilsiz çalışır
+    start = time.monotonic()
+    with profiler.unit():
+        busy_work()
+    assert time.monotonic() - start < 1
+    release.set()
+    worker.join()
+    profiler.finish_run()
+
+    assert (profiler.units, profiler.sampled_units, profiler.snapshots) == (2, 1, 1)
+
+
+def test_unsampled_run_and_unit_without_run(tmp_path):
+    profiler = RunProfiler(str(tmp_path), sample_rate=0.0, trace_memory=False)
+    with profiler.unit():
+        busy_work()
+    profiler.finish_run()
+    assert not any(name.startswith(('profile_', 'memory_')) for name in os.listdir(tmp_path))
+
+    profiler.start_run(fake_extractor(tmp_path))
+    with profiler.unit():
+        busy_work()
+    profiler.finish_run()
+    assert (profiler.units, profiler.sampled_units) == (1, 0)
+    report = next(name for name in os.listdir(tmp_path) if name.startswith('memory_'))
+    assert "TRACEMALLOC" not in (tmp_path / report).read_text(encoding='utf-8')
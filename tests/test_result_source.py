@@ -0,0 +1,109 @@
+import gc
+import os
+import threading
+
+import pytest
+
+from result_source import ListResultSource, ResultJournal, ResultSource, result_key
+
+RESULTS = [
+    {'url': f"u{n}", 'status': 'failed' if n % 4 == 3 else 'success', 'is_duplicate': n % 3 == 1,
+     'child_category': ['Hacking', 'Religion', ''][n % 3], 'content': f"içerik {n}"}
+    for n in range(25)
+]
+
+
+@pytest.fixture(params=['list', 'journal'])
+def source(request, tmp_path):
+    if request.param == 'list':
+        yield ListResultSource(RESULTS)
+        return
+    journal = ResultJournal(str(tmp_path / "journal.jsonl"))
+    for result in RESULTS:
+        journal.append(result)
+    yield journal
+    journal.close()
+
+
+def expected(status=None, duplicate=None, category=None):
+    return [r for r in RESULTS
+            if (status is None or r['status'] == status)
+            and (duplicate is None or bool(r['is_duplicate']) == duplicate)
+            and (category is None or r['child_category'] == category)]
+
+
+@pytest.mark.parametrize('filters', [
+    {}, {'status': 'success'}, {'duplicate': False}, {'category': 'Hacking'},
+    {'status': 'success', 'duplicate': False, 'category': 'Religion'}, {'status': 'unknown'},
+])
+def test_count_page_and_iter_match_filters(source, filters):
+    rows = expected(**filters)
+
+    assert source.count(**filters) == len(rows)
+    assert source.page(0, 4, **filters) == rows[:4]
+    assert source.page(1, 4, **filters) == rows[4:8]
+    assert source.page(100, 4, **filters) == []
+    assert list(source.iter_results(**filters)) == rows
+
+
+def test_get_len_and_categories(source):
+    assert len(source) == 25
+    assert source.get(7) == RESULTS[7]
+    assert source.categories() == ['Hacking', 'Religion']
+
+
+def test_match_cache_is_invalidated_on_append(tmp_path):
+    journal = ResultJournal(str(tmp_path / "journal.jsonl"))
+    journal.append(RESULTS[0])
+    assert journal.count(status='success') == 1
+    journal.append(RESULTS[2])
+    assert journal.count(status='success') == 2
+    assert list(journal) == [RESULTS[0], RESULTS[2]]
+    journal.close()
+    assert os.path.exists(tmp_path / "journal.jsonl")
+
+
+def test_concurrent_appends_keep_keys_aligned_with_rows(tmp_path):
+    journal = ResultJournal(str(tmp_path / "journal.jsonl"))
+    barrier = threading.Barrier(8)
+
+    def worker(offset):
+        barrier.wait()
+        for n in range(offset, 400, 8):
+            journal.append(RESULTS[n % len(RESULTS)] | {'url': f"u{n}"})
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(journal) == 400
+    assert all(result_key(journal.get(i)) == journal._keys[i] for i in range(len(journal)))
+    assert [r['url'] for r in journal.iter_results(status='failed')] == \
+        [journal.get(i)['url'] for i in journal.matching(status='failed')]
+    journal.close()
+
+
+def test_scratch_journal_is_deleted_on_close_or_collection(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    journal = ResultJournal()
+    path = journal.path
+    assert path.startswith(str(tmp_path))
+    journal.append(RESULTS[0])
+    journal.close()
+    journal.close()
+    assert not os.path.exists(path)
+
+    journal = ResultJournal()
+    path = journal.path
+    del journal
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_result_key_and_abstract_get():
+    assert result_key({}) == ('unknown', False, '')
+    assert result_key(RESULTS[1]) == ('success', True, 'Religion')
+    with pytest.raises(TypeError):
+        ResultSource()
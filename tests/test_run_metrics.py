@@ -0,0 +1,96 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import run_metrics
+from run_metrics import RunMetrics
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(run_metrics, 'time', SimpleNamespace(
+        monotonic=lambda: now[0], perf_counter=lambda: now[0], strftime=run_metrics.time.strftime,
+        gmtime=run_metrics.time.gmtime))
+    return now
+
+
+def test_stage_tracks_in_flight_and_per_item_latency(clock):
+    metrics = RunMetrics()
+    with metrics.stage('llm', count=4):
+        assert metrics.snapshot()['stages']['llm']['in_flight'] == 4
+        clock[0] += 2.0
+
+    llm = metrics.snapshot()['stages']['llm']
+    assert llm['in_flight'] == 0
+    assert llm['samples'] == 4
+    assert llm['p50'] == 0.5
+
+
+def test_trackers_are_created_once_and_reset_by_start():
+    metrics = RunMetrics()
+    metrics.record('custom', 0.1)
+    tracker = metrics._latency['custom']
+    metrics.record('custom', 0.2)
+    with metrics.stage('custom'):
+        pass
+
+    assert metrics._latency['custom'] is tracker
+    assert len(tracker) == 3
+    metrics.start(10)
+    assert 'custom' not in metrics._latency
+
+
+def test_rate_and_eta_follow_the_recent_window(clock):
+    metrics = RunMetrics(rate_window=10)
+    metrics.start(total=100)
+    for _ in range(20):
+        clock[0] += 1.0
+        metrics.url_done()
+
+    snap = metrics.snapshot()
+    assert snap['completed'] == 20
+    assert snap['urls_per_sec'] == pytest.approx(1.0, rel=0.15)
+    assert snap['eta'] == pytest.approx(80 / snap['urls_per_sec'])
+
+    # Yavaşlama: son 10 saniyede yalnızca 3 tamamlanma (t=119, 120, 129)
+    clock[0] += 9.0
+    metrics.url_done()
+    assert metrics.snapshot()['urls_per_sec'] == pytest.approx(0.3)
+    assert metrics.snapshot()['avg_urls_per_sec'] == pytest.approx(21 / 29)
+
+
+def test_cache_counts_and_providers():
+    metrics = RunMetrics()
+    metrics.count_cache('duplicate_reuse', True)
+    metrics.count_cache('duplicate_reuse', False)
+    metrics.register_cache('llm_result', lambda: {'hits': 3, 'misses': 1})
+    metrics.register_cache('broken', lambda: 1 / 0)
+
+    caches = metrics.snapshot()['caches']
+    assert caches['duplicate_reuse']['hit_rate'] == 0.5
+    assert caches['llm_result']['hit_rate'] == 0.75
+    assert 'broken' not in caches
+    assert "Cache hit rate: duplicate_reuse 50% | llm_result 75%" in metrics.format_lines()
+
+
+def test_concurrent_stages_are_counted_exactly():
+    metrics = RunMetrics()
+
+    def worker():
+        for _ in range(200):
+            with metrics.stage('fetch'):
+                pass
+            metrics.url_done()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snap = metrics.snapshot()
+    assert snap['completed'] == 800
+    assert snap['stages']['fetch']['in_flight'] == 0
+    assert snap['stages']['fetch']['samples'] == 500  # window
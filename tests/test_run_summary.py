@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from file_handler import FileHandler
+from run_summary import LatencyHistogram, SummaryAggregator
+
+
+def make_result(n):
+    if n % 5 == 4:
+        return {'url': f"u{n}", 'status': 'failed', 'error': 'Timeout error', 'elapsed': 0.5}
+    duplicate = n % 5 == 1
+    return {
+        'url': f"u{n}", 'status': 'success', 'elapsed': 0.01 * (n + 1),
+        'child_category': 'Hacking' if n % 2 else 'Religion', 'classified_by': 'llm',
+        'llm_error': 'timeout: read timed out' if n == 2 else '',
+        'is_duplicate': duplicate,
+        'duplicate_info': {'method': 'MinHash', 'original_url': f"u{n - 1}", 'similarity': 0.9} if duplicate else {},
+        'timings': {'fetch': 0.01, 'llm': 0.2, 'custom_stage': 0.003},
+    }
+
+
+def test_histogram_percentiles_are_within_bucket_resolution():
+    values = [random.Random(0).lognormvariate(-2, 1) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.add(value)
+    ordered = sorted(values)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        # Kova genişliği 2^(1/4) ≈ %19
+        assert exact <= histogram.percentile(q) <= exact * 2 ** 0.25 * 1.001
+    assert histogram.percentile(1.0) == max(values)
+    assert histogram.stats()['mean'] == pytest.approx(sum(values) / len(values))
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_histogram_cumulative_counts():
+    histogram = LatencyHistogram()
+    for value in (0.0005, 0.01, 0.1, 1.0, 10.0):
+        histogram.add(value)
+
+    assert histogram.cumulative([0.002, 0.05, 0.5, 5, 100]) == [1, 2, 3, 4, 5]
+
+
+def test_aggregator_counts_match_a_full_scan():
+    results = [make_result(n) for n in range(20)]
+    aggregator = SummaryAggregator(max_duplicate_examples=2)
+    aggregator.add_many(results)
+    summary = aggregator.snapshot()
+
+    successful = [r for r in results if r['status'] == 'success']
+    unique = [r for r in successful if not r['is_duplicate']]
+    assert (summary['total'], summary['successful'], summary['failed']) == (20, len(successful), 4)
+    assert summary['error_counts'] == {'Timeout error': 4}
+    assert summary['llm_error_counts'] == {'timeout': 1}
+    assert summary['duplicate_count'] == 4
+    assert summary['detection_methods'] == {'MinHash': 4}
+    assert len(summary['duplicate_examples']) == 2
+    assert sum(summary['category_counts'].values()) == len(unique)
+    assert summary['latency']['count'] == 20
+    assert list(summary['stage_latency']) == ['fetch', 'llm', 'custom_stage']
+
+    aggregator.reset()
+    assert aggregator.snapshot()['total'] == 0
+
+
+def test_report_renders_mid_run_and_matches_written_file(tmp_path):
+    aggregator = SummaryAggregator()
+    aggregator.add(make_result(0))
+    assert "Total URLs processed: 1" in aggregator.render()
+
+    for n in range(1, 10):
+        aggregator.add(make_result(n))
+    report = aggregator.render({'total_duplicates': 2})
+    assert "Total URLs processed: 10" in report
+    assert "Duplicate content: 2" in report
+
+    output = str(tmp_path / "results.csv.gz")
+    assert FileHandler().write_summary_report(aggregator, {'total_duplicates': 2}, output)
+    with open(tmp_path / "results_summary_report.txt", encoding='utf-8') as f:
+        assert f.read().strip() == report.strip()
+
+
+def test_write_summary_report_still_accepts_a_results_list(tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    FileHandler().write_summary_report([make_result(n) for n in range(3)], {}, output)
+
+    with open(tmp_path / "results_summary_report.txt", encoding='utf-8') as f:
+        assert "Total URLs processed: 3" in f.read()
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from simhash_index import SimHashBuilder, SimHashIndex, _popcount64, hamming_distance, simhash_features
+from tests.corpus import make_documents
+
+TEXTS = [
+    "",
+    "abc",
+    "Hello, World!",
+    "İstanbul'da yağmurlu bir gün; şehir trafiği çok yoğun.",
+    "中文 文本 测试 mixed with English words",
+    "repeat " * 200,
+]
+
+
+def corpus_texts(count=30):
+    return [f"{title} {content}" for _, title, content in make_documents(count, words=200, seed=11)]
+
+
+def test_fingerprints_match_simhash_library():
+    simhash = pytest.importorskip('simhash')
+    texts = TEXTS + corpus_texts()
+    builder = SimHashBuilder()
+
+    fingerprints = [int(v) for v in builder.fingerprint_texts(texts)]
+
+    assert fingerprints == [simhash.Simhash(text).value for text in texts]
+
+
+def test_batches_and_cache_clearing_do_not_change_fingerprints():
+    texts = corpus_texts()
+    expected = [int(v) for v in SimHashBuilder().fingerprint_texts(texts)]
+
+    # Küçük cache: hash cache sürekli temizlenir
+    builder = SimHashBuilder(max_cached_features=50)
+    assert [builder.fingerprint(text) for text in texts] == expected
+    assert SimHashBuilder().fingerprints([]).shape == (0,)
+
+
+def test_popcount_and_hamming_distance_agree():
+    rng = random.Random(0)
+    values = [rng.getrandbits(64) for _ in range(200)] + [0, (1 << 64) - 1]
+    array = np.array(values, dtype=np.uint64)
+
+    assert _popcount64(array).tolist() == [bin(v).count('1') for v in values]
+    assert hamming_distance(0, (1 << 64) - 1) == 64
+    assert hamming_distance(5, 6) == 2
+
+
+def test_index_search_remove_and_growth():
+    rng = random.Random(1)
+    fingerprints = {f"u{i}": rng.getrandbits(64) for i in range(40)}
+    index = SimHashIndex(initial_capacity=4)
+    for url, fingerprint in fingerprints.items():
+        index.add(url, fingerprint)
+
+    query = fingerprints['u7'] ^ 0b101
+    assert index.search(query) == ('u7', 2)
+    assert index.distances(query).tolist() == [hamming_distance(query, fingerprints[url]) for url in index.keys()]
+
+    assert index.remove('u7')
+    assert not index.remove('u7')
+    assert 'u7' not in index and len(index) == 39
+    assert index.search(query)[0] != 'u7'
+    assert dict(index.items()) == {url: fp for url, fp in fingerprints.items() if url != 'u7'}
+    assert index.nbytes == 39 * 8
+
+    index.clear()
+    assert index.search(query) == (None, 64)
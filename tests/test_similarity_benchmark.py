@@ -0,0 +1,72 @@
+import json
+import sys
+
+import numpy as np
+
+from embedding_backend import HashingEmbeddingBackend
+from similarity_checker import SimilarityChecker
+from tools import similarity_benchmark
+from tools.similarity_benchmark import SyntheticCorpus, bench_dedupe
+
+
+def test_hashing_backend_is_deterministic_and_normalized():
+    backend = HashingEmbeddingBackend(dimension=64)
+    base = ' '.join(f"word{i}" for i in range(100))
+    near = base.replace('word50', 'other')
+    embeddings = backend.encode_batch([base, near, "completely different text here", ""])
+
+    assert embeddings.shape == (4, 64) and embeddings.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(embeddings[:3], axis=1), 1.0, rtol=1e-5)
+    assert not embeddings[3].any()
+    np.testing.assert_array_equal(HashingEmbeddingBackend(dimension=64).encode_batch([base])[0], embeddings[0])
+    assert embeddings[0] @ embeddings[1] > 0.9
+    assert embeddings[0] @ embeddings[1] > embeddings[0] @ embeddings[2]
+
+
+def test_corpus_is_reproducible_with_requested_duplicate_rate():
+    corpus = SyntheticCorpus(400, duplicate_rate=0.25, edit_rates=(0.02, 0.1), doc_words=40, vocab_size=2000, seed=3)
+    first = list(corpus)
+
+    assert first == list(SyntheticCorpus(400, duplicate_rate=0.25, edit_rates=(0.02, 0.1), doc_words=40,
+                                         vocab_size=2000, seed=3))
+    assert first != list(SyntheticCorpus(400, duplicate_rate=0.25, edit_rates=(0.02, 0.1), doc_words=40,
+                                         vocab_size=2000, seed=4))
+    duplicates = [item for item in first if item[3] is not None]
+    assert 0.15 < len(duplicates) / len(first) < 0.35
+    assert {item[4] for item in duplicates} == {0.02, 0.1}
+    # Duplicate'in orijinali kendisinden önce gelir ve kendisi bir orijinaldir
+    originals = {index for index, item in enumerate(first) if item[3] is None}
+    assert all(item[3] in originals and item[3] < index for index, item in enumerate(first) if item[3] is not None)
+    assert first[0][0] == corpus.url(0) and first[0][3] is None
+
+
+def test_bench_dedupe_scores_against_ground_truth(tmp_path):
+    corpus = SyntheticCorpus(120, duplicate_rate=0.3, edit_rates=(0.02,), doc_words=120, vocab_size=5000, seed=1)
+    checker = SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(tmp_path / "logs.jsonl"))
+    result = bench_dedupe(checker, corpus, checkpoints=4)
+    quality = result['quality']
+
+    assert result['processed'] == 120 and not result['truncated']
+    assert quality['tp'] + quality['fp'] + quality['fn'] + quality['tn'] == 120
+    assert quality['recall'] > 0.9 and quality['precision'] > 0.9
+    assert quality['recall_by_edit_rate']['0.02']['duplicates'] == quality['tp'] + quality['fn']
+    assert [point['processed'] for point in result['growth']] == [30, 60, 90, 120]
+    assert result['memory']['indexes']['minhash_storage']['entries'] == quality['tn'] + quality['fn']
+
+
+def test_main_writes_json_report(monkeypatch, tmp_path, capsys):
+    output = tmp_path / 'bench.json'
+    monkeypatch.setattr(sys, 'argv', ['similarity_benchmark', '--sizes', '30', '--doc-words', '40',
+                                      '--vocab-size', '2000', '--micro-sample', '5', '--json', str(output)])
+    assert similarity_benchmark.main() == 0
+
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['config']['backend'] == 'hashing'
+    assert [run['size'] for run in report['runs']] == [30]
+    assert set(report['runs'][0]['signatures']) == {'create_minhash', 'create_simhash', 'create_embedding'}
+    assert "=== 30 documents: 30 processed ===" in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, 'argv', ['similarity_benchmark', '--sizes', '30', '--doc-words', '40',
+                                      '--vocab-size', '2000', '--micro-sample', '5', '--baseline', str(output)])
+    assert similarity_benchmark.main() == 0
+    assert "vs baseline" in capsys.readouterr().out
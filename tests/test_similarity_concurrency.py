@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from similarity_checker import SimilarityChecker
+from tests.corpus import make_documents
+
+
+def corpus_items(count=40):
+    return make_documents(count, duplicate_rate=0.3, edit_rate=0.05, seed=3)
+
+
+def new_checker(path, max_workers=1):
+    return SimilarityChecker(embedding_backend='hashing', max_workers=max_workers, similarity_log_path=str(path))
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_check_many_matches_sequential_checks(tmp_path, workers):
+    items = corpus_items()
+    sequential = new_checker(tmp_path / "sequential.jsonl")
+    expected = [sequential.is_duplicate_comprehensive(*item) for item in items]
+
+    batched = new_checker(tmp_path / "batched.jsonl", max_workers=workers)
+    results = batched.check_many(items[:15]) + batched.check_many(items[15:])
+
+    assert [r[0] for r in results] == [r[0] for r in expected]
+    assert [r[1] for r in results] == [r[1] for r in expected]
+    assert [r[2] for r in results] == [r[2] for r in expected]
+    assert any(r[0] for r in expected)
+    assert batched.simhash_storage.keys() == sequential.simhash_storage.keys()
+    assert batched.duplicate_stats['total_duplicates'] == sequential.duplicate_stats['total_duplicates']
+
+
+def test_same_page_from_many_threads_is_unique_once(tmp_path):
+    checker = new_checker(tmp_path / "logs.jsonl", max_workers=4)
+    url, title, content = corpus_items(1)[0]
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker(index):
+        signatures = checker.compute_signatures(title, content)
+        barrier.wait()
+        results.append(checker.is_duplicate_comprehensive(f"{url}?copy={index}", title, content, signatures)[0])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False] + [True] * 7
+    assert len(checker.minhash_storage) == len(checker.simhash_storage) == len(checker.embedding_storage) == 1
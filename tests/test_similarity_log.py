@@ -0,0 +1,92 @@
+import gc
+import json
+import os
+
+from similarity_checker import SimilarityChecker
+from similarity_log import SimilarityLogSink
+
+
+def test_buffer_is_bounded_but_file_keeps_every_record(tmp_path):
+    path = tmp_path / "logs.jsonl"
+    sink = SimilarityLogSink(str(path), buffer_size=3)
+    for i in range(10):
+        sink.write({'url': f"u{i}"})
+    sink.flush()
+
+    assert len(sink) == 3
+    assert sink.total_records == 10
+    assert [r['url'] for r in sink.get_logs()] == ['u7', 'u8', 'u9']
+    assert [r['url'] for r in sink.get_logs(limit=2)] == ['u8', 'u9']
+    lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [r['url'] for r in lines] == [f"u{i}" for i in range(10)]
+    assert all('timestamp' in r for r in lines)
+    sink.close()
+
+
+def test_explicit_path_is_kept_and_appended(tmp_path):
+    path = tmp_path / "logs.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"url": "old"}\n')
+    sink = SimilarityLogSink(str(path))
+    sink.write({'url': 'new'})
+    sink.close()
+    sink.close()  # ikinci close sorun çıkarmaz
+
+    assert os.path.exists(path)
+    assert [json.loads(line)['url'] for line in path.read_text(encoding='utf-8').splitlines()] == ['old', 'new']
+
+
+def test_reset_truncates_file_and_buffer(tmp_path):
+    path = tmp_path / "logs.jsonl"
+    sink = SimilarityLogSink(str(path))
+    sink.write({'url': 'a'})
+    sink.reset()
+    sink.write({'url': 'b'})
+    sink.flush()
+
+    assert sink.total_records == 1
+    assert [r['url'] for r in sink.get_logs()] == ['b']
+    assert [json.loads(line)['url'] for line in path.read_text(encoding='utf-8').splitlines()] == ['b']
+    sink.close()
+
+
+def test_export_copies_log_file(tmp_path):
+    sink = SimilarityLogSink(str(tmp_path / "logs.jsonl"))
+    sink.write({'url': 'a'})
+    target = tmp_path / "export.jsonl"
+    sink.export(str(target))
+    sink.close()
+
+    assert json.loads(target.read_text(encoding='utf-8'))['url'] == 'a'
+
+
+def test_scratch_file_is_deleted_on_close(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    sink = SimilarityLogSink()
+    path = sink.path
+    assert path.startswith(str(tmp_path))
+    sink.write({'url': 'a'})
+    assert os.path.exists(path)
+    sink.close()
+
+    assert not os.path.exists(path)
+
+
+def test_scratch_file_is_deleted_when_collected(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    sink = SimilarityLogSink()
+    path = sink.path
+    del sink
+    gc.collect()
+
+    assert not os.path.exists(path)
+
+
+def test_checker_logs_a_copy_of_the_scores(tmp_path):
+    checker = SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(tmp_path / "logs.jsonl"))
+    scores = {'minhash_max_similarity': 0.1, 'simhash_min_distance': 32, 'embedding_max_similarity': 0.2}
+    checker.log_similarity_scores('u', scores, 'title', 'content')
+    scores['minhash_max_similarity'] = 0.9
+
+    assert checker.get_similarity_logs()[-1]['scores']['minhash_max_similarity'] == 0.1
+    checker.close()
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import similarity_checker
+from similarity_checker import SimilarityChecker
+from tests.corpus import make_documents
+
+
+def documents(count, seed=7):
+    """Birbirine benzemeyen (duplicate_rate=0) (url, title, content) üçlüleri"""
+    return make_documents(count, words=80, seed=seed)
+
+
+def windowed_checker(tmp_path, **window):
+    # Kısa rastgele dokümanlarda SimHash mesafesi 16'nın altına düşebilir; eşik sıkılaştırılır
+    return SimilarityChecker(embedding_backend='hashing', threshold_simhash=6,
+                             similarity_log_path=str(tmp_path / "logs.jsonl"), **window)
+
+
+def stored_urls(checker):
+    """Her index'teki URL kümesi; window tutarlıysa hepsi aynıdır"""
+    return {
+        'window': set(checker._window),
+        'minhash': set(checker.minhash_storage),
+        'lsh': {url for url in checker.minhash_storage if url in checker.minhash_lsh},
+        'simhash': set(checker.simhash_storage.keys()),
+        'embedding': set(checker.embedding_storage.keys()),
+    }
+
+
+def test_window_size_evicts_from_every_index(tmp_path):
+    checker = windowed_checker(tmp_path, window_size=3)
+    docs = documents(6)
+    for url, title, content in docs:
+        assert not checker.is_duplicate_comprehensive(url, title, content)[0]
+
+    expected = {url for url, _, _ in docs[-3:]}
+    assert all(urls == expected for urls in stored_urls(checker).values())
+    assert checker.unique_total == 6
+    assert checker.evicted_count == 3
+    assert not any(url in checker.minhash_lsh for url, _, _ in docs[:3])
+
+
+def test_evicted_document_is_no_longer_a_duplicate(tmp_path):
+    checker = windowed_checker(tmp_path, window_size=2)
+    docs = documents(3)
+    url, title, content = docs[0]
+    checker.is_duplicate_comprehensive(url, title, content)
+    assert checker.is_duplicate_comprehensive('copy-1', title, content)[0]
+
+    for other in docs[1:]:
+        checker.is_duplicate_comprehensive(*other)
+    assert not checker.is_duplicate_comprehensive('copy-2', title, content)[0]
+
+
+def test_window_hours_evicts_old_documents(tmp_path, monkeypatch):
+    now = [1000.0]
+    fake_time = SimpleNamespace(time=lambda: now[0], perf_counter=similarity_checker.time.perf_counter)
+    monkeypatch.setattr(similarity_checker, 'time', fake_time)
+    checker = windowed_checker(tmp_path, window_hours=1)
+    first, second = documents(2)
+
+    checker.is_duplicate_comprehensive(*first)
+    now[0] += 1800
+    checker.is_duplicate_comprehensive(*second)
+    now[0] += 1801  # first artık bir saatten eski
+
+    assert not checker.is_duplicate_comprehensive('copy', first[1], first[2])[0]
+    assert all(urls == {second[0], 'copy'} for urls in stored_urls(checker).values())
+    assert checker.evicted_count == 1
+
+
+def test_unbounded_without_window(tmp_path):
+    checker = windowed_checker(tmp_path)
+    for doc in documents(5):
+        checker.is_duplicate_comprehensive(*doc)
+
+    assert len(checker.minhash_storage) == len(checker.simhash_storage) == len(checker.embedding_storage) == 5
+    assert checker.evicted_count == 0
+
+
+def test_reinserted_url_moves_to_the_end_of_the_window(tmp_path):
+    checker = windowed_checker(tmp_path, window_size=2)
+    first, second, third, changed = documents(4)
+    checker.is_duplicate_comprehensive(*first)
+    checker.is_duplicate_comprehensive(*second)
+    # Aynı URL farklı içerikle: LSH'a ikinci kez eklenirken hata vermez
+    assert not checker.is_duplicate_comprehensive(first[0], changed[1], changed[2])[0]
+    assert list(checker._window) == [second[0], first[0]]
+    assert checker.evicted_count == 0
+
+    checker.is_duplicate_comprehensive(*third)
+    assert all(urls == {first[0], third[0]} for urls in stored_urls(checker).values())
+    assert checker.evicted_count == 1
+    assert checker.is_duplicate_comprehensive('copy', changed[1], changed[2])[1]['original_url'] == first[0]
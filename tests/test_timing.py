@@ -0,0 +1,93 @@
+import csv
+import time
+
+import pytest
+
+from file_handler import FileHandler
+from main import parse_args
+from output_sinks import TIMING_FIELDNAMES
+from similarity_checker import SimilarityChecker
+from tests.fake_goose import FakeGoose
+from tests.ollama_stub import OllamaStub
+from timing import NULL_TIMER, TIMING_STAGES, StageTimer
+
+
+def test_stage_timer_accumulates_into_the_given_dict():
+    timings = {}
+    timer = StageTimer(timings)
+    with timer.stage('fetch'):
+        time.sleep(0.01)
+    with timer.stage('fetch'):
+        pass
+    timer.add('llm', 0.5)
+    timer.add('llm', 0.25)
+
+    assert timer.timings is timings
+    assert timings['fetch'] >= 0.01
+    assert timings['llm'] == 0.75
+
+
+def test_stage_is_recorded_when_the_block_raises():
+    timer = StageTimer()
+    with pytest.raises(RuntimeError):
+        with timer.stage('parse'):
+            raise RuntimeError("boom")
+
+    assert 'parse' in timer.timings
+
+
+def test_null_timer_records_nothing():
+    with NULL_TIMER.stage('fetch'):
+        pass
+    NULL_TIMER.add('llm', 1.0)
+
+    assert NULL_TIMER.timings == {}
+    assert NULL_TIMER.stage('a') is NULL_TIMER.stage('b')
+    assert not NULL_TIMER.enabled and StageTimer.enabled
+
+
+def test_checker_records_signature_and_search_stages(tmp_path):
+    checker = SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(tmp_path / "logs.jsonl"))
+    timer = StageTimer()
+    checker.is_duplicate_comprehensive('u', 'Title', 'some page content ' * 20, timer=timer)
+
+    expected = {'minhash', 'simhash', 'embedding', 'minhash_search', 'simhash_search', 'embedding_search',
+                'index_insert'}
+    assert expected <= set(timer.timings)
+    assert set(timer.timings) <= set(TIMING_STAGES)
+
+
+@pytest.mark.parametrize('timing_enabled', [True, False])
+def test_extractor_results_carry_stage_timings(monkeypatch, tmp_path, timing_enabled):
+    pytest.importorskip('goose3')
+    from extractor import URLExtractor
+
+    monkeypatch.setattr(URLExtractor, '_create_goose', lambda self: FakeGoose())
+    checker = SimilarityChecker(embedding_backend='hashing', similarity_log_path=str(tmp_path / "logs.jsonl"))
+    with OllamaStub() as ollama:
+        extractor = URLExtractor(delay=0, similarity_checker=checker, timing_enabled=timing_enabled,
+                                 llm_config={'base_url': ollama.url, 'use_cache': False})
+        result = extractor.extract_content("https://a.example/page/0")
+        extractor.close()
+
+    assert result['status'] == 'success'
+    if not timing_enabled:
+        assert result['timings'] == {}
+        return
+    assert {'fetch', 'clean', 'minhash', 'llm'} <= set(result['timings'])
+    assert sum(result['timings'].values()) <= result['elapsed'] * 1.05
+
+
+def test_timing_columns_are_opt_in(tmp_path):
+    result = {'url': 'u', 'status': 'success', 'title': 't', 'content': 'c', 'timings': {'fetch': 0.25}}
+    default_path, timed_path = tmp_path / "default.csv", tmp_path / "timed.csv"
+    FileHandler().write_results([result], str(default_path))
+    FileHandler().write_results([result], str(timed_path), timings=True)
+
+    with open(default_path, encoding='utf-8') as f:
+        assert not set(TIMING_FIELDNAMES) & set(next(csv.reader(f)))
+    with open(timed_path, encoding='utf-8') as f:
+        assert next(csv.DictReader(f))['timing_fetch_ms'] == '250.0'
+
+    assert not parse_args([]).timing_columns
+    assert parse_args(['--timing-columns']).timing_columns
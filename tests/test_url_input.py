@@ -0,0 +1,124 @@
+import gzip
+
+import pytest
+
+from file_handler import FileHandler
+from result_source import ResultJournal
+from similarity_checker import SimilarityChecker
+from tests.fake_goose import FakeGoose
+from tests.ollama_stub import OllamaStub
+
+LINES = "﻿# comment\nhttps://a.example/page/0\n\n  https://a.example/page/1  \n#x\nhttps://a.example/page/2"
+
+
+@pytest.fixture
+def url_files(tmp_path):
+    plain = tmp_path / "urls.txt"
+    plain.write_text(LINES, encoding='utf-8')
+    compressed = tmp_path / "urls.txt.gz"
+    with gzip.open(compressed, 'wt', encoding='utf-8') as f:
+        f.write(LINES)
+    return str(plain), str(compressed)
+
+
+def test_iter_urls_skips_blank_and_comment_lines(url_files):
+    expected = [f"https://a.example/page/{n}" for n in range(3)]
+    for path in url_files:
+        urls = FileHandler().iter_urls(path)
+        assert iter(urls) is urls  # generator: dosya belleğe alınmaz
+        assert list(urls) == expected
+
+
+def test_iter_urls_reads_zstd(tmp_path):
+    zstandard = pytest.importorskip('zstandard')
+    path = tmp_path / "urls.txt.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(LINES.encode('utf-8')))
+
+    assert len(list(FileHandler().iter_urls(str(path)))) == 3
+
+
+def test_count_urls_exact_and_estimated(url_files, tmp_path, monkeypatch):
+    plain, compressed = url_files
+    # Boş ve yorum satırları da sayılır (üst sınır)
+    assert FileHandler().count_urls(plain) == {'count': 6, 'estimated': False}
+    assert FileHandler().count_urls(compressed) == {'count': 6, 'estimated': False}
+
+    big = tmp_path / "big.txt.gz"
+    with gzip.open(big, 'wt', encoding='utf-8') as f:
+        for n in range(20000):
+            f.write(f"https://a.example/page/{n:05d}\n")
+    monkeypatch.setattr(FileHandler, 'COUNT_SAMPLE_BYTES', 4096)
+    count = FileHandler().count_urls(str(big))
+    assert count['estimated']
+    assert abs(count['count'] - 20000) < 200
+
+
+def test_validate_txt_file(url_files, tmp_path):
+    handler = FileHandler()
+    result = handler.validate_txt_file(url_files[1])
+    assert result['valid'] and result['url_count'] == 6
+
+    empty = tmp_path / "empty.txt"
+    empty.write_text("# only comments\n\n", encoding='utf-8')
+    assert handler.validate_txt_file(str(empty))['errors'] == ["No URLs found in file"]
+    assert not handler.validate_txt_file(str(tmp_path / "missing.txt"))['valid']
+    assert not handler.validate_txt_file(str(tmp_path / "urls.csv"))['valid']
+
+
+class RecordingSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, result):
+        self.rows.append(result['url'])
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_results_stream_to_journal_and_sink(monkeypatch, tmp_path, workers):
+    pytest.importorskip('goose3')
+    from extractor import URLExtractor
+
+    monkeypatch.setattr(URLExtractor, '_create_goose', lambda self: FakeGoose())
+    checker = SimilarityChecker(embedding_backend='hashing', threshold_simhash=6,
+                                similarity_log_path=str(tmp_path / "logs.jsonl"))
+    journal = ResultJournal()
+    sink = RecordingSink()
+    pages = [f"https://a.example/page/{n}" for n in range(5)]
+    urls = pages[:3] + ["not a url", "https://down.example/page/9"] + pages[3:]
+
+    with OllamaStub() as ollama:
+        extractor = URLExtractor(delay=0, max_workers=workers, similarity_checker=checker,
+                                 llm_config={'base_url': ollama.url, 'use_cache': False})
+        extractor.result_journal = journal
+        extractor.result_sink = sink
+        summary = extractor.stream_multiple_urls(iter(urls))
+        extractor.close()
+
+    assert summary is extractor.run_summary
+    assert summary.total == len(journal) == 7
+    assert [r['url'] for r in journal] == urls
+    assert journal.count(status='failed') == 2
+    assert sink.rows == [r['url'] for r in journal.iter_results(status='success')]
+    assert [r['is_duplicate'] for r in journal.iter_results(status='success')] == [False, True, False, True, False]
+    journal.close()
+
+
+def test_extract_multiple_urls_still_returns_the_result_list(monkeypatch, tmp_path):
+    pytest.importorskip('goose3')
+    from extractor import URLExtractor
+
+    monkeypatch.setattr(URLExtractor, '_create_goose', lambda self: FakeGoose())
+    checker = SimilarityChecker(embedding_backend='hashing', threshold_simhash=6,
+                                similarity_log_path=str(tmp_path / "logs.jsonl"))
+    urls = [f"https://a.example/page/{n}" for n in range(3)] + ["https://down.example/page/9"]
+
+    with OllamaStub() as ollama:
+        extractor = URLExtractor(delay=0, similarity_checker=checker,
+                                 llm_config={'base_url': ollama.url, 'use_cache': False})
+        results = extractor.extract_multiple_urls(urls)
+        assert extractor.stream_multiple_urls(urls[:1]) is extractor.run_summary
+        extractor.close()
+
+    assert [r['url'] for r in results] == urls
+    assert [r['status'] for r in results] == ['success', 'success', 'success', 'failed']
+    assert extractor._collected_results is None